@@ -1,18 +1,99 @@
+import os
 import sys
+import json
+import time
+import queue
+import atexit
 import logging
+import threading
+import multiprocessing.util
+from logging.handlers import QueueHandler, QueueListener
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as JSON objects, one per line. Extra fields of records are included."""
+
+    # Attributes of every record, other attributes are extra fields
+    _RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+    def format(self, record):
+        entry = {"time": self.formatTime(record), "name": record.name, "level": record.levelname,
+                 "thread": record.threadName, "message": record.getMessage()}
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in self._RECORD_ATTRIBUTES:
+                entry[key] = value
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """Puts records to the queue of background writer, forked processes get their own queue and writer"""
+
+    def enqueue(self, record):
+        Logger._ensure_listener()
+        super(_QueueHandler, self).enqueue(record)
+
+    def prepare(self, record):
+        # Arguments and traceback are formatted by the caller, they may not be valid later in another thread.
+        # Traceback is kept separately from message, so formatters can output it in their own way.
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
 
 
 class Logger:
-    """Logging class that has multiple logging methods depending on event type"""
+    """
+    Logging class that has multiple logging methods depending on event type.
+    All loggers share one handler, records are written by background thread, so logging does not
+    block the caller. Output is text by default, JSON lines when configured or when environment variable
+    BC_LOG_FORMAT is 'json'.
+    """
+    FORMAT_VARIABLE = "BC_LOG_FORMAT"
+    TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    # Minimal interval in seconds between two progress messages of one logger
+    DEFAULT_PROGRESS_INTERVAL = 1.0
+
+    _lock = threading.RLock()
+    _stream = None
+    _json_format = os.environ.get(FORMAT_VARIABLE, "").lower() == "json"
+    _queue = queue.Queue()
+    # Process which owns the queue, records of parent queued at fork are written by parent only
+    _queue_pid = os.getpid()
+    _handler = None
+    _listener = None
+    _listener_pid = None
+    _finalizer_pid = None
 
-    def __init__(self, logger_name=None):
+    def __init__(self, logger_name=None, progress_interval=DEFAULT_PROGRESS_INTERVAL):
+        """
+        :param logger_name: Name of logger, name of the class by default
+        :param progress_interval: Minimal interval in seconds between two progress messages
+        """
         self._logger = logging.getLogger(logger_name if logger_name else self.__class__.__name__)
         self._logger.setLevel(logging.DEBUG)
         self._logger.propagate = False
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        self._logger.addHandler(handler)
+        self._progress_interval = progress_interval
+        self._last_progress = None
+        self._skipped_progress = 0
+
+        with Logger._lock:
+            # Loggers of the same name are shared, the handler is attached only once
+            handler = Logger._get_handler()
+            if handler not in self._logger.handlers:
+                self._logger.addHandler(handler)
+
+    # -----------------
+    # Public methods
+    # -----------------
 
     def debug(self, msg, *args, **kwargs):
         self._logger.debug(msg, *args, **kwargs)
@@ -31,3 +112,100 @@ class Logger:
 
     def critical(self, msg, *args, **kwargs):
         self._logger.critical(msg, *args, **kwargs)
+
+    def progress(self, msg, *args, final=False, **kwargs):
+        """
+        Logs progress of long loop (e.g. crawling of pages) at most once per progress interval,
+        other messages are only counted. Message is formatted only when it is logged, so pass values as args.
+        :param msg: Message with %-style placeholders
+        :param final: The last message of loop, it is always logged
+        """
+        now = time.perf_counter()
+        if not final and self._last_progress is not None and now - self._last_progress < self._progress_interval:
+            self._skipped_progress += 1
+            return
+
+        if self._skipped_progress:
+            msg = f"{msg} (+%d vynecháno)"
+            args = args + (self._skipped_progress,)
+        self._last_progress = None if final else now
+        self._skipped_progress = 0
+        self._logger.info(msg, *args, **kwargs)
+
+    @classmethod
+    def configure(cls, stream=None, json_format=None):
+        """
+        Changes output of all loggers, records logged so far are written first
+        :param stream: Output stream, standard output by default
+        :param json_format: Write records as JSON lines, unchanged when None
+        """
+        with cls._lock:
+            cls.flush()
+            cls._stream = stream
+            if json_format is not None:
+                cls._json_format = json_format
+
+    @classmethod
+    def flush(cls):
+        """
+        Waits until background thread writes all records, it is started again by the next record
+        """
+        with cls._lock:
+            if cls._listener is not None and cls._listener_pid == os.getpid():
+                cls._listener.stop()
+            cls._listener = None
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    @classmethod
+    def _get_handler(cls):
+        if cls._handler is None:
+            cls._handler = _QueueHandler(cls._queue)
+        return cls._handler
+
+    @classmethod
+    def _ensure_listener(cls):
+        # Background thread does not exist in forked process, it has to be started there again
+        if cls._listener is not None and cls._listener_pid == os.getpid():
+            return
+
+        if cls._queue_pid != os.getpid():
+            # Fork without at-fork hooks (Python 3.6)
+            cls._reset_after_fork()
+
+        with cls._lock:
+            if cls._listener is None or cls._listener_pid != os.getpid():
+                handler = logging.StreamHandler(cls._stream if cls._stream is not None else sys.stdout)
+                handler.setFormatter(JsonFormatter() if cls._json_format else logging.Formatter(cls.TEXT_FORMAT))
+                cls._listener = QueueListener(cls._queue, handler)
+                cls._listener_pid = os.getpid()
+                cls._listener.start()
+
+                if cls._finalizer_pid != os.getpid():
+                    # Worker processes of multiprocessing do not run atexit, but they run its finalizers
+                    multiprocessing.util.Finalize(None, cls.flush, exitpriority=0)
+                    cls._finalizer_pid = os.getpid()
+
+    @classmethod
+    def _reset_after_fork(cls):
+        """
+        Gives forked process its own lock, queue and writer. Records which parent had queued are left
+        to the parent, so they are not written twice.
+        """
+        cls._lock = threading.RLock()
+        cls._queue = queue.Queue()
+        cls._queue_pid = os.getpid()
+        if cls._handler is not None:
+            cls._handler.queue = cls._queue
+        cls._listener = None
+        cls._listener_pid = None
+
+
+atexit.register(Logger.flush)
+
+if hasattr(os, "register_at_fork"):
+    # The lock is held during fork, so the child does not get it locked by another thread
+    os.register_at_fork(before=lambda: Logger._lock.acquire(), after_in_parent=lambda: Logger._lock.release(),
+                        after_in_child=Logger._reset_after_fork)
@@ -0,0 +1,289 @@
+# Basic libraries
+import sys
+import json
+import time
+import argparse
+import datetime
+import platform
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from functools import partial
+# App libraries
+from Benchmarks.summarization_benchmark import generate_text, load_sample_sentences
+from CLI.batch_runner import ANALYSES
+from NLP.nlp_service import NLPService
+from NLP.topic_model_store import TopicModelStore
+
+
+DEFAULT_WORD_COUNTS = (1000, 10000, 100000, 1000000)
+DEFAULT_PAGE_COUNTS = (1,)
+# Size of corpus analysed once by every analysis before measuring, so loading of models is not measured
+WARM_UP_WORD_COUNT = 200
+# Relative growth of duration or memory peak which is reported as regression
+DEFAULT_TIME_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.25
+# Durations shorter than this (in seconds) are not compared, they are mostly noise
+MIN_COMPARED_SECONDS = 0.05
+
+
+class _ServiceAnalysis:
+    """
+    Analysis of NLPService. Every measured call gets empty topic model store and no result cache, so models
+    are always trained. Temporary directory of the store is created and removed outside of measurement.
+    """
+
+    def __init__(self, analysis):
+        """
+        :param analysis: Function that gets NLPService
+        """
+        self._analysis = analysis
+
+    def __call__(self, page):
+        with self.prepare(page) as call:
+            return call()
+
+    @contextmanager
+    def prepare(self, page):
+        """
+        Prepares measured call of analysis of page
+        :param page: Text of page
+        :return: Context manager giving function without arguments, which runs only the analysis
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            store = TopicModelStore(directory)
+            yield lambda: self._analysis(NLPService(page, topic_model_store=store, result_cache=None))
+
+
+@contextmanager
+def _prepare_call(function, page):
+    """
+    Gets measured call of function with page, functions with 'prepare' method set up the call outside of measurement
+    """
+    if hasattr(function, "prepare"):
+        with function.prepare(page) as call:
+            yield call
+    else:
+        yield partial(function, page)
+
+
+def _get_word_movers(page):
+    # Halves of page are compared, so every page count has the same work per word
+    sentences = page.split(". ")
+    middle = max(1, len(sentences) // 2)
+    return NLPService.get_word_movers(". ".join(sentences[:middle]), ". ".join(sentences[middle:]))
+
+
+# Name of analysis -> function that gets text of one page, the same analyses as the main window and headless batch
+BENCHMARK_ANALYSES = {name: _ServiceAnalysis(analysis) for name, analysis in ANALYSES.items()}
+BENCHMARK_ANALYSES["word-movers"] = _get_word_movers
+
+
+def generate_corpus(word_count, page_count=1, seed=1):
+    """
+    Generates corpus of pages from sentences of bundled sample text, see generate_text
+    :param word_count: Number of words of all pages together
+    :param page_count: Number of pages
+    :param seed: Seed of random generator of the first page, every page has its own seed
+    :return: List of texts of pages
+    """
+    page_words = [word_count // page_count + (1 if page < word_count % page_count else 0)
+                  for page in range(page_count)]
+
+    sentences = load_sample_sentences()
+
+    return [generate_text(words, seed + page, sentences) for page, words in enumerate(page_words)]
+
+
+def measure(function, pages, trace_memory=True, repeat=1):
+    """
+    Measures analysis of all pages. Duration is measured without tracing of memory, which slows the code down,
+    the memory peak is measured by one more run under tracemalloc. Only calls of function are measured,
+    setup of function with 'prepare' method (see _ServiceAnalysis) is not.
+    :param function: Function that gets text of one page
+    :param pages: List of texts of pages
+    :param trace_memory: Whether to measure the memory peak
+    :param repeat: Number of timed runs, the shortest one is taken
+    :return: Tuple (duration in seconds, peak of traced memory in bytes or None)
+    """
+    durations = []
+    for _ in range(repeat):
+        duration = 0.0
+        for page in pages:
+            with _prepare_call(function, page) as call:
+                start = time.perf_counter()
+                call()
+                duration += time.perf_counter() - start
+        durations.append(duration)
+
+    peak_memory = None
+    if trace_memory:
+        # The largest peak of analysis of one page, results of pages are not kept
+        peak_memory = 0
+        for page in pages:
+            with _prepare_call(function, page) as call:
+                tracemalloc.start()
+                try:
+                    call()
+                    peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+                finally:
+                    tracemalloc.stop()
+
+    return min(durations), peak_memory
+
+
+def run_benchmark(word_counts=DEFAULT_WORD_COUNTS, page_counts=DEFAULT_PAGE_COUNTS, analyses=None,
+                  trace_memory=True, repeat=1, on_result=None):
+    """
+    Runs all analyses on corpora of all sizes, failed analysis is recorded with error and the benchmark continues
+    :param word_counts: Sizes of corpora in words
+    :param page_counts: Numbers of pages the corpora are split to
+    :param analyses: Dictionary name -> function that gets text of one page, BENCHMARK_ANALYSES by default
+    :param trace_memory: Whether to measure memory peaks
+    :param repeat: Number of timed runs of every analysis
+    :param on_result: Function called with every result, e.g. for printing of progress
+    :return: List of result dictionaries with analysis, words, pages, seconds, peak_memory and error
+    """
+    analyses = analyses if analyses is not None else BENCHMARK_ANALYSES
+
+    warm_up_pages = generate_corpus(WARM_UP_WORD_COUNT)
+    for function in analyses.values():
+        try:
+            function(warm_up_pages[0])
+        except Exception:
+            # The error is recorded by measured runs
+            pass
+
+    results = []
+    for word_count in word_counts:
+        for page_count in page_counts:
+            pages = generate_corpus(word_count, page_count)
+            for name, function in analyses.items():
+                result = {"analysis": name, "words": word_count, "pages": page_count, "seconds": None,
+                          "peak_memory": None, "error": None}
+                try:
+                    result["seconds"], result["peak_memory"] = measure(function, pages, trace_memory, repeat)
+                except Exception as ex:
+                    result["error"] = ex.__str__() or ex.__class__.__name__
+
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+
+    return results
+
+
+def save_results(path, results):
+    """
+    Saves results with description of environment as JSON, so runs can be compared later
+    :param path: Path of JSON file
+    :param results: Results of run_benchmark
+    """
+    try:
+        model_version = NLPService.get_model_version()
+    except Exception:
+        model_version = None
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created": datetime.datetime.now().isoformat(), "python": platform.python_version(),
+                   "platform": platform.platform(), "model_version": model_version, "results": results},
+                  f, ensure_ascii=False, indent=2)
+
+
+def load_results(path):
+    """
+    :param path: Path of JSON file written by save_results
+    :return: List of result dictionaries
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def find_regressions(baseline, current, time_threshold=DEFAULT_TIME_THRESHOLD,
+                     memory_threshold=DEFAULT_MEMORY_THRESHOLD, min_seconds=MIN_COMPARED_SECONDS):
+    """
+    Compares results of the same analysis, size and page count of two runs
+    :param baseline: Results of previous run
+    :param current: Results of current run
+    :param time_threshold: Allowed relative growth of duration, e.g. 0.25 is 25 %
+    :param memory_threshold: Allowed relative growth of memory peak
+    :param min_seconds: Durations of baseline shorter than this are not compared
+    :return: List of regression dictionaries with analysis, words, pages, metric, baseline, current and ratio,
+    analysis which failed only in current run is reported with metric 'error'
+    """
+    baseline_results = {(result["analysis"], result["words"], result["pages"]): result for result in baseline}
+
+    regressions = []
+    for result in current:
+        key = (result["analysis"], result["words"], result["pages"])
+        previous = baseline_results.get(key)
+        if previous is None or previous["error"] is not None:
+            continue
+
+        if result["error"] is not None:
+            regressions.append(dict(zip(("analysis", "words", "pages"), key), metric="error", baseline=None,
+                                    current=result["error"], ratio=None))
+            continue
+
+        for metric, threshold, minimum in (("seconds", time_threshold, min_seconds),
+                                           ("peak_memory", memory_threshold, 0)):
+            if previous[metric] is None or result[metric] is None or previous[metric] <= minimum:
+                continue
+
+            ratio = result[metric] / previous[metric]
+            if ratio > 1 + threshold:
+                regressions.append(dict(zip(("analysis", "words", "pages"), key), metric=metric,
+                                        baseline=previous[metric], current=result[metric], ratio=ratio))
+
+    return regressions
+
+
+def _format_result(result):
+    if result["error"] is not None:
+        return f"{result['analysis']:>18} {result['words']:>10} {result['pages']:>6}  error: {result['error']}"
+
+    memory = f"{result['peak_memory'] / 2 ** 20:12.1f}" if result["peak_memory"] is not None else f"{'n/a':>12}"
+    return f"{result['analysis']:>18} {result['words']:>10} {result['pages']:>6} {result['seconds']:12.3f} {memory}"
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of NLP analyses on corpora generated from sample text")
+    argument_parser.add_argument("--words", type=int, nargs="+", default=DEFAULT_WORD_COUNTS,
+                                 help="Sizes of generated corpora in words")
+    argument_parser.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGE_COUNTS,
+                                 help="Numbers of pages the corpora are split to")
+    argument_parser.add_argument("--analysis", nargs="+", choices=sorted(BENCHMARK_ANALYSES),
+                                 default=sorted(BENCHMARK_ANALYSES), help="Measured analyses")
+    argument_parser.add_argument("--repeat", type=int, default=1, help="Number of timed runs, the shortest is taken")
+    argument_parser.add_argument("--no-memory", action="store_true", help="Do not measure memory peaks")
+    argument_parser.add_argument("--output", help="JSON file where results are saved")
+    argument_parser.add_argument("--baseline", help="JSON file of previous run, regressions make exit code 1")
+    argument_parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD,
+                                 help="Allowed relative growth of duration")
+    argument_parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                                 help="Allowed relative growth of memory peak")
+    arguments = argument_parser.parse_args()
+
+    print(f"{'analysis':>18} {'words':>10} {'pages':>6} {'time [s]':>12} {'peak [MB]':>12}")
+    results = run_benchmark(arguments.words, arguments.pages,
+                            {name: BENCHMARK_ANALYSES[name] for name in arguments.analysis},
+                            not arguments.no_memory, arguments.repeat,
+                            lambda result: print(_format_result(result), flush=True))
+
+    if arguments.output:
+        save_results(arguments.output, results)
+
+    if arguments.baseline:
+        regressions = find_regressions(load_results(arguments.baseline), results, arguments.time_threshold,
+                                       arguments.memory_threshold)
+        for regression in regressions:
+            change = f"{regression['ratio']:.2f}x" if regression["ratio"] is not None else regression["current"]
+            print(f"Regression: {regression['analysis']} ({regression['words']} words, {regression['pages']} pages)"
+                  f" {regression['metric']}: {change}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Basic libraries
+import os
+import argparse
+import random
+import time
+# App libraries
+from NLP.summarization import TextRankSummarizer
+
+
+DEFAULT_WORD_COUNTS = (10000, 100000, 1000000)
+# Real English sentences with named entities, common nouns and verbs, so analyses do real work
+SAMPLE_TEXT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_text.txt")
+
+
+def load_sample_sentences(path=SAMPLE_TEXT_PATH):
+    """
+    Loads sentences of sample text, one sentence per line
+    :param path: Path of sample text
+    :return: List of sentences
+    """
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def generate_text(word_count, seed=1, sentences=None):
+    """
+    Generates text from sentences of sample text in random order, the last sentence is shortened
+    so the text has exactly the required number of words
+    :param word_count: Number of words in text
+    :param seed: Seed of random generator, the same seed gives the same text
+    :param sentences: List of sentences, sentences of bundled sample text by default
+    :return: Generated text
+    """
+    generator = random.Random(seed)
+    sentences = sentences if sentences is not None else load_sample_sentences()
+
+    parts = []
+    words = 0
+    while words < word_count:
+        sentence_words = generator.choice(sentences).split()[:word_count - words]
+        parts.append(" ".join(sentence_words).rstrip(".") + ".")
+        words += len(sentence_words)
+
+    return " ".join(parts)
+
+
+def measure(function, text):
+    start = time.perf_counter()
+    function(text)
+    return time.perf_counter() - start
+
+
+def get_gensim_summarize():
+    """
+    Gets previous implementation of summarization, it is not available in gensim 4 and newer
+    :return: Function or None
+    """
+    try:
+        from gensim.summarization import summarize
+    except ImportError:
+        return None
+
+    return summarize
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of text summarization")
+    argument_parser.add_argument("--words", type=int, nargs="+", default=DEFAULT_WORD_COUNTS,
+                                 help="Sizes of generated texts in words")
+    arguments = argument_parser.parse_args()
+
+    summarizer = TextRankSummarizer()
+    gensim_summarize = get_gensim_summarize()
+
+    print(f"{'words':>10} {'textrank [s]':>14} {'gensim [s]':>14}")
+    for word_count in arguments.words:
+        text = generate_text(word_count)
+        textrank_time = measure(summarizer.summarize, text)
+        gensim_time = f"{measure(gensim_summarize, text):14.3f}" if gensim_summarize else f"{'n/a':>14}"
+        print(f"{word_count:>10} {textrank_time:14.3f} {gensim_time}")
+
+
+if __name__ == "__main__":
+    main()
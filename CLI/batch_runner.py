@@ -0,0 +1,281 @@
+# Basic libraries
+from functools import partial
+from collections import namedtuple
+# App libraries
+from Instrumentation.metrics import METRICS
+from NLP.model_registry import ModelRegistry
+from NLP.nlp_service import NLPService
+from NLP.topic_model_store import TopicModelStore
+from Pipeline.pipeline_runner import PipelineRunner, Stage
+from WebParsing.web_parser import WebParser
+
+
+def _get_named_entity_recognition(nlp_service):
+    return [named_entity.__repr__() for named_entity in nlp_service.get_named_entity_recognition()], None
+
+
+def _get_topics(nlp_service):
+    gensim, processed_text = nlp_service.get_topic_modeling_and_summarization()
+    return [f"{topic[0]} - {topic[1]}" for topic in gensim.get_topics()], processed_text
+
+
+def _get_summarization(nlp_service):
+    gensim, processed_text = nlp_service.get_topic_modeling_and_summarization()
+    return gensim.get_summarization().split("\n"), processed_text
+
+
+# Name of analysis -> function that gets NLPService and returns (list of result lines, processed text),
+# the same analyses as buttons of the main window
+ANALYSES = {
+    "entities": _get_named_entity_recognition,
+    "textacy-entities": lambda nlp_service: nlp_service.get_named_entity(),
+    "topics": _get_topics,
+    "summarization": _get_summarization,
+    "n-grams": lambda nlp_service: nlp_service.get_n_grams(),
+    "key-terms": lambda nlp_service: nlp_service.get_key_terms(),
+    "pos-regex": lambda nlp_service: nlp_service.get_pos_regex(),
+    "bag-of-terms": lambda nlp_service: nlp_service.get_bag_of_terms(),
+}
+
+# Name of query -> function that gets WebParser and argument of query and returns list of result lines
+QUERIES = {
+    "tags": lambda web_parser, _: web_parser.get_all_tags(),
+    "text": lambda web_parser, _: web_parser.get_all_text().split("\n"),
+    "links": lambda web_parser, _: web_parser.get_all_links(),
+    "emails": lambda web_parser, _: web_parser.get_all_emails(),
+    "tag": lambda web_parser, tag: web_parser.get_items_by_tag(tag),
+    "class": lambda web_parser, cls: web_parser.get_items_by_class(cls),
+    "following-links": lambda web_parser, level: web_parser.get_all_following_links(int(level)),
+}
+
+# Queries which need argument, e.g. 'tag:h1'
+QUERIES_WITH_ARGUMENT = ("tag", "class", "following-links")
+
+# Item passed between stages of pipeline, content is HTML or text of source, records are finished results,
+# metrics are state of metrics of worker process which processed the item
+BatchItem = namedtuple("BatchItem", ("source", "records", "content", "metrics"))
+BatchItem.__new__.__defaults__ = (None,)
+
+
+def create_record(source, operation, result=None, processed_text=None, error=None):
+    """
+    Creates one output record
+    :param source: URL or path of input file
+    :param operation: Name of query or analysis, with argument of query (e.g. 'tag:h1')
+    :param result: List of result lines
+    :param processed_text: Text processed by analysis, if the analysis has one
+    :param error: Error message when the operation failed
+    :return: Dictionary
+    """
+    return {"source": source, "operation": operation, "result": [str(line) for line in result or ()],
+            "processed_text": processed_text, "error": error}
+
+
+def parse_query(query):
+    """
+    Splits query to name and argument and checks it
+    :param query: Query, e.g. 'links' or 'tag:h1'
+    :return: Tuple (name, argument)
+    """
+    name, _, argument = query.partition(":")
+    if name not in QUERIES:
+        raise ValueError(f"Neznámý dotaz '{name}', dostupné: {', '.join(QUERIES)}")
+    if (name in QUERIES_WITH_ARGUMENT) != bool(argument):
+        raise ValueError(f"Dotaz '{name}' " + ("vyžaduje argument, např. 'tag:h1'" if name in QUERIES_WITH_ARGUMENT
+                                                else "nemá argument"))
+
+    return name, argument
+
+
+def fetch_page(item):
+    """
+    Downloads page, error of download is recorded and the page is not processed further
+    :param item: BatchItem with URL as source
+    :return: BatchItem with HTML of page as content
+    """
+    try:
+        if not WebParser.is_url_valid(item.source):
+            raise ValueError("Url není validní!")
+        return item._replace(content=WebParser.fetch_html(item.source))
+    except Exception as ex:
+        return item._replace(records=item.records + [create_record(item.source, "fetch", error=ex.__str__())])
+
+
+def parse_page(item, queries):
+    """
+    Parses page and runs web parser queries on it
+    :param item: BatchItem with HTML of page as content
+    :param queries: List of queries
+    :return: BatchItem with text of page as content
+    """
+    if item.content is None:
+        return item
+
+    web_parser = WebParser.from_html(item.content)
+
+    records = list(item.records)
+    for query in queries:
+        name, argument = parse_query(query)
+        try:
+            records.append(create_record(item.source, query, QUERIES[name](web_parser, argument)))
+        except Exception as ex:
+            records.append(create_record(item.source, query, error=ex.__str__()))
+
+    return BatchItem(item.source, records, web_parser.get_all_text())
+
+
+def read_text(item):
+    """
+    Reads input text file, error of reading is recorded and the file is not processed further
+    :param item: BatchItem with path of file as source
+    :return: BatchItem with text of file as content
+    """
+    try:
+        with open(item.source, encoding="utf-8") as f:
+            return item._replace(content=f.read())
+    except OSError as ex:
+        return item._replace(records=item.records + [create_record(item.source, "read", error=ex.__str__())])
+
+
+def analyze_text(item, analyses, topic_model_directory=None):
+    """
+    Runs NLP analyses of text, it runs in worker process
+    :param item: BatchItem with text as content
+    :param analyses: List of names of analyses
+    :param topic_model_directory: Directory of topic model store, topic models are trained in memory when None
+    :return: BatchItem with records of analyses and without content
+    """
+    if item.content is None:
+        return item
+
+    # Pages are already analysed in parallel, so every model is trained by one process
+    topic_model_store = TopicModelStore(topic_model_directory, workers=1) if topic_model_directory else None
+    nlp_service = NLPService(item.content, topic_model_store=topic_model_store)
+
+    records = list(item.records)
+    for analysis in analyses:
+        try:
+            result, processed_text = ANALYSES[analysis](nlp_service)
+            records.append(create_record(item.source, analysis, result, processed_text))
+        except Exception as ex:
+            records.append(create_record(item.source, analysis, error=ex.__str__()))
+
+    return BatchItem(item.source, records, None)
+
+
+def _initialize_nlp_worker(shared_vectors_directory):
+    """
+    Prepares NLP worker process, metrics inherited from the main process are forgotten,
+    so the worker sends back only its own values
+    :param shared_vectors_directory: Directory of shared vectors or None
+    """
+    ModelRegistry.attach_shared_vectors(shared_vectors_directory)
+    METRICS.reset()
+
+
+def _analyze_text_in_worker(item, analyses, topic_model_directory=None):
+    """
+    Runs NLP analyses in worker process and sends metrics observed since the previous item with result
+    """
+    return analyze_text(item, analyses, topic_model_directory)._replace(metrics=METRICS.get_state(reset=True))
+
+
+class BatchRunner:
+    """
+    Runs web parser queries and NLP analyses on list of URLs or text files without GUI.
+    Pages are downloaded and parsed in threads, NLP analyses run in worker processes,
+    records are streamed to writer as soon as a page is done.
+    """
+
+    def __init__(self, writer, queries=(), analyses=(), fetch_workers=8, workers=2, queue_size=64,
+                 topic_model_directory=None):
+        """
+        :param writer: Writer of records with method 'write'
+        :param queries: Web parser queries, keys of QUERIES, e.g. 'links' or 'tag:h1'
+        :param analyses: NLP analyses, keys of ANALYSES
+        :param fetch_workers: Number of threads downloading pages
+        :param workers: Number of NLP worker processes
+        :param queue_size: Maximal number of pages waiting between two stages
+        :param topic_model_directory: Directory of topic model store shared by worker processes,
+        topic models are trained in memory for every page when None
+        """
+        for query in queries:
+            parse_query(query)
+        for analysis in analyses:
+            if analysis not in ANALYSES:
+                raise ValueError(f"Neznámá analýza '{analysis}', dostupné: {', '.join(ANALYSES)}")
+        if not queries and not analyses:
+            raise ValueError("Není zadán žádný dotaz ani analýza")
+
+        self._writer = writer
+        self._queries = list(queries)
+        self._analyses = list(analyses)
+        self._fetch_workers = fetch_workers
+        self._workers = workers
+        self._queue_size = queue_size
+        self._topic_model_directory = topic_model_directory
+        self._written_records = 0
+        self._failed_records = 0
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def written_records(self):
+        return self._written_records
+
+    @property
+    def failed_records(self):
+        return self._failed_records
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def run_urls(self, urls):
+        """
+        Downloads pages and processes them
+        :param urls: Iterable of URLs, it is consumed lazily
+        :return: Tuple of StageStatistics
+        """
+        stages = [Stage("fetch", fetch_page, self._fetch_workers),
+                  Stage("parse", partial(parse_page, queries=self._queries), max(1, self._fetch_workers // 4))]
+
+        return self._run(stages, urls)
+
+    def run_text_files(self, paths):
+        """
+        Processes texts of files, web parser queries are not used
+        :param paths: Iterable of paths of text files
+        :return: Tuple of StageStatistics
+        """
+        if not self._analyses:
+            raise ValueError("Textové soubory lze jen analyzovat, není zadána žádná analýza")
+
+        return self._run([Stage("read", read_text)], paths)
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _run(self, stages, sources):
+        if self._analyses:
+            analyze = partial(_analyze_text_in_worker, analyses=self._analyses,
+                              topic_model_directory=self._topic_model_directory)
+            stages.append(Stage("nlp", analyze, self._workers,
+                                processes=True, initializer=_initialize_nlp_worker,
+                                initargs=(ModelRegistry.get_shared_vectors_directory(),)))
+
+        runner = PipelineRunner(stages, self._write, self._queue_size)
+
+        return runner.run((source, BatchItem(source, [], None)) for source in sources)
+
+    def _write(self, source, item):
+        if item.metrics is not None:
+            METRICS.merge_state(item.metrics)
+        for record in item.records:
+            self._writer.write(record)
+            self._written_records += 1
+            if record["error"] is not None:
+                self._failed_records += 1
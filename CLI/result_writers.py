@@ -0,0 +1,114 @@
+# Basic libraries
+import sys
+import json
+
+
+class JsonLinesWriter:
+    """
+    Writes records as JSON objects, one per line. Every record is flushed immediately,
+    so results can be read while the batch still runs.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: Path of output file, standard output when None or '-'
+        """
+        self._file = sys.stdout if path in (None, "-") else open(path, "w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class ParquetWriter:
+    """
+    Writes records to columnar Parquet file, records are buffered and written in row groups.
+    Requires optional library pyarrow.
+    """
+
+    # Columns of records and their types
+    COLUMNS = (("source", "string"), ("operation", "string"), ("result", "list"),
+               ("processed_text", "string"), ("error", "string"))
+
+    def __init__(self, path, row_group_size=1000):
+        """
+        :param path: Path of output file
+        :param row_group_size: Number of records in one row group
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Výstup ve formátu Parquet vyžaduje knihovnu pyarrow (pip install pyarrow)")
+
+        self._pyarrow = pyarrow
+        self._schema = pyarrow.schema([(name, pyarrow.list_(pyarrow.string()) if kind == "list" else pyarrow.string())
+                                       for name, kind in self.COLUMNS])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+        self._row_group_size = row_group_size
+        self._records = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def write(self, record):
+        self._records.append(record)
+        if len(self._records) >= self._row_group_size:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _flush(self):
+        if not self._records:
+            return
+
+        columns = {name: [record[name] for record in self._records] for name, _ in self.COLUMNS}
+        self._writer.write_table(self._pyarrow.Table.from_pydict(columns, schema=self._schema))
+        self._records = []
+
+
+def create_writer(path=None, output_format=None):
+    """
+    Creates writer of records
+    :param path: Path of output file, standard output when None or '-'
+    :param output_format: 'jsonl' or 'parquet', it is chosen by extension of path when None
+    :return: JsonLinesWriter or ParquetWriter
+    """
+    if output_format is None:
+        output_format = "parquet" if path is not None and path.endswith(".parquet") else "jsonl"
+
+    if output_format == "jsonl":
+        return JsonLinesWriter(path)
+    if output_format == "parquet":
+        if path in (None, "-"):
+            raise ValueError("Výstup ve formátu Parquet nelze zapsat na standardní výstup")
+        return ParquetWriter(path)
+
+    raise ValueError(f"Neznámý formát výstupu '{output_format}'")
@@ -10,7 +10,11 @@ class App(QtWidgets.QApplication):
     def __init__(self):
         super(App, self).__init__(sys.argv)
 
-    def build(self):
-        self.main_form = MainForm()
+    def build(self, prewarm_libraries=True, startup_profile=None):
+        """
+        :param prewarm_libraries: Import heavy NLP libraries in background after the window is shown
+        :param startup_profile: StartupProfile which records phases of startup
+        """
+        self.main_form = MainForm(prewarm_libraries=prewarm_libraries, startup_profile=startup_profile)
 
         sys.exit(self.exec_())
@@ -1,9 +1,20 @@
 # Basic libraries
+import threading
 from functools import wraps
 # App libraries
+from Instrumentation.profiling import Profiler
+from NLP.incremental_analysis import IncrementalAnalyzer
+from NLP.lazy_import import prewarm
 from NLP.nlp_service import NLPService
+from NLP.result_cache import AnalysisResultCache
+from NLP.topic_model_store import TopicModelStore
+from Search.inverted_index import InvertedIndex
+from WebParsing.page_cache import PageCache
 from WebParsing.web_parser import WebParser
+from .MetricsForm import MetricsForm
 from .NLPResultForm import NLPResultForm
+from .ResultView import ResultView
+from .WorkerPool import WorkerPool
 from .WordMoversForm import WordMoversForm
 # Third-party libraries
 from PyQt5 import QtWidgets, QtGui, QtCore
@@ -11,6 +22,11 @@ from PyQt5 import QtWidgets, QtGui, QtCore
 
 class MainForm(QtWidgets.QMainWindow):
 
+    # Interval of update of page age in milliseconds
+    PAGE_STATE_INTERVAL = 5000
+    # Directory of profiled operations when profiling is switched on in the window
+    PROFILE_DIRECTORY = "profiles"
+
     # -----------------
     # Decorators
     # -----------------
@@ -25,16 +41,6 @@ class MainForm(QtWidgets.QMainWindow):
 
         return check_argument_wrapper
 
-    def check_url_changed(fn):
-        @wraps(fn)
-        def check_url_wrapper(self):
-            if self.is_url_new:
-                self.load_web_page()
-
-            return fn(self)
-
-        return check_url_wrapper
-
     def check_url_valid(fn):
         @wraps(fn)
         def check_url_valid_wrapper(self):
@@ -67,14 +73,30 @@ class MainForm(QtWidgets.QMainWindow):
     # Initializations
     # -----------------
 
-    def __init__(self, **kwargs):
+    def __init__(self, prewarm_libraries=True, startup_profile=None, **kwargs):
+        """
+        :param prewarm_libraries: Import heavy NLP libraries in background after the window is shown
+        :param startup_profile: StartupProfile which records phases of startup
+        """
         super(MainForm, self).__init__(**kwargs)
 
-        # Web parser and NLP service init
-        self._web_parser = WebParser()
-        self._nlp_service = NLPService()
-        # Init of inner properties
-        self._last_url = ""
+        self._startup_profile = startup_profile
+
+        # Page cache init, NLP service is created on first use (it imports heavy NLP libraries)
+        self._page_cache = PageCache()
+        self._nlp_service = None
+        self._incremental_analyzer = None
+        self._nlp_service_lock = threading.Lock()
+        # URL -> number of content blocks changed by the last refresh of the page
+        self._changed_blocks = dict()
+        self._search_index = InvertedIndex()
+        self._search_index_lock = threading.Lock()
+        # Token of job whose partial results are appended to result view
+        self._result_stream = None
+        # Background jobs, several of them can run concurrently
+        self._worker_pool = WorkerPool(parent=self)
+        self._worker_pool.running_jobs_changed.connect(self._on_running_jobs_changed)
+        self._worker_pool.progress_changed.connect(self._on_job_progress)
 
         # Window initialization
         self.setWindowTitle("Parsování a analýza webových stránek")
@@ -103,15 +125,54 @@ class MainForm(QtWidgets.QMainWindow):
         self._error_label.setWordWrap(True)
         web_url_layout.addWidget(self._error_label)
 
+        # Progress of background jobs
+        progress_layout = QtWidgets.QHBoxLayout()
+
+        self._progress_label = QtWidgets.QLabel("", self)
+        self._progress_label.setFont(QtGui.QFont("Courier New", 12))
+        progress_layout.addWidget(self._progress_label)
+
+        self._progress_bar = QtWidgets.QProgressBar(self)
+        self._progress_bar.setVisible(False)
+        progress_layout.addWidget(self._progress_bar)
+
+        self._cancel_button = QtWidgets.QPushButton("Zrušit úlohy", self)
+        self._cancel_button.setFont(QtGui.QFont("Courier New", 12, QtGui.QFont.Black))
+        self._cancel_button.setEnabled(False)
+        self._cancel_button.clicked.connect(self._worker_pool.cancel_all)
+        progress_layout.addWidget(self._cancel_button)
+
+        web_url_layout.addLayout(progress_layout)
+
         # Url + Argument
         url_label = QtWidgets.QLabel("Adresa webové stránky", self)
         url_label.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Black))
         web_url_layout.addWidget(url_label)
 
+        url_edit_layout = QtWidgets.QHBoxLayout()
+
         self.url_edit = QtWidgets.QLineEdit(self)
         self.url_edit.setText("https://cs.wikipedia.org/wiki/Hlavn%C3%AD_strana")
         self.url_edit.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
-        web_url_layout.addWidget(self.url_edit)
+        self.url_edit.textChanged.connect(self._update_page_state)
+        url_edit_layout.addWidget(self.url_edit)
+
+        refresh_page = QtWidgets.QPushButton("Obnovit stránku", self)
+        refresh_page.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
+        refresh_page.clicked.connect(self._on_refresh_page)
+        url_edit_layout.addWidget(refresh_page)
+
+        web_url_layout.addLayout(url_edit_layout)
+
+        self._page_state_label = QtWidgets.QLabel("", self)
+        self._page_state_label.setFont(QtGui.QFont("Courier New", 12))
+        web_url_layout.addWidget(self._page_state_label)
+
+        # Age of loaded page is updated periodically
+        self._page_state_timer = QtCore.QTimer(self)
+        self._page_state_timer.timeout.connect(self._update_page_state)
+        self._page_state_timer.start(self.PAGE_STATE_INTERVAL)
+        self._update_page_state()
 
         argument_label = QtWidgets.QLabel("Argument", self)
         argument_label.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Black))
@@ -138,6 +199,16 @@ class MainForm(QtWidgets.QMainWindow):
         cb_get_tags.clicked.connect(self._on_get_all_tags)
         common_buttons_layout.addWidget(cb_get_tags)
 
+        cb_show_metrics = QtWidgets.QPushButton("Statistiky výkonu", self)
+        cb_show_metrics.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
+        cb_show_metrics.clicked.connect(self._on_show_metrics)
+        common_buttons_layout.addWidget(cb_show_metrics)
+
+        cb_profiling = QtWidgets.QCheckBox(f"Profilovat operace ({self.PROFILE_DIRECTORY})", self)
+        cb_profiling.setChecked(Profiler.is_enabled())
+        cb_profiling.toggled.connect(self._on_toggle_profiling)
+        common_buttons_layout.addWidget(cb_profiling)
+
         # Web parsing - buttons
         web_parsing_layout = QtWidgets.QVBoxLayout()
         # web_parsing_layout.addStretch()
@@ -183,6 +254,18 @@ class MainForm(QtWidgets.QMainWindow):
         wp_get_all_following_links_arg_lab = QtWidgets.QLabel("Argument: úroveň", self)
         web_parsing_layout.addWidget(wp_get_all_following_links_arg_lab)
 
+        wp_index_page = QtWidgets.QPushButton("Indexovat stránku", self)
+        wp_index_page.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
+        wp_index_page.clicked.connect(self._on_index_page)
+        web_parsing_layout.addWidget(wp_index_page)
+
+        wp_search_index = QtWidgets.QPushButton("Hledat v indexu", self)
+        wp_search_index.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
+        wp_search_index.clicked.connect(self._on_search_index)
+        web_parsing_layout.addWidget(wp_search_index)
+        wp_search_index_arg_lab = QtWidgets.QLabel("Argument: dotaz (AND, OR, NOT, \"fráze\")", self)
+        web_parsing_layout.addWidget(wp_search_index_arg_lab)
+
         # Web analysis - buttons
         web_analysis_layout = QtWidgets.QVBoxLayout()
         # web_analysis_layout.addStretch()
@@ -247,10 +330,9 @@ class MainForm(QtWidgets.QMainWindow):
         result_label.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Black))
         result_layout.addWidget(result_label)
 
-        self.result_edit = QtWidgets.QTextEdit(self)
-        self.result_edit.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
-        self.result_edit.setMinimumHeight(500)
-        result_layout.addWidget(self.result_edit)
+        self.result_view = ResultView(editable=True, parent=self)
+        self.result_view.setMinimumHeight(500)
+        result_layout.addWidget(self.result_view)
 
         # Layout set
         buttons_layout.addStretch()
@@ -270,16 +352,23 @@ class MainForm(QtWidgets.QMainWindow):
 
         self.show()
 
-    def load_web_page(self):
+        if self._startup_profile is not None:
+            self._startup_profile.mark("Vytvoření hlavního okna")
+            # First tick of event loop, the window is painted
+            QtCore.QTimer.singleShot(0, self._on_window_shown)
+        if prewarm_libraries:
+            QtCore.QTimer.singleShot(0, self._prewarm_libraries)
+
+    def load_web_page(self, refresh=False):
         if self.url != "":
-            self._web_parser.load_page(self.url)
+            self._page_cache.get(self.url, refresh)
 
     # -----------------
     # Public methods
     # -----------------
 
     def is_url_valid(self):
-        return self._web_parser.is_url_valid(self.url)
+        return WebParser.is_url_valid(self.url)
 
     # -----------------
     # Properties
@@ -295,190 +384,423 @@ class MainForm(QtWidgets.QMainWindow):
 
     @property
     def result(self):
-        return self.result_edit.toPlainText()
+        return self.result_view.text
 
     @property
     def is_url_new(self):
-        return self.url != self._last_url
+        return not self._page_cache.contains(self.url)
 
     # -----------------
     # Private methods
     # -----------------
 
     def _set_result(self, result_text):
-        self.result_edit.setText(result_text)
+        self._result_stream = None
+        self.result_view.set_text(result_text)
+
+    def _set_result_lines(self, lines):
+        # Lines are handed to the view directly, they are not joined into one text and split again
+        self._set_result("")
+        self.result_view.append_lines(list(lines))
+
+    def _start_result_stream(self):
+        """
+        Clears result, lines are then appended by partial results of a job until another result is set
+        :return: Function appending lines, it ignores them when another result was set meanwhile
+        """
+        self._set_result("")
+        stream = object()
+        self._result_stream = stream
+
+        def append_lines(lines):
+            if self._result_stream is stream:
+                self.result_view.append_lines(lines)
+
+        return append_lines
+
+    def _set_error(self, message):
+        self._error_label.setText(message)
+
+    def _get_nlp_service(self):
+        """
+        Gets shared NLP service, it is created on first use from any thread
+        """
+        with self._nlp_service_lock:
+            if self._nlp_service is None:
+                result_cache = AnalysisResultCache(model_version=NLPService.get_model_version())
+                self._nlp_service = NLPService(topic_model_store=TopicModelStore(), result_cache=result_cache)
+
+            return self._nlp_service
+
+    def _get_incremental_analyzer(self):
+        """
+        Gets analyzer which re-analyses only changed blocks of re-crawled pages, it shares result cache
+        with NLP service
+        """
+        nlp_service = self._get_nlp_service()
+        with self._nlp_service_lock:
+            if self._incremental_analyzer is None:
+                self._incremental_analyzer = IncrementalAnalyzer(nlp_service.result_cache,
+                                                                 nlp_service.max_chunk_length)
+
+            return self._incremental_analyzer
+
+    def _create_nlp_service(self, text):
+        """
+        Every job has its own NLP service, so concurrent analyses do not share text. Models, topic model store
+        and result cache are shared.
+        """
+        nlp_service = self._get_nlp_service()
+
+        return NLPService(text, topic_model_store=nlp_service.topic_model_store,
+                          result_cache=nlp_service.result_cache)
+
+    def _prewarm_libraries(self):
+        """
+        Imports heavy NLP libraries in background, so the first analysis does not wait for them
+        """
+        def run(job):
+            prewarm()
+            self._get_nlp_service()
+
+        self._worker_pool.start("Příprava knihoven", run, self._on_libraries_prewarmed, self._set_error)
+
+    def _start_job(self, name, function, on_finished, refresh=False, on_partial_result=None):
+        """
+        Runs function in background, page of current URL is loaded first when it is not in page cache
+        :param name: Name of job shown in progress
+        :param function: Function that gets WebParser with loaded page and Job, it runs in worker thread
+        :param on_finished: Function called with result of function in the main thread
+        :param refresh: Download page again even if it is in page cache
+        :param on_partial_result: Function called with lines reported by the job in the main thread
+        """
+        url = self.url
+
+        def run(job):
+            job.report_progress(0, 0, "Načítání stránky")
+            web_parser = self._page_cache.get(url, refresh).web_parser
+            job.check_cancelled()
+            job.report_progress(0, 0, "Zpracování")
+
+            return function(web_parser, job)
+
+        self._worker_pool.start(name, run, on_finished, self._set_error, on_partial_result)
+
+    def _start_analysis(self, name, analysis, show_result):
+        """
+        Runs NLP analysis of current results in background
+        :param name: Name of job shown in progress
+        :param analysis: Function that gets NLPService with text of results, it runs in worker thread
+        :param show_result: Function called with result of analysis and analysed text in the main thread
+        """
+        text = self.result
+        self._start_job(name, lambda web_parser, job: analysis(self._create_nlp_service(text)),
+                        lambda result: show_result(result, text))
+
+    def _update_page_state(self):
+        age = self._page_cache.get_age(self.url)
+        if age is None:
+            self._page_state_label.setText("Stránka není načtena")
+            return
+
+        age_text = f"{int(age)} s" if age < 60 else f"{int(age // 60)} min"
+        changed_blocks = self._changed_blocks.get(self.url)
+        changes_text = "" if changed_blocks is None else f", změněné bloky textu: {changed_blocks}"
+        if self._page_cache.is_stale(self.url):
+            self._page_state_label.setText(f"Stránka načtena před {age_text}{changes_text} - zastaralá, obnovte ji")
+        else:
+            self._page_state_label.setText(f"Stránka načtena před {age_text}{changes_text}")
 
     # -----------------
     # Event handlers
     # -----------------
 
+    def _on_window_shown(self):
+        self._startup_profile.mark("Zobrazení okna")
+        self._startup_profile.log_report()
+
+    def _on_libraries_prewarmed(self, _):
+        if self._startup_profile is not None:
+            self._startup_profile.mark("Příprava knihoven na pozadí")
+            self._startup_profile.log_report()
+
+    # Background jobs
+
+    def _on_running_jobs_changed(self, count):
+        self._update_page_state()
+        self._cancel_button.setEnabled(count > 0)
+        if count:
+            self._progress_label.setText(f"Běžící úlohy: {count}")
+        else:
+            self._progress_label.setText("")
+            self._progress_bar.setVisible(False)
+
+    def _on_job_progress(self, name, done, total, message):
+        self._progress_label.setText(f"{name}: {message} (běžící úlohy: {len(self._worker_pool.running_jobs)})")
+        self._progress_bar.setVisible(bool(self._worker_pool.running_jobs))
+        # Range 0 - 0 shows busy indicator of unknown progress
+        self._progress_bar.setRange(0, total)
+        self._progress_bar.setValue(done)
+
     # Common
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
+    def _on_refresh_page(self):
+        url = self.url
+
+        def refresh(job):
+            job.report_progress(0, 0, "Načítání stránky")
+            previous_text = self._page_cache.get(url).web_parser.get_all_text() if self._page_cache.contains(url) \
+                else None
+            text = self._page_cache.get(url, refresh=True).web_parser.get_all_text()
+            if previous_text is None:
+                return url, None
+
+            return url, len(self._get_incremental_analyzer().get_changed_blocks(previous_text, text))
+
+        self._worker_pool.start("Obnovit stránku", refresh, self._on_page_refreshed, self._set_error)
+
+    def _on_page_refreshed(self, result):
+        url, changed_blocks = result
+        if changed_blocks is None:
+            self._changed_blocks.pop(url, None)
+        else:
+            self._changed_blocks[url] = changed_blocks
+        self._update_page_state()
+
+    @catch_exception
+    @reset_error_message
+    @check_url_valid
     def _on_get_all_tags(self):
-        all_tags = self._web_parser.get_all_tags()
-        self._set_result("\n".join(all_tags))
+        self._start_job("Vypsat tagy", lambda web_parser, job: web_parser.get_all_tags(), self._set_result_lines)
+
+    @catch_exception
+    @reset_error_message
+    def _on_show_metrics(self):
+        self.metrics_form = MetricsForm()
+        self.metrics_form.show()
+
+    def _on_toggle_profiling(self, checked):
+        if checked:
+            Profiler.enable(self.PROFILE_DIRECTORY)
+        else:
+            Profiler.disable()
 
     # Web parsing
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_get_all_text(self):
-        text = self._web_parser.get_all_text()
-        self._set_result(text)
+        self._start_job("Vypsat text", lambda web_parser, job: web_parser.get_all_text(), self._set_result)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
     @check_argument
-    @check_url_changed
     def _on_get_items_by_tag(self):
-        items_by_tag = self._web_parser.get_items_by_tag(self.argument)
-        self._set_result("\n".join(items_by_tag))
+        tag = self.argument
+        self._start_job("Text dle tagu", lambda web_parser, job: web_parser.get_items_by_tag(tag),
+                        self._set_result_lines)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
     @check_argument
-    @check_url_changed
     def _on_get_items_by_class(self):
-        items_by_class = self._web_parser.get_items_by_tag(self.argument)
-        self._set_result("\n".join(items_by_class))
+        cls = self.argument
+        self._start_job("Text dle třídy", lambda web_parser, job: web_parser.get_items_by_tag(cls),
+                        self._set_result_lines)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_get_all_links(self):
-        links = self._web_parser.get_all_links()
-        self._set_result("\n".join(links))
+        self._start_job("Získat všechny odkazy", lambda web_parser, job: web_parser.get_all_links(),
+                        self._set_result_lines)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_get_all_emails(self):
-        emails = self._web_parser.get_all_emails()
-        self._set_result("\n".join(emails))
+        self._start_job("Získat všechny emaily", lambda web_parser, job: web_parser.get_all_emails(),
+                        self._set_result_lines)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
     @check_argument
-    @check_url_changed
     def _on_get_all_following_links(self):
-        following_links = self._web_parser.get_all_following_links(int(self.argument))
-        self._set_result("\n".join(following_links))
+        level = int(self.argument)
+
+        def get_following_links(web_parser, job):
+            # Links of every crawled page are shown as soon as the page is downloaded
+            return len(web_parser.get_all_following_links(level, job.report_progress, lambda: job.is_cancelled,
+                                                          job.report_partial_result))
+
+        self._start_job("Získat odkazy do úrovně", get_following_links, lambda _: None,
+                        on_partial_result=self._start_result_stream())
+
+    @catch_exception
+    @reset_error_message
+    @check_url_valid
+    def _on_index_page(self):
+        url = self.url
+
+        def index_page(web_parser, job):
+            # Pages are committed as one batch before the next search, not one segment per page
+            with self._search_index_lock:
+                self._search_index.add(url, web_parser.get_all_text())
+                return f"Stránka zaindexována, počet stránek v indexu: {len(self._search_index)}"
+
+        self._start_job("Indexovat stránku", index_page, self._set_result)
+
+    @catch_exception
+    @reset_error_message
+    @check_argument
+    def _on_search_index(self):
+        query = self.argument
+
+        def search(job):
+            # Search needs no page, so it does not load the current URL like _start_job
+            job.report_progress(0, 0, "Vyhledávání")
+            with self._search_index_lock:
+                if self._search_index.pending_count:
+                    self._search_index.commit()
+                found_pages = self._search_index.search(query, k=50)
+
+            return [f"{score:.4f} - {url}" for url, score in found_pages]
+
+        self._worker_pool.start("Hledat v indexu", search, self._set_result_lines, self._set_error)
 
     # NLP
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_named_entity_recognition(self):
-        self._nlp_service.text = self.result
-        named_entities = self._nlp_service.get_named_entity_recognition()
+        def get_named_entity_recognition(nlp_service):
+            # Only blocks changed since the last analysis of the page are analysed again
+            return self._get_incremental_analyzer().get_named_entity_recognition(nlp_service.text)
+
+        def show_result(named_entities, text):
+            self.named_entity_form = NLPResultForm("\n".join([ne.__repr__() for ne in named_entities]),
+                                                   raw_text=text, header="Rozpoznání entit")
+            self.named_entity_form.show()
 
-        self.named_entity_form = NLPResultForm("\n".join([ne.__repr__() for ne in named_entities]),
-                                               raw_text=self.result, header="Rozpoznání entit")
-        self.named_entity_form.show()
+        self._start_analysis("Rozpoznání entit", get_named_entity_recognition, show_result)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_wa_topic_modeling(self):
-        self._nlp_service.text = self.result
-        gensim, processed_text = self._nlp_service.get_topic_modeling_and_summarization()
-        topics = [f"{topic[0]} - {topic[1]}" for topic in gensim.get_topics()]
+        def get_topics(nlp_service):
+            gensim, processed_text = nlp_service.get_topic_modeling_and_summarization()
+            return [f"{topic[0]} - {topic[1]}" for topic in gensim.get_topics()], processed_text
+
+        def show_result(result, text):
+            topics, processed_text = result
+            self.topic_modeling_form = NLPResultForm("\n".join(topics), text, processed_text, "Témata")
+            self.topic_modeling_form.show()
 
-        self.topic_modeling_form = NLPResultForm("\n".join(topics), self.result, processed_text, "Témata")
-        self.topic_modeling_form.show()
+        self._start_analysis("Témata", get_topics, show_result)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_wa_text_summarization(self):
-        self._nlp_service.text = self.result
-        gensim, processed_text = self._nlp_service.get_topic_modeling_and_summarization()
-        summarization = gensim.get_summarization()
+        def get_summarization(nlp_service):
+            gensim, processed_text = nlp_service.get_topic_modeling_and_summarization()
+            return gensim.get_summarization(), processed_text
 
-        self.text_summarization_form = NLPResultForm(summarization, self.result, processed_text, "Sumarizace textu")
-        self.text_summarization_form.show()
+        def show_result(result, text):
+            summarization, processed_text = result
+            self.text_summarization_form = NLPResultForm(summarization, text, processed_text, "Sumarizace textu")
+            self.text_summarization_form.show()
+
+        self._start_analysis("Sumarizace textu", get_summarization, show_result)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_wa_textacy_n_grams(self):
-        self._nlp_service.text = self.result
+        def get_n_grams(nlp_service):
+            return self._get_incremental_analyzer().get_n_grams(nlp_service.text)
 
-        n_grams, processed_text = self._nlp_service.get_n_grams()
+        def show_result(result, text):
+            n_grams, processed_text = result
+            self.textacy_n_grams_form = NLPResultForm("\n".join(n_grams), text, processed_text, "N Gramy")
+            self.textacy_n_grams_form.show()
 
-        self.textacy_n_grams_form = NLPResultForm("\n".join(n_grams), self.result, processed_text, "N Gramy")
-        self.textacy_n_grams_form.show()
+        self._start_analysis("N Gramy", get_n_grams, show_result)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_wa_textacy_named_entity(self):
-        self._nlp_service.text = self.result
-
-        named_entity, processed_text = self._nlp_service.get_named_entity()
+        def show_result(result, text):
+            named_entity, processed_text = result
+            self.textacy_named_entity_form = NLPResultForm("\n".join(named_entity),
+                                                           text, processed_text, "Rozpoznávání entit")
+            self.textacy_named_entity_form.show()
 
-        self.textacy_named_entity_form = NLPResultForm("\n".join(named_entity),
-                                                       self.result, processed_text, "Rozpoznávání entit")
-        self.textacy_named_entity_form.show()
+        self._start_analysis("Rozpoznávání entit", lambda nlp_service: nlp_service.get_named_entity(), show_result)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_wa_textacy_key_terms(self):
-        self._nlp_service.text = self.result
+        def show_result(result, text):
+            key_terms, processed_text = result
+            self.textacy_key_terms_form = NLPResultForm("\n".join(key_terms), text, processed_text, "Klíčová slova")
+            self.textacy_key_terms_form.show()
 
-        key_terms, processed_text = self._nlp_service.get_key_terms()
-
-        self.textacy_key_terms_form = NLPResultForm("\n".join(key_terms), self.result, processed_text, "Klíčová slova")
-        self.textacy_key_terms_form.show()
+        self._start_analysis("Klíčová slova", lambda nlp_service: nlp_service.get_key_terms(), show_result)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_wa_textacy_pos_regex(self):
-        self._nlp_service.text = self.result
-
-        pos_regex, processed_text = self._nlp_service.get_pos_regex()
+        def show_result(result, text):
+            pos_regex, processed_text = result
+            self.textacy_pos_regex_form = NLPResultForm("\n".join(pos_regex),
+                                                        text, processed_text, "Analýza dle regexu")
+            self.textacy_pos_regex_form.show()
 
-        self.textacy_pos_regex_form = NLPResultForm("\n".join(pos_regex),
-                                                    self.result, processed_text, "Analýza dle regexu")
-        self.textacy_pos_regex_form.show()
+        self._start_analysis("Analýza dle regexu", lambda nlp_service: nlp_service.get_pos_regex(), show_result)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_wa_textacy_bag_of_terms(self):
-        self._nlp_service.text = self.result
+        def get_bag_of_terms(nlp_service):
+            return self._get_incremental_analyzer().get_bag_of_terms(nlp_service.text)
 
-        bag_of_terms, processed_text = self._nlp_service.get_bag_of_terms()
+        def show_result(result, text):
+            bag_of_terms, processed_text = result
+            self.textacy_bag_of_terms_form = NLPResultForm("\n".join(bag_of_terms), text, processed_text, "Termíny")
+            self.textacy_bag_of_terms_form.show()
 
-        self.textacy_bag_of_terms_form = NLPResultForm("\n".join(bag_of_terms), self.result, processed_text, "Termíny")
-        self.textacy_bag_of_terms_form.show()
+        self._start_analysis("Termíny", get_bag_of_terms, show_result)
 
     @catch_exception
     @reset_error_message
     @check_url_valid
-    @check_url_changed
     def _on_wa_textacy_word_movers(self):
-        self.textacy_word_movers_window = WordMoversForm(self._nlp_service, self.result)
-        self.textacy_word_movers_window.show()
+        text = self.result
+
+        def show_form(nlp_service):
+            self.textacy_word_movers_window = WordMoversForm(nlp_service, text)
+            self.textacy_word_movers_window.show()
+
+        # NLP service and its models are loaded in background, the window is opened when they are ready
+        self._start_job("Podobnost textu s druhým", lambda web_parser, job: self._get_nlp_service(), show_form)
+
+    def closeEvent(self, event):
+        self._worker_pool.cancel_all()
+        self._worker_pool.wait_for_done()
+        with self._search_index_lock:
+            self._search_index.commit()
+        super(MainForm, self).closeEvent(event)
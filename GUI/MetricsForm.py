@@ -0,0 +1,88 @@
+# Basic libraries
+import datetime
+# App libraries
+from Instrumentation.metrics import METRICS
+# Third-party libraries
+from PyQt5 import QtWidgets, QtGui, QtCore
+
+
+class MetricsForm(QtWidgets.QMdiSubWindow):
+    """
+    Panel with durations of stages (downloading, parsing, NLP) and counters of pages, bytes and tokens
+    """
+
+    # Interval of refresh of table in milliseconds
+    REFRESH_INTERVAL = 1000
+    COLUMNS = ("Metrika", "Štítky", "Počet / hodnota", "Součet [s]", "p50 [ms]", "p95 [ms]", "p99 [ms]", "Max [ms]")
+
+    def __init__(self, metrics=METRICS, **kwargs):
+        super(MetricsForm, self).__init__(**kwargs)
+
+        self._metrics = metrics
+
+        self.setWindowTitle("Statistiky výkonu")
+        self.setMinimumWidth(1000)
+        self.setMinimumHeight(500)
+
+        # Main widget and BoxLayout settings
+        form = QtWidgets.QWidget()
+        form_layout = QtWidgets.QVBoxLayout()
+        form.setLayout(form_layout)
+        self.setWidget(form)
+
+        metrics_label = QtWidgets.QLabel("Doby fází a čítače od spuštění aplikace", self)
+        metrics_label.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Black))
+        form_layout.addWidget(metrics_label)
+
+        self._table = QtWidgets.QTableWidget(0, len(self.COLUMNS), self)
+        self._table.setHorizontalHeaderLabels(self.COLUMNS)
+        self._table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self._table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+        form_layout.addWidget(self._table)
+
+        buttons_layout = QtWidgets.QHBoxLayout()
+
+        reset_metrics = QtWidgets.QPushButton("Vynulovat", self)
+        reset_metrics.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
+        reset_metrics.clicked.connect(self._on_reset_metrics)
+        buttons_layout.addWidget(reset_metrics)
+
+        save_metrics = QtWidgets.QPushButton("Uložit (Prometheus)", self)
+        save_metrics.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
+        save_metrics.clicked.connect(self._on_save_metrics)
+        buttons_layout.addWidget(save_metrics)
+
+        form_layout.addLayout(buttons_layout)
+
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.timeout.connect(self._refresh)
+        self._refresh_timer.start(self.REFRESH_INTERVAL)
+        self._refresh()
+
+    def _refresh(self):
+        snapshot = self._metrics.snapshot()
+
+        self._table.setRowCount(len(snapshot))
+        for row, metric in enumerate(snapshot):
+            labels = ", ".join(f"{name}={value}" for name, value in metric["labels"].items())
+            if metric["type"] == "counter":
+                values = (metric["value"], None, None, None, None, None)
+            else:
+                values = (metric["count"], metric["sum"]) + tuple(
+                    None if metric[key] is None else metric[key] * 1000 for key in ("p50", "p95", "p99", "max"))
+
+            for column, value in enumerate((metric["name"], labels) + values):
+                text = "" if value is None else f"{value:.3f}" if isinstance(value, float) else str(value)
+                self._table.setItem(row, column, QtWidgets.QTableWidgetItem(text))
+
+    def _on_reset_metrics(self):
+        self._metrics.reset()
+        self._refresh()
+
+    def _on_save_metrics(self):
+        self._metrics.dump_prometheus(
+            f"metrics_{str(datetime.datetime.now()).replace('-', ' ').replace(':', '.')}.prom")
+
+    def closeEvent(self, event):
+        self._refresh_timer.stop()
+        super(MetricsForm, self).closeEvent(event)
@@ -1,5 +1,7 @@
 # Basic libraries
 import datetime
+# App libraries
+from .ResultView import ResultView
 # Third-party libraries
 from PyQt5 import QtWidgets, QtGui
 
@@ -25,10 +27,8 @@ class NLPResultForm(QtWidgets.QMdiSubWindow):
         result_label.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Black))
         result_layout.addWidget(result_label)
 
-        self.result_edit = QtWidgets.QTextEdit(self)
-        self.result_edit.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
-        self.result_edit.setText(result)
-        result_layout.addWidget(self.result_edit)
+        self.result_view = ResultView(result, parent=self)
+        result_layout.addWidget(self.result_view)
 
         processed_text_layout = QtWidgets.QVBoxLayout()
 
@@ -36,10 +36,8 @@ class NLPResultForm(QtWidgets.QMdiSubWindow):
         processed_text_label.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Black))
         processed_text_layout.addWidget(processed_text_label)
 
-        self.processed_text_edit = QtWidgets.QTextEdit(self)
-        self.processed_text_edit.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
-        self.processed_text_edit.setText(processed_text)
-        processed_text_layout.addWidget(self.processed_text_edit)
+        self.processed_text_view = ResultView(processed_text, parent=self)
+        processed_text_layout.addWidget(self.processed_text_view)
 
         buttons_layout = QtWidgets.QVBoxLayout()
 
@@ -57,6 +55,6 @@ class NLPResultForm(QtWidgets.QMdiSubWindow):
     def _on_save_results(self):
         with open(f"{self.windowTitle()}_{str(datetime.datetime.now()).replace('-', ' ').replace(':', '.')}.txt",
                   "w") as f:
-            f.write(f"Výsledek:\n{self.result_edit.toPlainText()}\n-----\n"
+            f.write(f"Výsledek:\n{self.result_view.text}\n-----\n"
                     f"Čistý text:\n{self._raw_text}\n-----\n"
-                    f"Zpracovaný text:\n{self.processed_text_edit.toPlainText()}")
+                    f"Zpracovaný text:\n{self.processed_text_view.text}")
@@ -0,0 +1,292 @@
+# Third-party libraries
+from PyQt5 import QtWidgets, QtGui, QtCore
+
+
+class ResultLinesModel(QtCore.QAbstractListModel):
+    """
+    Lines of result text for list view. Rows are handed to the view in batches when it scrolls to them
+    (fetchMore), so even results with millions of lines are shown instantly. Lines can be filtered
+    and appended while the result is still being produced.
+    """
+
+    # Number of rows handed to the view at once
+    FETCH_BATCH = 10000
+
+    def __init__(self, parent=None):
+        super(ResultLinesModel, self).__init__(parent)
+
+        self._lines = []
+        # Indexes of lines matching the filter, None when no filter is set
+        self._matching_rows = None
+        self._filter_text = ""
+        self._fetched_rows = 0
+        # Joined text is kept, so it does not have to be joined again when it was set as whole
+        self._text = ""
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def line_count(self):
+        return len(self._lines)
+
+    @property
+    def matching_count(self):
+        return len(self._lines) if self._matching_rows is None else len(self._matching_rows)
+
+    @property
+    def filter_text(self):
+        return self._filter_text
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def get_text(self):
+        """
+        Gets whole text of all lines (filter is not applied)
+        :return: Text
+        """
+        if self._text is None:
+            self._text = "\n".join(self._lines)
+
+        return self._text
+
+    def set_text(self, text):
+        """
+        Replaces lines by lines of text
+        :param text: Text
+        """
+        self.beginResetModel()
+        self._lines = text.split("\n") if text else []
+        self._text = text
+        self._matching_rows = self._get_matching_rows(0)
+        self._fetched_rows = min(self.matching_count, self.FETCH_BATCH)
+        self.endResetModel()
+
+    def append_lines(self, lines):
+        """
+        Appends lines, e.g. partial results of running job
+        :param lines: List of lines
+        """
+        if not lines:
+            return
+
+        start = len(self._lines)
+        self._lines.extend(lines)
+        self._text = None
+
+        all_fetched = self._fetched_rows == (start if self._matching_rows is None else len(self._matching_rows))
+        if self._matching_rows is not None:
+            self._matching_rows.extend(self._get_matching_rows(start))
+        # When the view already shows all rows, it would not ask for the new ones
+        if all_fetched:
+            self.fetchMore(QtCore.QModelIndex())
+
+    def set_filter(self, filter_text):
+        """
+        Shows only lines containing filter text (case insensitive)
+        :param filter_text: Searched text, all lines are shown when it is empty
+        """
+        self.beginResetModel()
+        self._filter_text = filter_text
+        self._matching_rows = self._get_matching_rows(0)
+        self._fetched_rows = min(self.matching_count, self.FETCH_BATCH)
+        self.endResetModel()
+
+    def get_line(self, row):
+        """
+        Gets line shown in row
+        :param row: Row of view
+        :return: Line
+        """
+        return self._lines[row if self._matching_rows is None else self._matching_rows[row]]
+
+    # -----------------
+    # Model methods
+    # -----------------
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else self._fetched_rows
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and index.isValid():
+            return self.get_line(index.row())
+
+        return None
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._fetched_rows < self.matching_count
+
+    def fetchMore(self, parent):
+        count = min(self.matching_count - self._fetched_rows, self.FETCH_BATCH)
+        if parent.isValid() or count <= 0:
+            return
+
+        self.beginInsertRows(QtCore.QModelIndex(), self._fetched_rows, self._fetched_rows + count - 1)
+        self._fetched_rows += count
+        self.endInsertRows()
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _get_matching_rows(self, start):
+        if not self._filter_text:
+            return None
+
+        filter_text = self._filter_text.lower()
+
+        return [row for row in range(start, len(self._lines)) if filter_text in self._lines[row].lower()]
+
+
+class ResultView(QtWidgets.QWidget):
+    """
+    Shows result text as list of lines, only visible lines are rendered. It has filter of lines and,
+    when it is editable, the text can be edited in text editor (e.g. as input of NLP analyses).
+    """
+
+    # Delay of filtering after last change of filter text in milliseconds
+    FILTER_DELAY = 300
+
+    def __init__(self, text="", editable=False, parent=None):
+        """
+        :param text: Shown text
+        :param editable: Show button switching to text editor
+        :param parent: Parent widget
+        """
+        super(ResultView, self).__init__(parent)
+
+        self._model = ResultLinesModel(self)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        # Filter + edit toggle
+        tools_layout = QtWidgets.QHBoxLayout()
+
+        self._filter_edit = QtWidgets.QLineEdit(self)
+        self._filter_edit.setPlaceholderText("Filtr řádků")
+        self._filter_edit.setFont(QtGui.QFont("Courier New", 12))
+        self._filter_edit.textChanged.connect(self._on_filter_changed)
+        tools_layout.addWidget(self._filter_edit)
+
+        self._count_label = QtWidgets.QLabel("", self)
+        self._count_label.setFont(QtGui.QFont("Courier New", 12))
+        tools_layout.addWidget(self._count_label)
+
+        self._edit_button = QtWidgets.QPushButton("Upravit", self)
+        self._edit_button.setFont(QtGui.QFont("Courier New", 12, QtGui.QFont.Black))
+        self._edit_button.setCheckable(True)
+        self._edit_button.setVisible(editable)
+        self._edit_button.toggled.connect(self.set_editing)
+        tools_layout.addWidget(self._edit_button)
+
+        layout.addLayout(tools_layout)
+
+        # Filtering of millions of lines takes a moment, so it does not run on every key press
+        self._filter_timer = QtCore.QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DELAY)
+        self._filter_timer.timeout.connect(self._apply_filter)
+
+        # List of lines + text editor
+        self._stack = QtWidgets.QStackedWidget(self)
+
+        self._list_view = QtWidgets.QListView(self)
+        self._list_view.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
+        # All rows have the same height, so the view does not measure every row
+        self._list_view.setUniformItemSizes(True)
+        self._list_view.setLayoutMode(QtWidgets.QListView.Batched)
+        self._list_view.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self._list_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self._list_view.setModel(self._model)
+        self._stack.addWidget(self._list_view)
+
+        self._text_edit = QtWidgets.QPlainTextEdit(self)
+        self._text_edit.setFont(QtGui.QFont("Courier New", 14, QtGui.QFont.Black))
+        self._stack.addWidget(self._text_edit)
+
+        layout.addWidget(self._stack)
+
+        copy_shortcut = QtWidgets.QShortcut(QtGui.QKeySequence.Copy, self._list_view)
+        copy_shortcut.activated.connect(self._on_copy)
+
+        self.set_text(text)
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def model(self):
+        return self._model
+
+    @property
+    def text(self):
+        return self._text_edit.toPlainText() if self.is_editing else self._model.get_text()
+
+    @property
+    def is_editing(self):
+        return self._stack.currentWidget() is self._text_edit
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def set_text(self, text):
+        if self.is_editing:
+            self._text_edit.setPlainText(text)
+        else:
+            self._model.set_text(text)
+            self._update_count()
+
+    def append_lines(self, lines):
+        if self.is_editing:
+            self._text_edit.appendPlainText("\n".join(lines))
+        else:
+            self._model.append_lines(lines)
+            self._update_count()
+
+    def set_editing(self, editing):
+        """
+        Switches between list of lines and text editor, the editor gets whole text
+        :param editing: Show text editor
+        """
+        if editing == self.is_editing:
+            return
+
+        if editing:
+            self._text_edit.setPlainText(self._model.get_text())
+            self._stack.setCurrentWidget(self._text_edit)
+        else:
+            self._model.set_text(self._text_edit.toPlainText())
+            self._text_edit.clear()
+            self._stack.setCurrentWidget(self._list_view)
+            self._update_count()
+
+        self._filter_edit.setEnabled(not editing)
+        self._edit_button.setChecked(editing)
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _update_count(self):
+        if self._model.filter_text:
+            self._count_label.setText(f"{self._model.matching_count} / {self._model.line_count} řádků")
+        else:
+            self._count_label.setText(f"{self._model.line_count} řádků")
+
+    def _on_filter_changed(self):
+        self._filter_timer.start()
+
+    def _apply_filter(self):
+        self._model.set_filter(self._filter_edit.text())
+        self._update_count()
+
+    def _on_copy(self):
+        rows = sorted(index.row() for index in self._list_view.selectionModel().selectedIndexes())
+        QtWidgets.QApplication.clipboard().setText("\n".join(self._model.get_line(row) for row in rows))
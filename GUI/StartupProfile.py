@@ -0,0 +1,52 @@
+# Basic libraries
+import time
+# App libraries
+from AdvancedLogging.logger import Logger
+from NLP.lazy_import import get_import_times
+
+
+class StartupProfile:
+    """
+    Measures phases of application startup and imports of heavy libraries, so regressions of startup
+    time are visible (run 'python app.py --startup-profile')
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._last = self._started
+        self._phases = []
+        self._logger = Logger(self.__class__.__name__)
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def mark(self, phase):
+        """
+        Records end of startup phase
+        :param phase: Name of phase
+        """
+        now = time.perf_counter()
+        self._phases.append((phase, now - self._last, now - self._started))
+        self._last = now
+
+    def get_report(self):
+        """
+        Gets report of startup phases and imports of libraries done so far
+        :return: Report as text
+        """
+        lines = ["Fáze spuštění:"]
+        lines.extend([f"  {phase:<40} {duration * 1000:9.1f} ms (celkem {total * 1000:9.1f} ms)"
+                      for phase, duration, total in self._phases])
+
+        lines.append("Importy knihoven při prvním použití:")
+        import_times = get_import_times()
+        if not import_times:
+            lines.append("  žádné")
+        lines.extend([f"  {module:<40} {duration * 1000:9.1f} ms ({thread})"
+                      for module, (duration, thread) in import_times.items()])
+
+        return "\n".join(lines)
+
+    def log_report(self):
+        self._logger.info("\n" + self.get_report())
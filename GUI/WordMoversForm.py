@@ -5,6 +5,9 @@ from PyQt5 import QtWidgets, QtGui
 
 
 class WordMoversForm(QtWidgets.QMdiSubWindow):
+
+    EXPORT_PATH = "output_raw_sim.npz"
+
     def __init__(self, nlp_service, text_1, **kwargs):
         super(WordMoversForm, self).__init__(**kwargs)
 
@@ -58,6 +61,9 @@ class WordMoversForm(QtWidgets.QMdiSubWindow):
         show_word_movers_plot.clicked.connect(self._on_show_word_movers_plot)
         buttons_layout.addWidget(show_word_movers_plot)
 
+        self.export_matrix_check = QtWidgets.QCheckBox("Exportovat matici vzdáleností (output_raw_sim.npz)", self)
+        buttons_layout.addWidget(self.export_matrix_check)
+
         form_layout.addStretch()
         form_layout.addLayout(main_layout)
         form_layout.addLayout(buttons_layout)
@@ -91,6 +97,7 @@ class WordMoversForm(QtWidgets.QMdiSubWindow):
             return
 
         try:
-            self._nlp_service.show_word_movers_plot(raw_text_1, raw_text_2)
+            export_path = self.EXPORT_PATH if self.export_matrix_check.isChecked() else None
+            self._nlp_service.show_word_movers_plot(raw_text_1, raw_text_2, export_path=export_path)
         except Exception as ex:
             self._error_label.setText(ex.__str__())
@@ -0,0 +1,227 @@
+# Basic libraries
+import os
+import threading
+# App libraries
+from AdvancedLogging.logger import Logger
+# Third-party libraries
+from PyQt5 import QtCore
+
+
+class JobCancelledError(Exception):
+    """
+    Raised inside job when it was cancelled
+    """
+
+    def __init__(self):
+        super(JobCancelledError, self).__init__("Úloha byla zrušena")
+
+
+class Job:
+    """
+    Handle of one background job. Function of job uses it to report progress and to check cancellation,
+    the GUI uses it to cancel the job.
+    """
+
+    def __init__(self, name, signals):
+        self._name = name
+        self._signals = signals
+        self._cancelled = threading.Event()
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def cancel(self):
+        """
+        Requests cancellation, job stops at its next check and its result is thrown away
+        """
+        self._cancelled.set()
+
+    def check_cancelled(self):
+        """
+        Stops job when it was cancelled
+        """
+        if self._cancelled.is_set():
+            raise JobCancelledError()
+
+    def report_progress(self, done, total, message=""):
+        """
+        Reports progress of job, it can be called from any thread
+        :param done: Number of finished steps
+        :param total: Number of all steps
+        :param message: Description of current step
+        """
+        self._signals.progress.emit(self, done, total, message)
+
+    def report_partial_result(self, lines):
+        """
+        Sends part of result (e.g. links of one crawled page) before the job finishes, it can be called
+        from any thread
+        :param lines: List of result lines
+        """
+        if lines:
+            self._signals.partial_result.emit(self, list(lines))
+
+
+class _WorkerSignals(QtCore.QObject):
+    """
+    Signals of workers, they are delivered to the main thread
+    """
+    finished = QtCore.pyqtSignal(object, object)
+    error = QtCore.pyqtSignal(object, str)
+    cancelled = QtCore.pyqtSignal(object)
+    progress = QtCore.pyqtSignal(object, int, int, str)
+    partial_result = QtCore.pyqtSignal(object, object)
+
+
+class _Worker(QtCore.QRunnable):
+    """
+    Runs function of one job in thread of pool
+    """
+
+    def __init__(self, job, function, signals, logger):
+        super(_Worker, self).__init__()
+        self._job = job
+        self._function = function
+        self._signals = signals
+        self._logger = logger
+
+    def run(self):
+        try:
+            self._job.check_cancelled()
+            result = self._function(self._job)
+            self._job.check_cancelled()
+        except JobCancelledError:
+            self._signals.cancelled.emit(self._job)
+        except Exception as ex:
+            self._logger.exception(f"{self._job.name}: {ex}")
+            self._signals.error.emit(self._job, ex.__str__())
+        else:
+            self._signals.finished.emit(self._job, result)
+
+
+class WorkerPool(QtCore.QObject):
+    """
+    Runs long jobs (downloading of pages, NLP analyses) in threads, so the window does not freeze.
+    More jobs can run concurrently. Callbacks of jobs are always called in the main thread.
+    """
+    running_jobs_changed = QtCore.pyqtSignal(int)
+    progress_changed = QtCore.pyqtSignal(str, int, int, str)
+
+    def __init__(self, max_threads=None, **kwargs):
+        """
+        :param max_threads: Maximal number of concurrently running jobs, number of processors by default
+        """
+        super(WorkerPool, self).__init__(**kwargs)
+
+        self._logger = Logger(self.__class__.__name__)
+        self._thread_pool = QtCore.QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(max_threads if max_threads else max(2, os.cpu_count() or 1))
+        # Job -> (callback of result, callback of error, callback of partial result)
+        self._callbacks = dict()
+
+        self._signals = _WorkerSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.error.connect(self._on_error)
+        self._signals.cancelled.connect(self._on_cancelled)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.partial_result.connect(self._on_partial_result)
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def running_jobs(self):
+        return tuple(self._callbacks)
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def start(self, name, function, on_finished, on_error, on_partial_result=None):
+        """
+        Starts job
+        :param name: Name of job shown in progress
+        :param function: Function that gets Job and returns result, it runs in thread of pool
+        :param on_finished: Function called with result in the main thread
+        :param on_error: Function called with error message in the main thread
+        :param on_partial_result: Function called with lines reported by Job.report_partial_result in the main thread
+        :return: Job
+        """
+        job = Job(name, self._signals)
+        self._callbacks[job] = (on_finished, on_error, on_partial_result)
+        self._thread_pool.start(_Worker(job, function, self._signals, self._logger))
+        self.running_jobs_changed.emit(len(self._callbacks))
+
+        return job
+
+    def cancel_all(self):
+        """
+        Cancels all running jobs
+        """
+        for job in self._callbacks:
+            job.cancel()
+
+    def wait_for_done(self, milliseconds=-1):
+        """
+        Waits until all jobs are finished, e.g. before closing of the window
+        """
+        return self._thread_pool.waitForDone(milliseconds)
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _pop_callbacks(self, job):
+        callbacks = self._callbacks.pop(job)
+        self.running_jobs_changed.emit(len(self._callbacks))
+
+        return callbacks
+
+    @QtCore.pyqtSlot(object, object)
+    def _on_finished(self, job, result):
+        on_finished, on_error, _ = self._pop_callbacks(job)
+        try:
+            on_finished(result)
+        except Exception as ex:
+            on_error(ex.__str__())
+
+    @QtCore.pyqtSlot(object, str)
+    def _on_error(self, job, message):
+        _, on_error, _ = self._pop_callbacks(job)
+        on_error(message)
+
+    @QtCore.pyqtSlot(object)
+    def _on_cancelled(self, job):
+        self._pop_callbacks(job)
+        self.progress_changed.emit(job.name, 0, 0, JobCancelledError().__str__())
+
+    @QtCore.pyqtSlot(object, int, int, str)
+    def _on_progress(self, job, done, total, message):
+        if job in self._callbacks and not job.is_cancelled:
+            self.progress_changed.emit(job.name, done, total, message)
+
+    @QtCore.pyqtSlot(object, object)
+    def _on_partial_result(self, job, lines):
+        # Parts reported before cancellation are still shown, e.g. links found so far
+        _, on_error, on_partial_result = self._callbacks.get(job, (None, None, None))
+        if on_partial_result is None:
+            return
+
+        try:
+            on_partial_result(lines)
+        except Exception as ex:
+            on_error(ex.__str__())
@@ -0,0 +1,385 @@
+# Basic libraries
+import os
+import time
+import atexit
+import threading
+from bisect import bisect_left
+from functools import wraps
+
+
+# Upper bounds of histogram buckets of durations in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Counter:
+    """
+    Monotonic counter, e.g. of downloaded bytes or pages
+    """
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self):
+        return self._value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self._value += amount
+
+    def reset(self):
+        with self._lock:
+            self._value = 0
+
+    def get_state(self):
+        return self._value
+
+    def merge_state(self, state):
+        self.inc(state)
+
+
+class _Timer:
+    """
+    Context manager which observes its duration in histogram
+    """
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class Histogram:
+    """
+    Distribution of observed values (latencies) in fixed buckets, quantiles are estimated from buckets
+    """
+    __slots__ = ("_bounds", "_counts", "_sum", "_min", "_max", "_lock")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: Sorted upper bounds of buckets, the last bucket has no upper bound
+        """
+        self._bounds = tuple(buckets)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._min = None
+        self._max = None
+        self._lock = threading.Lock()
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def count(self):
+        return sum(self._counts)
+
+    @property
+    def sum(self):
+        return self._sum
+
+    @property
+    def bounds(self):
+        return self._bounds
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def observe(self, value):
+        bucket = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[bucket] += 1
+            self._sum += value
+            if self._min is None or value < self._min:
+                self._min = value
+            if self._max is None or value > self._max:
+                self._max = value
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * (len(self._bounds) + 1)
+            self._sum = 0.0
+            self._min = None
+            self._max = None
+
+    def time(self):
+        """
+        Measures duration of 'with' block, e.g. 'with histogram.time(): ...'
+        :return: Context manager
+        """
+        return _Timer(self)
+
+    def get_state(self):
+        """
+        :return: Picklable state which can be merged into histogram of another process
+        """
+        with self._lock:
+            return {"bounds": self._bounds, "counts": list(self._counts), "sum": self._sum, "min": self._min,
+                    "max": self._max}
+
+    def merge_state(self, state):
+        """
+        Adds values observed by another histogram with the same buckets
+        :param state: State returned by get_state
+        """
+        if tuple(state["bounds"]) != self._bounds:
+            raise ValueError("Histogramy mají různé hranice")
+        if state["min"] is None:
+            return
+
+        with self._lock:
+            self._counts = [count + other for count, other in zip(self._counts, state["counts"])]
+            self._sum += state["sum"]
+            self._min = state["min"] if self._min is None else min(self._min, state["min"])
+            self._max = state["max"] if self._max is None else max(self._max, state["max"])
+
+    def get_bucket_counts(self):
+        """
+        :return: List of counts of values in buckets (not cumulative), the last one is above all bounds
+        """
+        with self._lock:
+            return list(self._counts)
+
+    def get_quantile(self, quantile):
+        """
+        Estimates quantile by linear interpolation inside its bucket
+        :param quantile: Quantile between 0 and 1
+        :return: Estimated value or None when nothing was observed
+        """
+        with self._lock:
+            counts, minimum, maximum = list(self._counts), self._min, self._max
+
+        total = sum(counts)
+        if not total:
+            return None
+
+        rank = quantile * total
+        cumulative = 0
+        for bucket, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                lower = self._bounds[bucket - 1] if bucket > 0 else minimum
+                upper = self._bounds[bucket] if bucket < len(self._bounds) else maximum
+                lower, upper = max(lower, minimum), min(upper, maximum)
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+
+        return maximum
+
+    def snapshot(self):
+        """
+        :return: Dictionary with count, sum, min, max and estimated median, 95th and 99th percentile
+        """
+        with self._lock:
+            count, total, minimum, maximum = sum(self._counts), self._sum, self._min, self._max
+
+        return {"count": count, "sum": total, "min": minimum, "max": maximum, "p50": self.get_quantile(0.5),
+                "p95": self.get_quantile(0.95), "p99": self.get_quantile(0.99)}
+
+
+class MetricsRegistry:
+    """
+    In-process registry of counters and histograms identified by name and labels.
+    Metrics should be created once (e.g. at module level) and then only updated, updating costs one lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Name -> (type, help)
+        self._descriptions = dict()
+        # (name, labels) -> metric
+        self._metrics = dict()
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def counter(self, name, description="", **labels):
+        """
+        Gets counter, it is created on first use
+        :param name: Name of metric, e.g. 'web_parser_bytes_total'
+        :param description: Description of metric
+        :param labels: Labels of metric, e.g. stage="download"
+        :return: Counter
+        """
+        return self._get(name, "counter", description, labels, Counter)
+
+    def histogram(self, name, description="", buckets=DEFAULT_BUCKETS, **labels):
+        """
+        Gets histogram, it is created on first use
+        :param name: Name of metric, e.g. 'web_parser_stage_seconds'
+        :param description: Description of metric
+        :param buckets: Upper bounds of buckets
+        :param labels: Labels of metric, e.g. stage="download"
+        :return: Histogram
+        """
+        return self._get(name, "histogram", description, labels, lambda: Histogram(buckets))
+
+    def timed(self, name, description="", **labels):
+        """
+        Decorator which observes durations of function calls in histogram
+        """
+        histogram = self.histogram(name, description, **labels)
+
+        def timed_decorator(fn):
+            @wraps(fn)
+            def timed_wrapper(*args, **kwargs):
+                with histogram.time():
+                    return fn(*args, **kwargs)
+
+            return timed_wrapper
+
+        return timed_decorator
+
+    def snapshot(self):
+        """
+        Gets current values of all metrics
+        :return: List of dictionaries with name, type, labels and value (counter) or statistics (histogram)
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items(), key=lambda item: item[0])
+            descriptions = dict(self._descriptions)
+
+        snapshot = []
+        for (name, labels), metric in metrics:
+            kind, _ = descriptions[name]
+            entry = {"name": name, "type": kind, "labels": dict(labels)}
+            if kind == "counter":
+                entry["value"] = metric.value
+            else:
+                entry.update(metric.snapshot())
+            snapshot.append(entry)
+
+        return snapshot
+
+    def get_state(self, reset=False):
+        """
+        Gets picklable state of all metrics, e.g. to send metrics of worker process to the main process
+        :param reset: Forget values of metrics after they are read, only values observed later are in the next state
+        :return: List of tuples (name, type, description, labels, state of metric)
+        """
+        with self._lock:
+            metrics = list(self._metrics.items())
+            descriptions = dict(self._descriptions)
+
+        states = []
+        for (name, labels), metric in metrics:
+            kind, description = descriptions[name]
+            states.append((name, kind, description, labels, metric.get_state()))
+            if reset:
+                metric.reset()
+
+        return states
+
+    def merge_state(self, states):
+        """
+        Adds values of metrics from state of another registry, missing metrics are created
+        :param states: State returned by get_state
+        """
+        for name, kind, description, labels, state in states:
+            if kind == "counter":
+                self.counter(name, description, **dict(labels)).merge_state(state)
+            else:
+                self.histogram(name, description, state["bounds"], **dict(labels)).merge_state(state)
+
+    def to_prometheus_text(self):
+        """
+        Gets all metrics in Prometheus text exposition format
+        :return: Text
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items(), key=lambda item: item[0])
+            descriptions = dict(self._descriptions)
+
+        lines = []
+        described = set()
+        for (name, labels), metric in metrics:
+            kind, description = descriptions[name]
+            if name not in described:
+                described.add(name)
+                if description:
+                    lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+
+            if kind == "counter":
+                lines.append(f"{name}{_format_labels(labels)} {metric.value}")
+                continue
+
+            cumulative = 0
+            counts = metric.get_bucket_counts()
+            for bound, count in zip(metric.bounds + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = labels + (("le", "+Inf" if bound == float("inf") else repr(bound)),)
+                lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {metric.sum}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+        return "\n".join(lines) + "\n"
+
+    def dump_prometheus(self, path):
+        """
+        Writes all metrics in Prometheus text format into file, e.g. for node exporter textfile collector.
+        The file is replaced atomically, so readers never see partial file.
+        :param path: Path of file
+        """
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus_text())
+        os.replace(temporary_path, path)
+
+    def reset(self):
+        """
+        Forgets values of all metrics, metrics created at module level keep working
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        for metric in metrics:
+            metric.reset()
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _get(self, name, kind, description, labels, create):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is not None and self._descriptions[name][0] == kind:
+            return metric
+
+        with self._lock:
+            known_kind, known_description = self._descriptions.get(name, (kind, description))
+            if known_kind != kind:
+                raise ValueError(f"Metrika '{name}' je typu {known_kind}")
+            self._descriptions[name] = (kind, known_description or description)
+
+            return self._metrics.setdefault(key, create())
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+def _escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Metrics of the whole process
+METRICS = MetricsRegistry()
+
+# File where metrics are written at exit of the process (e.g. of headless batch)
+DUMP_FILE_VARIABLE = "BC_METRICS_FILE"
+
+if os.environ.get(DUMP_FILE_VARIABLE):
+    atexit.register(METRICS.dump_prometheus, os.environ[DUMP_FILE_VARIABLE])
@@ -0,0 +1,317 @@
+# Basic libraries
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import argparse
+import datetime
+import threading
+import itertools
+import tracemalloc
+from functools import wraps
+
+
+class Profiler:
+    """
+    Opt-in profiling of public methods of WebParser and NLPService. When it is enabled (environment variable
+    BC_PROFILE_DIR or toggle in the main window), every outermost call runs under cProfile and tracemalloc
+    and a case folder with profile, top allocation sites and snapshot of input (text or page) is saved,
+    so slow cases can be replayed and compared offline (python -m Instrumentation.profiling).
+    """
+    DIRECTORY_VARIABLE = "BC_PROFILE_DIR"
+
+    PROFILE_FILE = "profile.pstats"
+    PROFILE_TEXT_FILE = "profile.txt"
+    ALLOCATIONS_FILE = "allocations.txt"
+    CASE_FILE = "case.json"
+    TEXT_FILE = "input.txt"
+    PAGE_FILE = "page.html"
+
+    # Number of functions and allocation sites in text reports
+    TOP_ENTRIES = 40
+
+    _directory = os.environ.get(DIRECTORY_VARIABLE) or None
+    _counter = itertools.count(1)
+    _local = threading.local()
+    _lock = threading.Lock()
+    # Number of profiled calls running in all threads, tracemalloc is stopped after the last one
+    _traced_calls = 0
+    _started_tracing = False
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    @classmethod
+    def enable(cls, directory="profiles"):
+        """
+        Starts profiling of public methods
+        :param directory: Directory where case folders are saved
+        """
+        cls._directory = directory
+
+    @classmethod
+    def disable(cls):
+        cls._directory = None
+
+    @classmethod
+    def is_enabled(cls):
+        return cls._directory is not None
+
+    @classmethod
+    def get_directory(cls):
+        return cls._directory
+
+    @classmethod
+    def call(cls, function, instance, args, kwargs):
+        """
+        Calls function, it is profiled when profiling is enabled and no outer call is profiled already
+        :return: Result of function
+        """
+        directory = cls._directory
+        if directory is None or getattr(cls._local, "active", False):
+            return function(*args, **kwargs)
+
+        cls._local.active = True
+        cls._start_tracing()
+        profile = cProfile.Profile()
+
+        start = time.perf_counter()
+        error = None
+        try:
+            profile.enable()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profile.disable()
+        except Exception as ex:
+            error = ex.__str__()
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            snapshot, peak = cls._stop_tracing()
+            cls._local.active = False
+            try:
+                cls._save_case(directory, function, instance, args, kwargs, profile, snapshot,
+                               {"duration": duration, "peak_memory": peak, "error": error})
+            except OSError:
+                pass
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    @classmethod
+    def _start_tracing(cls):
+        with cls._lock:
+            if cls._traced_calls == 0:
+                cls._started_tracing = not tracemalloc.is_tracing()
+                if cls._started_tracing:
+                    tracemalloc.start()
+                elif hasattr(tracemalloc, "reset_peak"):
+                    tracemalloc.reset_peak()
+            cls._traced_calls += 1
+
+    @classmethod
+    def _stop_tracing(cls):
+        """
+        Takes snapshot of allocations and stops tracemalloc when no other profiled call runs.
+        Tracing is shared by threads, so allocations and peak of overlapping calls are mixed.
+        :return: Tuple (snapshot, peak of traced memory in bytes)
+        """
+        with cls._lock:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            cls._traced_calls -= 1
+            if cls._traced_calls == 0 and cls._started_tracing:
+                tracemalloc.stop()
+
+        return snapshot, peak
+
+    @classmethod
+    def _save_case(cls, directory, function, instance, args, kwargs, profile, snapshot, measurements):
+        with cls._lock:
+            number = next(cls._counter)
+        name = function.__qualname__
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        case_directory = os.path.join(directory, f"{timestamp}_{os.getpid()}_{number:04d}_{name}")
+        os.makedirs(case_directory, exist_ok=True)
+
+        profile.dump_stats(os.path.join(case_directory, cls.PROFILE_FILE))
+        with open(os.path.join(case_directory, cls.PROFILE_TEXT_FILE), "w", encoding="utf-8") as f:
+            pstats.Stats(profile, stream=f).sort_stats("cumulative").print_stats(cls.TOP_ENTRIES)
+
+        with open(os.path.join(case_directory, cls.ALLOCATIONS_FILE), "w", encoding="utf-8") as f:
+            f.write(f"Peak of traced memory: {measurements['peak_memory'] / 1024 / 1024:.2f} MB\n")
+            f.write("Top allocation sites of memory still allocated at the end of the call:\n")
+            snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+            for statistic in snapshot.statistics("lineno")[:cls.TOP_ENTRIES]:
+                f.write(f"{statistic}\n")
+
+        # Input snapshot - text of NLPService or page of WebParser, arguments only when they are plain data
+        text = getattr(instance, "text", None)
+        if isinstance(text, str):
+            with open(os.path.join(case_directory, cls.TEXT_FILE), "w", encoding="utf-8") as f:
+                f.write(text)
+        soup = getattr(instance, "_soup", None)
+        if soup is not None:
+            with open(os.path.join(case_directory, cls.PAGE_FILE), "w", encoding="utf-8") as f:
+                f.write(str(soup))
+
+        case = dict(measurements, module=function.__module__, function=name,
+                    instance=None if instance is None else type(instance).__name__,
+                    arguments=[repr(argument) for argument in args[1 if instance is not None else 0:]],
+                    keyword_arguments={key: repr(value) for key, value in kwargs.items()},
+                    replay_arguments=_to_json_or_none(args[1 if instance is not None else 0:]),
+                    replay_keyword_arguments=_to_json_or_none(kwargs))
+        with open(os.path.join(case_directory, cls.CASE_FILE), "w", encoding="utf-8") as f:
+            json.dump(case, f, ensure_ascii=False, indent=2)
+
+
+def _to_json_or_none(value):
+    try:
+        return json.loads(json.dumps(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _wrap(function, has_instance):
+    @wraps(function)
+    def profiled_wrapper(*args, **kwargs):
+        return Profiler.call(function, args[0] if has_instance and args else None, args, kwargs)
+
+    return profiled_wrapper
+
+
+def profile_public_methods(cls):
+    """
+    Class decorator, public methods (including static and class methods) are profiled when profiling is enabled.
+    When it is disabled, a call costs one more function call and one attribute check.
+    """
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+
+        if isinstance(attribute, staticmethod):
+            setattr(cls, name, staticmethod(_wrap(attribute.__func__, False)))
+        elif isinstance(attribute, classmethod):
+            setattr(cls, name, classmethod(_wrap(attribute.__func__, False)))
+        elif callable(attribute) and not isinstance(attribute, type):
+            setattr(cls, name, _wrap(attribute, True))
+
+    return cls
+
+
+# -----------------
+# Replay and comparison of saved cases
+# -----------------
+
+def load_case(case_directory):
+    """
+    Loads saved case
+    :param case_directory: Case folder
+    :return: Dictionary of case.json with text and page of input (or None)
+    """
+    with open(os.path.join(case_directory, Profiler.CASE_FILE), encoding="utf-8") as f:
+        case = json.load(f)
+
+    for key, file_name in (("text", Profiler.TEXT_FILE), ("page", Profiler.PAGE_FILE)):
+        path = os.path.join(case_directory, file_name)
+        case[key] = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                case[key] = f.read()
+
+    return case
+
+
+def replay_case(case_directory, output_directory):
+    """
+    Runs the call of saved case again with profiling, e.g. after change of implementation
+    :param case_directory: Case folder
+    :param output_directory: Directory where the new case folder is saved
+    :return: Result of the call
+    """
+    case = load_case(case_directory)
+    if case["replay_arguments"] is None or case["replay_keyword_arguments"] is None:
+        raise ValueError("Argumenty volání nelze obnovit, nejsou to jednoduchá data")
+
+    # Imported here, they import this module
+    from NLP.nlp_service import NLPService
+    from WebParsing.web_parser import WebParser
+
+    classes = {"NLPService": NLPService, "WebParser": WebParser}
+    class_name, method_name = case["function"].split(".", 1)
+    if class_name not in classes:
+        raise ValueError(f"Neznámá třída '{class_name}'")
+
+    # Instance is recreated from snapshot of its input, static methods are called on class
+    if case["instance"] == "NLPService":
+        target = NLPService(case["text"])
+    elif case["instance"] == "WebParser":
+        target = WebParser.from_html(case["page"]) if case["page"] is not None else WebParser()
+    else:
+        target = classes[class_name]
+
+    directory = Profiler.get_directory()
+    Profiler.enable(output_directory)
+    try:
+        return getattr(target, method_name)(*case["replay_arguments"], **case["replay_keyword_arguments"])
+    finally:
+        if directory is None:
+            Profiler.disable()
+        else:
+            Profiler.enable(directory)
+
+
+def compare_cases(first_directory, second_directory, top=15):
+    """
+    Compares durations, memory peaks and the most expensive functions of two cases
+    :return: Report as text
+    """
+    cases = [load_case(directory) for directory in (first_directory, second_directory)]
+    lines = [f"{'':<20}{'A':>15}{'B':>15}",
+             f"{'Doba [s]':<20}{cases[0]['duration']:>15.4f}{cases[1]['duration']:>15.4f}",
+             f"{'Špička paměti [MB]':<20}{cases[0]['peak_memory'] / 2 ** 20:>15.2f}"
+             f"{cases[1]['peak_memory'] / 2 ** 20:>15.2f}", ""]
+
+    functions = []
+    for directory in (first_directory, second_directory):
+        stats = pstats.Stats(os.path.join(directory, Profiler.PROFILE_FILE), stream=io.StringIO())
+        functions.append({f"{path}:{line}({name})": entry[3] for (path, line, name), entry in stats.stats.items()})
+
+    names = sorted(set(functions[0]) | set(functions[1]),
+                   key=lambda key: -max(functions[0].get(key, 0.0), functions[1].get(key, 0.0)))
+    lines.append(f"{'Kumulativní doba [s]':<20}{'A':>15}{'B':>15}  Funkce")
+    for name in names[:top]:
+        lines.append(f"{'':<20}{functions[0].get(name, 0.0):>15.4f}{functions[1].get(name, 0.0):>15.4f}  {name}")
+
+    return "\n".join(lines)
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Replay and comparison of profiled cases")
+    subparsers = argument_parser.add_subparsers(dest="command")
+    replay_parser = subparsers.add_parser("replay", help="Run saved case again with profiling")
+    replay_parser.add_argument("case", help="Case folder")
+    replay_parser.add_argument("--output", default="profiles", help="Directory of the new case folder")
+    compare_parser = subparsers.add_parser("compare", help="Compare two cases")
+    compare_parser.add_argument("first", help="Case folder A")
+    compare_parser.add_argument("second", help="Case folder B")
+    arguments = argument_parser.parse_args()
+
+    if arguments.command == "replay":
+        replay_case(arguments.case, arguments.output)
+        print(f"Case saved into {arguments.output}")
+    elif arguments.command == "compare":
+        print(compare_cases(arguments.first, arguments.second))
+    else:
+        argument_parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# Basic libraries
+import re
+from collections import Counter
+# App libraries
+from .nltk_resources import NltkResources
+# Third-party libraries
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+WORD_REGEX = re.compile(r"[^\W\d_]{2,}")
+
+
+class CorpusKeyTermEngine:
+    """
+    Finds terms distinctive for a page relative to the whole crawl by TF-IDF.
+    Sparse term-document matrix is built incrementally page by page into numpy arrays growing by doubling, document
+    frequencies are kept in one integer array and top terms of all pages are scored at once
+    by vectorized operations on the sparse matrix.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, ngrams=(1, 2), tokenize=None):
+        """
+        :param ngrams: Lengths of N Grams used as terms
+        :param tokenize: Function that gets text and returns list of tokens, lowercase words without stop words
+        by default
+        """
+        self._ngrams = ngrams
+        self._tokenize = tokenize if tokenize is not None else self._get_words
+
+        self._document_ids = []
+        self._vocabulary = {}
+        self._terms = []
+        self._document_frequency = np.zeros(self.INITIAL_CAPACITY, dtype=np.int32)
+        # CSR arrays of term counts, only their first _nnz (indices, counts) or len + 1 (indptr) items are filled
+        self._indptr = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)
+        self._indices = np.zeros(self.INITIAL_CAPACITY, dtype=np.int32)
+        self._counts = np.zeros(self.INITIAL_CAPACITY, dtype=np.float32)
+        self._nnz = 0
+
+    def __len__(self):
+        return len(self._document_ids)
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def vocabulary_size(self):
+        return len(self._terms)
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def add_document(self, document_id, text):
+        """
+        Adds page into corpus
+        :param document_id: Identifier of page (e.g. URL)
+        :param text: Text of page
+        """
+        counts = self._count_terms(text, add_terms=True)
+        term_ids = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+
+        document_count = len(self._document_ids)
+        nnz = self._nnz + len(term_ids)
+        self._document_frequency = self._grow(self._document_frequency, len(self._terms))
+        self._indices = self._grow(self._indices, nnz)
+        self._counts = self._grow(self._counts, nnz)
+        self._indptr = self._grow(self._indptr, document_count + 2)
+
+        self._document_frequency[term_ids] += 1
+        self._indices[self._nnz:nnz] = term_ids
+        self._counts[self._nnz:nnz] = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        self._indptr[document_count + 1] = nnz
+        self._nnz = nnz
+        self._document_ids.append(document_id)
+
+    def get_matrix(self):
+        """
+        Gets term-document matrix of counts. It views the filled part of arrays of the engine, later added
+        pages are written behind it or into new arrays, so the matrix does not change.
+        :return: scipy CSR matrix with one row per page
+        """
+        return csr_matrix((self._counts[:self._nnz], self._indices[:self._nnz],
+                           self._indptr[:len(self._document_ids) + 1]),
+                          shape=(len(self._document_ids), len(self._terms)), copy=False)
+
+    def get_idf(self):
+        """
+        Gets smoothed inverse document frequency of all terms
+        :return: numpy array indexed by term id
+        """
+        document_frequency = self._document_frequency[:len(self._terms)]
+
+        return np.log((1.0 + len(self._document_ids)) / (1.0 + document_frequency)) + 1.0
+
+    def get_all_key_terms(self, k=10):
+        """
+        Gets the most distinctive terms of all pages
+        :param k: Number of terms per page
+        :return: Dictionary page id -> list of (term, score) ordered from the best
+        """
+        if not self._document_ids:
+            return {}
+
+        matrix = self.get_matrix()
+        scores = self._get_tf_idf(matrix.data, matrix.indices, matrix.indptr)
+        rows = np.repeat(np.arange(len(self._document_ids)), np.diff(matrix.indptr))
+
+        # Terms of every row sorted by descending score, then the first k of every row are taken
+        order = np.lexsort((-scores, rows))
+        position_in_row = np.arange(len(order)) - matrix.indptr[rows[order]]
+        best = order[position_in_row < k]
+
+        result = {document_id: [] for document_id in self._document_ids}
+        for row, term_id, score in zip(rows[best].tolist(), matrix.indices[best].tolist(), scores[best].tolist()):
+            result[self._document_ids[row]].append((self._terms[term_id], score))
+
+        return result
+
+    def get_key_terms(self, text, k=10):
+        """
+        Gets the most distinctive terms of text relative to corpus, text is not added into corpus
+        :param text: Text of page
+        :param k: Number of terms
+        :return: List of (term, score) ordered from the best
+        """
+        counts = self._count_terms(text, add_terms=False)
+        if not counts:
+            return []
+
+        term_ids = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+        scores = self._get_tf_idf(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)), term_ids,
+                                  np.array([0, len(counts)]))
+        best = np.argsort(-scores, kind="stable")[:k]
+
+        return [(self._terms[term_ids[i]], float(scores[i])) for i in best]
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _count_terms(self, text, add_terms):
+        """
+        Counts terms of text
+        :return: Counter term id -> count, unknown terms are added into vocabulary or skipped
+        """
+        tokens = self._tokenize(text)
+        counts = Counter()
+        for n in self._ngrams:
+            for i in range(len(tokens) - n + 1):
+                term = " ".join(tokens[i:i + n])
+                term_id = self._vocabulary.get(term)
+                if term_id is None:
+                    if not add_terms:
+                        continue
+                    term_id = self._vocabulary[term] = len(self._terms)
+                    self._terms.append(term)
+                counts[term_id] += 1
+
+        return counts
+
+    @staticmethod
+    def _grow(values, size):
+        """
+        Gets array with capacity of at least size items, the capacity is doubled so appending is amortized O(1)
+        """
+        if size <= len(values):
+            return values
+
+        capacity = len(values)
+        while capacity < size:
+            capacity *= 2
+        grown = np.zeros(capacity, dtype=values.dtype)
+        grown[:len(values)] = values
+
+        return grown
+
+    def _get_tf_idf(self, counts, term_ids, indptr):
+        """
+        Computes L2 normalized TF-IDF with sublinear term frequency for CSR rows
+        """
+        scores = (1.0 + np.log(counts)) * self.get_idf()[term_ids]
+        row_lengths = np.diff(indptr)
+        squared_norms = np.add.reduceat(scores ** 2, indptr[:-1][row_lengths > 0]) if len(scores) else scores
+        norms = np.ones(len(row_lengths))
+        norms[row_lengths > 0] = np.sqrt(squared_norms)
+
+        return scores / np.repeat(norms, row_lengths)
+
+    @staticmethod
+    def _get_words(text):
+        stop_words = NltkResources.get_stop_words()
+
+        return [word for word in WORD_REGEX.findall(text.lower()) if word not in stop_words]
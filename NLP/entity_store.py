@@ -0,0 +1,247 @@
+# Basic libraries
+import os
+import json
+# App libraries
+from .nlp_result import NamedEntity
+# Third-party libraries
+import numpy as np
+
+
+class EntityStore:
+    """
+    Columnar store of named entity occurrences of the whole crawl.
+    Documents, labels and texts of entities are interned into integer ids and every occurrence is one row
+    of an integer array (document, label, text, start, end), so millions of occurrences take a few bytes each
+    and counting or grouping queries run as vectorized operations over columns.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    # Columns of occurrences
+    DOCUMENT, LABEL, TEXT, START, END = range(5)
+
+    OCCURRENCES_FILE = "occurrences.npy"
+    STRINGS_FILE = "strings.json"
+
+    def __init__(self):
+        self._documents = _StringTable()
+        self._labels = _StringTable()
+        self._texts = _StringTable()
+        self._occurrences = np.zeros((self.INITIAL_CAPACITY, 5), dtype=np.int32)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def documents(self):
+        return tuple(self._documents.strings)
+
+    @property
+    def labels(self):
+        return tuple(self._labels.strings)
+
+    @property
+    def occurrences(self):
+        """
+        Read-only view of occurrence rows (document id, label id, text id, start, end)
+        """
+        view = self._occurrences[:self._size]
+        view.flags.writeable = False
+
+        return view
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def add(self, document, occurrences):
+        """
+        Adds entity occurrences of one document
+        :param document: Identifier of document (e.g. URL)
+        :param occurrences: Iterable of (label, text, start, end), offsets are character offsets in document
+        """
+        document_id = self._documents.intern(document)
+        rows = [(document_id, self._labels.intern(label), self._texts.intern(text), start, end)
+                for label, text, start, end in occurrences]
+        if not rows:
+            return
+
+        self._reserve(self._size + len(rows))
+        self._occurrences[self._size:self._size + len(rows)] = rows
+        self._size += len(rows)
+
+    def remove(self, document):
+        """
+        Removes all occurrences of document, e.g. before adding its new version
+        :param document: Identifier of document
+        """
+        document_id = self._documents.get(document)
+        if document_id is None:
+            return
+
+        kept = self._occurrences[:self._size][self._occurrences[:self._size, self.DOCUMENT] != document_id]
+        self._occurrences[:len(kept)] = kept
+        self._size = len(kept)
+
+    def get_entities(self, document):
+        """
+        Gets distinct entities of document
+        :param document: Identifier of document
+        :return: Tuple of NamedEntity
+        """
+        rows = self._get_rows(document=document)
+
+        return tuple([self._get_entity(label_id, text_id) for label_id, text_id
+                      in np.unique(rows[:, [self.LABEL, self.TEXT]], axis=0).tolist()])
+
+    def count_by_label(self, distinct=False):
+        """
+        Counts occurrences of every label
+        :param distinct: Count distinct entity texts instead of occurrences
+        :return: List of (label, count) ordered from the most frequent
+        """
+        labels = self.occurrences[:, self.LABEL]
+        if distinct:
+            labels = np.unique(self.occurrences[:, [self.LABEL, self.TEXT]], axis=0)[:, 0]
+
+        counts = np.bincount(labels, minlength=len(self._labels))
+        order = np.argsort(-counts, kind="stable")
+
+        return [(self._labels.strings[i], int(counts[i])) for i in order.tolist() if counts[i]]
+
+    def get_top_entities(self, label=None, k=10, by_documents=False):
+        """
+        Gets the most frequent entities of the crawl, e.g. top ORG entities
+        :param label: Only entities with this label, all labels when None
+        :param k: Number of entities in result
+        :param by_documents: Count documents which contain entity instead of occurrences
+        :return: List of (NamedEntity, count) ordered from the most frequent
+        """
+        rows = self._get_rows(label=label)
+        if not len(rows):
+            return []
+
+        if by_documents:
+            # Every entity is counted once per document
+            rows = np.unique(rows[:, [self.DOCUMENT, self.LABEL, self.TEXT]], axis=0)[:, 1:]
+        else:
+            rows = rows[:, [self.LABEL, self.TEXT]]
+
+        # Label and text of entity are combined into one integer key
+        keys = rows[:, 0].astype(np.int64) * len(self._texts) + rows[:, 1]
+
+        entities, counts = np.unique(keys, return_counts=True)
+        if len(entities) > k:
+            best = np.argpartition(-counts, k - 1)[:k]
+            entities, counts = entities[best], counts[best]
+        order = np.lexsort((entities, -counts))
+
+        return [(self._get_entity(*divmod(entity, len(self._texts))), count)
+                for entity, count in zip(entities[order].tolist(), counts[order].tolist())]
+
+    def get_documents(self, entity):
+        """
+        Gets documents which contain entity
+        :param entity: NamedEntity
+        :return: List of (document, number of occurrences) ordered from the most occurrences
+        """
+        label_id, text_id = self._labels.get(entity.label), self._texts.get(entity.text)
+        if label_id is None or text_id is None:
+            return []
+
+        rows = self.occurrences
+        mask = (rows[:, self.LABEL] == label_id) & (rows[:, self.TEXT] == text_id)
+        documents, counts = np.unique(rows[mask, self.DOCUMENT], return_counts=True)
+        order = np.argsort(-counts, kind="stable")
+
+        return [(self._documents.strings[document], count)
+                for document, count in zip(documents[order].tolist(), counts[order].tolist())]
+
+    def save(self, directory):
+        """
+        Saves store into directory
+        :param directory: Directory of store
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, self.OCCURRENCES_FILE), self.occurrences)
+        with open(os.path.join(directory, self.STRINGS_FILE), "w", encoding="utf-8") as f:
+            json.dump({"documents": self._documents.strings, "labels": self._labels.strings,
+                       "texts": self._texts.strings}, f)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Loads store saved by save
+        :param directory: Directory of store
+        :return: EntityStore
+        """
+        with open(os.path.join(directory, cls.STRINGS_FILE), encoding="utf-8") as f:
+            strings = json.load(f)
+
+        store = cls()
+        store._documents = _StringTable(strings["documents"])
+        store._labels = _StringTable(strings["labels"])
+        store._texts = _StringTable(strings["texts"])
+
+        occurrences = np.load(os.path.join(directory, cls.OCCURRENCES_FILE))
+        store._reserve(len(occurrences))
+        store._occurrences[:len(occurrences)] = occurrences
+        store._size = len(occurrences)
+
+        return store
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _reserve(self, size):
+        capacity = len(self._occurrences)
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+        grown = np.zeros((capacity, 5), dtype=np.int32)
+        grown[:self._size] = self._occurrences[:self._size]
+        self._occurrences = grown
+
+    def _get_rows(self, document=None, label=None):
+        rows = self.occurrences
+        for column, table, value in ((self.DOCUMENT, self._documents, document), (self.LABEL, self._labels, label)):
+            if value is not None:
+                value_id = table.get(value)
+                rows = rows[:0] if value_id is None else rows[rows[:, column] == value_id]
+
+        return rows
+
+    def _get_entity(self, label_id, text_id):
+        return NamedEntity(self._labels.strings[label_id], self._texts.strings[text_id])
+
+
+class _StringTable:
+    """
+    Interns strings into consecutive integer ids
+    """
+
+    def __init__(self, strings=()):
+        self.strings = list(strings)
+        self._ids = {string: i for i, string in enumerate(self.strings)}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def get(self, string):
+        return self._ids.get(string)
+
+    def intern(self, string):
+        string_id = self._ids.get(string)
+        if string_id is None:
+            string_id = self._ids[string] = len(self.strings)
+            self.strings.append(string)
+
+        return string_id
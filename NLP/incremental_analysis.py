@@ -0,0 +1,134 @@
+# Basic libraries
+import hashlib
+from collections import namedtuple
+# App libraries
+from .nlp_result import NamedEntity
+from .nlp_service import NLPService
+from .text_chunking import TextChunker, merge_sets, merge_counts
+
+
+ContentBlock = namedtuple("ContentBlock", ("hash", "text"))
+
+
+class IncrementalAnalyzer:
+    """
+    Analyses page text by content blocks. Blocks are exactly the chunks NLPService analyses (windows of whole
+    paragraphs up to maximal chunk length), so every block has the same context and the merged results equal
+    the full recomputation by NLPService. Partial results of every block are cached by hash of the block,
+    so after re-crawl of a page only new or changed blocks go through NLP pipeline. A change which moves
+    window boundaries (e.g. much longer paragraph) makes the following blocks new as well.
+    """
+
+    BLOCK_ANALYSIS_PREFIX = "block."
+
+    def __init__(self, result_cache, max_block_length=TextChunker.DEFAULT_MAX_LENGTH):
+        """
+        :param result_cache: AnalysisResultCache where partial results of blocks are kept
+        :param max_block_length: Maximal length of block, it has to be max_chunk_length of NLPService
+        which results should be equal
+        """
+        self._result_cache = result_cache
+        self._chunker = TextChunker(max_block_length)
+        self._computed_blocks = 0
+        self._reused_blocks = 0
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def computed_blocks(self):
+        """
+        Number of blocks analysed by NLP since creation
+        """
+        return self._computed_blocks
+
+    @property
+    def reused_blocks(self):
+        """
+        Number of blocks which partial results were taken from cache since creation
+        """
+        return self._reused_blocks
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def split_blocks(self, text):
+        """
+        Splits text into content blocks, the same as chunks of NLPService
+        :param text: Text of page
+        :return: List of ContentBlock
+        """
+        return [ContentBlock(hashlib.sha256(chunk.text.encode("utf-8")).hexdigest(), chunk.text)
+                for chunk in self._chunker.split(text)]
+
+    def get_changed_blocks(self, previous_text, text):
+        """
+        Gets blocks of text which are not in previous version of text
+        :param previous_text: Text of page from previous crawl
+        :param text: Current text of page
+        :return: List of new or changed ContentBlock
+        """
+        previous_hashes = set(block.hash for block in self.split_blocks(previous_text))
+
+        return [block for block in self.split_blocks(text) if block.hash not in previous_hashes]
+
+    def get_named_entity_recognition(self, text):
+        """
+        Gets named entity recognition, see NLPService.get_named_entity_recognition
+        :param text: Text of page
+        :return: Tuple filled with NamedEntity
+        """
+        entities = merge_sets(self._get_partial_results("named_entity_recognition", text))
+
+        return tuple(set([NamedEntity(label, entity_text) for label, entity_text in entities]))
+
+    def get_n_grams(self, text):
+        """
+        Get N Grams, see NLPService.get_n_grams
+        :param text: Text of page
+        :return: Tuple of (Tuple of N Grams, Processed text)
+        """
+        n_grams, processed_texts = [], []
+        for block_n_grams, processed_text in self._get_partial_results("n_grams", text):
+            n_grams.extend(block_n_grams)
+            processed_texts.append(processed_text)
+
+        return tuple(n_grams), "\n".join(processed_texts)
+
+    def get_bag_of_terms(self, text, n_terms=15):
+        """
+        Gets bag of terms, see NLPService.get_bag_of_terms
+        :param text: Text of page
+        :param n_terms: Number of the most frequent terms in result
+        :return: Tuple of (Tuple of Terms, Processed text)
+        """
+        bags_of_terms, processed_texts = [], []
+        for block_bag_of_terms, processed_text in self._get_partial_results("bag_of_terms", text):
+            bags_of_terms.append(block_bag_of_terms)
+            processed_texts.append(processed_text)
+
+        return tuple([f"{term[0]} - {term[1]}" for term
+                      in merge_counts(bags_of_terms).most_common(n_terms)]), "\n".join(processed_texts)
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _get_partial_results(self, analysis, text):
+        """
+        Generates partial results of all blocks of text, only blocks missing in cache are analysed
+        """
+        cache_analysis = self.BLOCK_ANALYSIS_PREFIX + analysis
+
+        for block in self.split_blocks(text):
+            hit, partial_result = self._result_cache.get(block.text, cache_analysis)
+            if hit:
+                self._reused_blocks += 1
+            else:
+                partial_result = NLPService.get_partial_result(analysis, block.text)
+                self._result_cache.put(block.text, cache_analysis, None, partial_result)
+                self._computed_blocks += 1
+
+            yield partial_result
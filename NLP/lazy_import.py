@@ -0,0 +1,110 @@
+# Basic libraries
+import time
+import threading
+import importlib
+from collections import OrderedDict
+
+
+class LazyImport:
+    """
+    Proxy of module (or of one attribute of module, e.g. class) which is imported on first use.
+    Heavy libraries are then imported only when an analysis which needs them first runs.
+    """
+    __slots__ = ("_name", "_attribute", "_target")
+
+    def __init__(self, name, attribute=None):
+        """
+        :param name: Name of module
+        :param attribute: Name of attribute of module, the proxy stands for the module itself when None
+        """
+        self._name = name
+        self._attribute = attribute
+        self._target = None
+
+    def __getattr__(self, item):
+        return getattr(self._resolve(), item)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        full_name = self._name if self._attribute is None else f"{self._name}.{self._attribute}"
+        state = "imported" if self._target is not None else "not imported"
+
+        return f"<LazyImport '{full_name}' ({state})>"
+
+    @property
+    def is_imported(self):
+        return self._target is not None
+
+    def _resolve(self):
+        if self._target is None:
+            module = import_module(self._name)
+            self._target = module if self._attribute is None else getattr(module, self._attribute)
+
+        return self._target
+
+
+_lazy_imports = []
+_import_times = OrderedDict()
+_lock = threading.Lock()
+
+
+def lazy_import(name, attribute=None):
+    """
+    Creates proxy of module imported on first use, e.g. 'pd = lazy_import("pandas")'
+    or 'MDS = lazy_import("sklearn.manifold", "MDS")' instead of 'from sklearn.manifold import MDS'
+    :param name: Name of module
+    :param attribute: Name of attribute of module
+    :return: LazyImport
+    """
+    proxy = LazyImport(name, attribute)
+    with _lock:
+        _lazy_imports.append(proxy)
+
+    return proxy
+
+
+def import_module(name):
+    """
+    Imports module and records how long its first import took
+    :param name: Name of module
+    :return: Module
+    """
+    with _lock:
+        if name in _import_times:
+            return importlib.import_module(name)
+
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    duration = time.perf_counter() - start
+
+    with _lock:
+        # When two threads import module at the same time, the first finished one is recorded
+        _import_times.setdefault(name, (duration, threading.current_thread().name))
+
+    return module
+
+
+def get_import_times():
+    """
+    Gets durations of imports done through lazy imports in order of imports. Modules imported by earlier
+    imports are not counted again, so the first import of shared dependencies takes their time.
+    :return: Ordered dictionary module name -> (seconds, name of thread)
+    """
+    with _lock:
+        return OrderedDict(_import_times)
+
+
+def prewarm():
+    """
+    Imports all modules of lazy imports, e.g. in background thread after the window is shown
+    :return: Number of imported modules
+    """
+    with _lock:
+        proxies = list(_lazy_imports)
+
+    for proxy in proxies:
+        proxy._resolve()
+
+    return len(proxies)
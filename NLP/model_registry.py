@@ -0,0 +1,230 @@
+# Basic libraries
+import os
+import json
+import threading
+# App libraries
+from .lazy_import import lazy_import
+# Third-party libraries
+import numpy as np
+s = lazy_import("spacy")
+English = lazy_import("spacy.lang.en", "English")
+Vectors = lazy_import("spacy.vectors", "Vectors")
+textacy = lazy_import("textacy")
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded spaCy languages, so every model is loaded only once per process.
+    Word vectors of models can be exported once into memory-mapped files. Processes attached to them
+    load models without their vector tables and share one read-only copy of vectors through page cache.
+    """
+    SHARED_VECTORS_VARIABLE = "BC_SHARED_VECTORS"
+
+    VECTORS_FILE = "vectors.npy"
+    KEYS_FILE = "keys.npy"
+    ROWS_FILE = "rows.npy"
+    META_FILE = "meta.json"
+    MODEL_DIRECTORY = "model"
+
+    _langs = {}
+    _lock = threading.Lock()
+    _shared_vectors_directory = os.environ.get(SHARED_VECTORS_VARIABLE)
+    _shared_vectors = None
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    @classmethod
+    def get_spacy_lang(cls, name, disable=()):
+        """
+        Gets full spaCy language, loads it on first use
+        :param name: Name of the spaCy model
+        :param disable: Pipeline components which are not needed
+        :return: spaCy language
+        """
+        return cls._get(("spacy", name, tuple(disable)),
+                        lambda: cls._attach(name, s.load(cls._get_model_path(name), disable=tuple(disable))))
+
+    @classmethod
+    def get_textacy_lang(cls, name, disable=()):
+        """
+        Gets spaCy language loaded through textacy, loads it on first use
+        :param name: Name of the spaCy model
+        :param disable: Pipeline components which are not needed
+        :return: spaCy language
+        """
+        return cls._get(("textacy", name, tuple(disable)),
+                        lambda: cls._attach(name, textacy.load_spacy_lang(cls._get_model_path(name),
+                                                                          disable=tuple(disable))))
+
+    @classmethod
+    def get_tokenizer(cls):
+        """
+        Gets blank english language used only for tokenization
+        :return: spaCy English language
+        """
+        return cls._get(("tokenizer", "en"), English)
+
+    @classmethod
+    def clear(cls):
+        """
+        Forgets all loaded languages
+        """
+        with cls._lock:
+            cls._langs.clear()
+
+    @staticmethod
+    def get_model_version(name):
+        """
+        Gets version of model and libraries which produce results with it, without loading the model
+        :param name: Name of the spaCy model
+        :return: Version as string
+        """
+        try:
+            model_version = s.util.get_package_version(name)
+        except AttributeError:
+            model_version = None
+
+        return f"spacy={s.__version__};{name}={model_version};textacy={textacy.__version__}"
+
+    @classmethod
+    def export_shared_vectors(cls, name, directory):
+        """
+        Exports word vectors of model into memory-mappable files and saves copy of the model without vectors
+        :param name: Name of the spaCy model
+        :param directory: Directory of shared vectors
+        """
+        lang = s.load(name)
+        vectors = lang.vocab.vectors
+        os.makedirs(directory, exist_ok=True)
+
+        np.save(os.path.join(directory, cls.VECTORS_FILE), np.ascontiguousarray(vectors.data, dtype=np.float32))
+        np.save(os.path.join(directory, cls.KEYS_FILE), np.fromiter(vectors.key2row.keys(), dtype=np.uint64))
+        np.save(os.path.join(directory, cls.ROWS_FILE), np.fromiter(vectors.key2row.values(), dtype=np.int64))
+
+        # Model is saved with empty vector table of the same width and name, so its pipeline stays compatible
+        lang.vocab.vectors = Vectors(shape=(0, vectors.data.shape[1]), name=vectors.name)
+        lang.to_disk(os.path.join(directory, cls.MODEL_DIRECTORY))
+        lang.vocab.vectors = vectors
+
+        # Metadata are written last, so interrupted export is not used
+        with open(os.path.join(directory, cls.META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"model": name, "vectors_name": vectors.name, "shape": list(vectors.data.shape)}, f)
+
+    @classmethod
+    def has_shared_vectors(cls, name, directory):
+        """
+        Checks whether word vectors of model are exported in directory
+        :param name: Name of the spaCy model
+        :param directory: Directory of shared vectors
+        :return: True if they are exported
+        """
+        return cls._read_meta(directory, name) is not None
+
+    @classmethod
+    def attach_shared_vectors(cls, directory):
+        """
+        Attaches this process and worker processes started later to exported shared vectors.
+        Models loaded afterwards use them. It is used as initializer of worker processes too.
+        :param directory: Directory of shared vectors, None detaches process from them
+        """
+        with cls._lock:
+            if directory == cls._shared_vectors_directory:
+                return
+
+            cls._shared_vectors_directory = directory
+            cls._shared_vectors = None
+            cls._langs.clear()
+            if directory is None:
+                os.environ.pop(cls.SHARED_VECTORS_VARIABLE, None)
+            else:
+                os.environ[cls.SHARED_VECTORS_VARIABLE] = directory
+
+    @classmethod
+    def get_shared_vectors_directory(cls):
+        """
+        Gets directory of shared vectors this process is attached to
+        :return: Directory or None
+        """
+        return cls._shared_vectors_directory
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    @classmethod
+    def _get(cls, key, loader):
+        lang = cls._langs.get(key)
+        if lang is not None:
+            return lang
+
+        with cls._lock:
+            if key not in cls._langs:
+                cls._langs[key] = loader()
+            return cls._langs[key]
+
+    @classmethod
+    def _get_shared_meta(cls, name):
+        """
+        Gets metadata of shared vectors if they are exported for the model
+        """
+        if not cls._shared_vectors_directory:
+            return None
+
+        return cls._read_meta(cls._shared_vectors_directory, name)
+
+    @classmethod
+    def _read_meta(cls, directory, name):
+        path = os.path.join(directory, cls.META_FILE)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        return meta if meta["model"] == name else None
+
+    @classmethod
+    def _get_model_path(cls, name):
+        if cls._get_shared_meta(name) is None:
+            return name
+
+        return os.path.join(cls._shared_vectors_directory, cls.MODEL_DIRECTORY)
+
+    @classmethod
+    def _attach(cls, name, lang):
+        """
+        Replaces empty vector table of language loaded from shared directory by memory-mapped shared vectors
+        """
+        meta = cls._get_shared_meta(name)
+        if meta is None:
+            return lang
+
+        if cls._shared_vectors is None:
+            directory = cls._shared_vectors_directory
+            vectors = Vectors(data=np.load(os.path.join(directory, cls.VECTORS_FILE), mmap_mode="r"),
+                              name=meta["vectors_name"])
+            keys = np.load(os.path.join(directory, cls.KEYS_FILE))
+            rows = np.load(os.path.join(directory, cls.ROWS_FILE))
+            # Table of keys is built at once, every row of data is already in use
+            vectors.key2row = dict(zip(keys.tolist(), rows.tolist()))
+            cls._shared_vectors = vectors
+
+        lang.vocab.vectors = cls._shared_vectors
+        cls._link_vectors(lang.vocab)
+
+        return lang
+
+    @staticmethod
+    def _link_vectors(vocab):
+        """
+        Models of spaCy 2 keep their own reference to vector table, it has to point to shared vectors
+        """
+        try:
+            from spacy._ml import link_vectors_to_models
+        except ImportError:
+            # spaCy 3 reads vectors from vocabulary
+            return
+
+        link_vectors_to_models(vocab)
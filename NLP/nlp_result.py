@@ -1,52 +1,102 @@
-import gensim
+# Basic libraries
+import hashlib
+# App libraries
+from Instrumentation.metrics import METRICS
+from .result_cache import cached_analysis
+from .summarization import TextRankSummarizer
+from .lazy_import import lazy_import
+# Third-party libraries
+gensim = lazy_import("gensim")
+
+_STAGE_SECONDS = "nlp_stage_seconds"
+_STAGE_DESCRIPTION = "Duration of stages of NLP analyses"
+_LDA_CORPUS_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="lda_corpus")
+_LDA_TRAINING_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="lda_training")
+_SUMMARIZATION_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="summarization")
 
 
 class NamedEntity:
     """
-    Class that encapsulate named entity recognition result
+    Class that encapsulate named entity recognition result.
+    Hash is computed once, entities are compared by label and text.
     """
+    __slots__ = ("_label", "_text", "_hash")
+
     def __init__(self, label, text):
         self._label = label
         self._text = text
+        self._hash = hash((label, text))
 
     def __repr__(self):
         return f"{self._label} - {self._text}"
 
     def __hash__(self):
-        return self.__repr__().__hash__()
+        return self._hash
 
     def __eq__(self, other):
         if type(other) != NamedEntity:
             return False
 
-        return self.__hash__() == other.__hash__()
+        return self._hash == other._hash and self._label == other._label and self._text == other._text
+
+    def __reduce__(self):
+        # Hash of strings differs between processes, so it is not pickled (e.g. into result cache)
+        return NamedEntity, (self._label, self._text)
+
+    @property
+    def label(self):
+        return self._label
+
+    @property
+    def text(self):
+        return self._text
 
 
 class Gensim:
     """
     Class for working with text for Topic modeling and Text summarization
     """
-    def __init__(self, text, text_data):
+    def __init__(self, text, text_data, topic_model_store=None, result_cache=None):
         self._text = text
-        self._text_data_dictionary = gensim.corpora.Dictionary(text_data)
-        self._corpus = [self._text_data_dictionary.doc2bow(text) for text in text_data]
+        with _LDA_CORPUS_TIME.time():
+            self._text_data_dictionary = gensim.corpora.Dictionary(text_data)
+            self._corpus = [self._text_data_dictionary.doc2bow(text) for text in text_data]
+        self._topic_model_store = topic_model_store
+        self._result_cache = result_cache
+        self._cache_parameters = {}
+
+    @property
+    def model_name(self):
+        """
+        Name of topic model of current text in the store
+        """
+        return hashlib.sha1(self._text.encode("utf-8")).hexdigest()
 
+    @cached_analysis
     def get_topics(self, number_topic=5, number_words=4):
         """
-        Gets topics of text
+        Gets topics of text. With topic model store the model is trained only once for the same text.
         :param number_topic: Number of topic
         :param number_words: Number of words in result
         :return: Topic modeling
         """
-        lda_model = gensim.models.ldamodel.LdaModel(self._corpus, num_topics=number_topic,
-                                                    id2word=self._text_data_dictionary, passes=15)
-        lda_model.save('model5.gensim')
+        with _LDA_TRAINING_TIME.time():
+            if self._topic_model_store is None:
+                lda_model = gensim.models.ldamodel.LdaModel(self._corpus, num_topics=number_topic,
+                                                            id2word=self._text_data_dictionary, passes=15)
+            else:
+                lda_model = self._topic_model_store.get_or_train(f"{self.model_name}_{number_topic}", self._corpus,
+                                                                 self._text_data_dictionary, number_topic)
 
         return lda_model.print_topics(num_words=number_words)
 
-    def get_summarization(self):
+    @cached_analysis
+    def get_summarization(self, ratio=0.2, word_count=None):
         """
         Gets text summarization
+        :param ratio: Fraction of sentences in result
+        :param word_count: Maximal number of words in result, takes precedence over ratio
         :return: Summarized text
         """
-        return gensim.summarization.summarize(self._text)
+        with _SUMMARIZATION_TIME.time():
+            return TextRankSummarizer().summarize(self._text, ratio=ratio, word_count=word_count)
@@ -1,29 +1,65 @@
+# Basic libraries
+from collections import Counter
+from functools import partial, lru_cache
 # App libraries
+from Instrumentation.metrics import METRICS
+from Instrumentation.profiling import profile_public_methods
 from .nlp_result import *
+from .lazy_import import lazy_import
+from .model_registry import ModelRegistry
+from .nltk_resources import NltkResources
+from .result_cache import cached_analysis
+from .text_chunking import TextChunker, map_chunks, merge_sets, merge_counts, merge_ranked_terms
 # Third-party libraries
-import spacy as s
-from spacy.lang.en import English
-import nltk
-from nltk.corpus import wordnet as wn
-import textacy
-import textacy.keyterms
-from sklearn.metrics import pairwise_distances
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from sklearn.manifold import MDS
-from textacy.similarity import word_movers, extract
-
-
+# Heavy libraries are imported on first use
+wn = lazy_import("nltk.corpus", "wordnet")
+textacy = lazy_import("textacy")
+keyterms = lazy_import("textacy.keyterms")
+pairwise_distances = lazy_import("sklearn.metrics", "pairwise_distances")
+pd = lazy_import("pandas")
+plt = lazy_import("matplotlib.pyplot")
+LineCollection = lazy_import("matplotlib.collections", "LineCollection")
+cKDTree = lazy_import("scipy.spatial", "cKDTree")
+MDS = lazy_import("sklearn.manifold", "MDS")
+word_movers = lazy_import("textacy.similarity", "word_movers")
+extract = lazy_import("textacy.similarity", "extract")
+
+_STAGE_SECONDS = "nlp_stage_seconds"
+_STAGE_DESCRIPTION = "Duration of stages of NLP analyses"
+_SPACY_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="spacy_pipeline")
+_TEXTACY_DOC_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="textacy_doc")
+_LDA_TOKENS_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="lda_tokens")
+_EXTRACTION_TIMES = {
+    extraction: METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage=f"textacy_{extraction}")
+    for extraction in ("n_grams", "named_entities", "key_terms", "pos_regex", "bag_of_terms")}
+_CHARACTERS = METRICS.counter("nlp_characters_total", "Characters of texts processed by spaCy")
+_TOKENS = METRICS.counter("nlp_tokens_total", "Tokens of documents created by spaCy")
+_LDA_TOKENS = METRICS.counter("nlp_lda_tokens_total", "Tokens prepared for topic modeling")
+
+
+@profile_public_methods
 class NLPService:
     """
     Class for fetching NLP results or classes that works with partial results of NLP and provides another methods
     """
-    def __init__(self, text=None):
+    def __init__(self, text=None, max_chunk_length=TextChunker.DEFAULT_MAX_LENGTH, workers=1,
+                 topic_model_store=None, result_cache=None):
         self._text = text
+        self._chunker = TextChunker(max_chunk_length)
+        self._workers = workers
+        # Without store topic models are trained in memory for every text and nothing is written on disk
+        self._topic_model_store = topic_model_store
+        self._result_cache = result_cache
 
     _WORD_MODEL_NAME = "en_core_web_md"
     COLORING = ('b', 'r', 'g', 'k', 'y')
+    # How many more key terms is ranked in every chunk than is in the result, so they can be re-ranked globally
+    KEY_TERMS_CHUNK_FACTOR = 3
+    # Analyses which results of parts of text can be merged, see get_partial_result
+    PARTIAL_ANALYSES = ("named_entity_recognition", "n_grams", "bag_of_terms")
+    # Maximal number of memoized lemmas of distinct words
+    LEMMA_CACHE_SIZE = 100000
 
     # -----------------
     # Properties
@@ -37,10 +73,62 @@ class NLPService:
     def text(self, value):
         self._text = value
 
+    @property
+    def max_chunk_length(self):
+        return self._chunker.max_length
+
+    @max_chunk_length.setter
+    def max_chunk_length(self, value):
+        self._chunker = TextChunker(value)
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @workers.setter
+    def workers(self, value):
+        self._workers = value
+
+    @property
+    def topic_model_store(self):
+        return self._topic_model_store
+
+    @property
+    def result_cache(self):
+        return self._result_cache
+
+    @result_cache.setter
+    def result_cache(self, value):
+        self._result_cache = value
+
+    @property
+    def _cache_parameters(self):
+        # Chunking changes merged results of some analyses
+        return {"max_chunk_length": self._chunker.max_length}
+
     # -----------------
     # Public methods
     # -----------------
 
+    @staticmethod
+    def get_model_version():
+        """
+        Gets version of models used by analyses, e.g. for invalidation of cached results
+        :return: Version as string
+        """
+        return ModelRegistry.get_model_version(NLPService._WORD_MODEL_NAME)
+
+    @staticmethod
+    def use_shared_vectors(directory):
+        """
+        Shares word vectors of model among worker processes, exports them into directory first if they are missing
+        :param directory: Directory of shared vectors
+        """
+        if not ModelRegistry.has_shared_vectors(NLPService._WORD_MODEL_NAME, directory):
+            ModelRegistry.export_shared_vectors(NLPService._WORD_MODEL_NAME, directory)
+
+        ModelRegistry.attach_shared_vectors(directory)
+
     # GENSIM - Topic Modeling, Text summarization
 
     def get_topic_modeling_and_summarization(self):
@@ -51,20 +139,111 @@ class NLPService:
         """
         text_data = self._prepare_text_for_lda()
 
-        return Gensim(self.text, text_data), "\n".join([",".join(td) for td in text_data])
+        return Gensim(self.text, text_data, self._topic_model_store, self._result_cache), "\n".join([",".join(td) for td in text_data])
+
+    def get_page_topics(self, model_name):
+        """
+        Assigns topics of already trained model to current text, no training is done
+        :param model_name: Name of the model in topic model store
+        :return: List of (topic id, probability)
+        """
+        self._check_topic_model_store()
+        return self._topic_model_store.get_document_topics(model_name, self.get_lda_tokens())
+
+    def update_topic_model(self, model_name):
+        """
+        Trains already existing model online with current text (e.g. newly crawled page)
+        :param model_name: Name of the model in topic model store
+        """
+        self._check_topic_model_store()
+        self._topic_model_store.update(model_name, self._prepare_text_for_lda())
+
+    @cached_analysis
+    def get_lda_tokens(self):
+        """
+        Gets filtered and lemmatized tokens of the previously defined text, the same as used for topic modeling
+        :return: List of tokens
+        """
+        stop_words = NltkResources.get_stop_words()
+
+        # One streaming pass, every distinct token is filtered and lemmatized only once
+        lemmas = {}
+        tokens = []
+        with _LDA_TOKENS_TIME.time():
+            for token in self._tokenize():
+                lemma = lemmas.get(token, False)
+                if lemma is False:
+                    lemma = self._get_lemma(token) if len(token) > 4 and token not in stop_words else None
+                    lemmas[token] = lemma
+                if lemma is not None:
+                    tokens.append(lemma)
+        _LDA_TOKENS.inc(len(tokens))
+
+        return tokens
 
     # SPACY - Named Entity Recognition
 
+    @cached_analysis
     def get_named_entity_recognition(self):
         """
         Gets named entity recognition in tuple
         :return: Tuple filled with SpacyEntity class that has 'label' and its 'text'
         """
-        spacy_nlp = s.load(self._WORD_MODEL_NAME)
-        spacy_doc = spacy_nlp(self._text)
-        return tuple(set([NamedEntity(entity.label_, entity.text)
-                          for entity in spacy_doc.ents
-                          if entity.label_ != "GPE"]))
+        entities = merge_sets(self._map_chunks(_named_entity_recognition_chunk))
+
+        return tuple(set([NamedEntity(label, text) for label, text in entities]))
+
+    @staticmethod
+    def get_named_entity_recognition_of_texts(texts, batch_size=32, max_chunk_length=TextChunker.DEFAULT_MAX_LENGTH):
+        """
+        Gets named entity recognition of more texts at once, chunks of all texts go through spaCy in batches
+        (nlp.pipe), which is faster than analysing the texts one by one
+        :param texts: List of texts
+        :param batch_size: Number of chunks processed by spaCy at once
+        :param max_chunk_length: Maximal length of one chunk
+        :return: List with tuple of NamedEntity for every text
+        """
+        chunker = TextChunker(max_chunk_length)
+        chunks = [(i, chunk.text) for i, text in enumerate(texts) for chunk in chunker.split(text)]
+        spacy_lang = ModelRegistry.get_spacy_lang(NLPService._WORD_MODEL_NAME)
+
+        entities = [set() for _ in texts]
+        with _SPACY_TIME.time():
+            spacy_docs = spacy_lang.pipe((text for _, text in chunks), batch_size=batch_size)
+            for (i, text), spacy_doc in zip(chunks, spacy_docs):
+                _CHARACTERS.inc(len(text))
+                _TOKENS.inc(len(spacy_doc))
+                entities[i].update((entity.label_, entity.text) for entity in spacy_doc.ents
+                                   if entity.label_ != "GPE")
+
+        return [tuple(NamedEntity(label, text) for label, text in text_entities) for text_entities in entities]
+
+    def add_entities_to_store(self, entity_store, document):
+        """
+        Recognizes named entities of current text and stores all their occurrences with offsets
+        :param entity_store: EntityStore of the crawl
+        :param document: Identifier of document (e.g. URL), previous occurrences of the document are replaced
+        """
+        chunks = list(self._chunker.split(self.text))
+
+        entity_store.remove(document)
+        for chunk, occurrences in zip(chunks, map_chunks(_entity_occurrences_chunk, chunks, self._workers)):
+            entity_store.add(document, [(label, text, chunk.start + start, chunk.start + end)
+                                        for label, text, start, end in occurrences])
+
+    @staticmethod
+    def get_partial_result(analysis, text):
+        """
+        Gets mergeable partial result of analysis of one part of text (chunk or block)
+        :param analysis: One of PARTIAL_ANALYSES
+        :param text: Text of the part
+        :return: 'named_entity_recognition' - list of (label, text), 'n_grams' - tuple (list of N Grams,
+        processed text), 'bag_of_terms' - tuple (dictionary term -> count, processed text)
+        """
+        if analysis not in NLPService.PARTIAL_ANALYSES:
+            raise ValueError(f"Neznámá analýza '{analysis}'")
+
+        return _PARTIAL_ANALYSES[analysis](text)
 
     @staticmethod
     def get_textacy_doc(text):
@@ -73,68 +252,88 @@ class NLPService:
         :param text: Text of which textacy doc to get
         :return: tuple Textacy doc, Processed text
         """
-        en = textacy.load_spacy_lang(NLPService._WORD_MODEL_NAME, disable=('parser',))
-        processed_text = textacy.preprocess_text(text, lowercase=True, no_punct=True)
+        en = ModelRegistry.get_textacy_lang(NLPService._WORD_MODEL_NAME, disable=('parser',))
+        with _TEXTACY_DOC_TIME.time():
+            processed_text = textacy.preprocess_text(text, lowercase=True, no_punct=True)
+            doc = textacy.make_spacy_doc(processed_text, lang=en)
+        _CHARACTERS.inc(len(processed_text))
+        _TOKENS.inc(len(doc))
 
-        return textacy.make_spacy_doc(processed_text, lang=en), processed_text
+        return doc, processed_text
 
     # Base Textacy analysis
 
+    @cached_analysis
     def get_n_grams(self):
         """
         Get N Grams in current text
         :return: Tuple of (Tuple of N Grams, Processed text by this method)
         """
-        doc, processed_text = self.get_textacy_doc(self.text)
+        n_grams, processed_texts = [], []
+        for chunk_n_grams, processed_text in self._map_chunks(_n_grams_chunk):
+            n_grams.extend(chunk_n_grams)
+            processed_texts.append(processed_text)
 
-        return tuple([str(ngram) for ngram
-                      in textacy.extract.ngrams(doc, 3, filter_stops=True,
-                                                filter_punct=True, filter_nums=False)]), processed_text
+        return tuple(n_grams), "\n".join(processed_texts)
 
+    @cached_analysis
     def get_named_entity(self):
         """
         Gets named entity recognition
         :return: Tuple of (Tuple of Named entities, Processed text by this method)
         """
-        doc, processed_text = self.get_textacy_doc(self.text)
+        named_entities, processed_texts = [], []
+        for chunk_named_entities, processed_text in self._map_chunks(_named_entity_chunk):
+            named_entities.extend(chunk_named_entities)
+            processed_texts.append(processed_text)
 
-        return tuple([str(named_entity) for named_entity
-                      in textacy.extract.entities(doc, drop_determiners=True)]), processed_text
+        return tuple(named_entities), "\n".join(processed_texts)
 
-    def get_key_terms(self):
+    @cached_analysis
+    def get_key_terms(self, n_key_terms=10):
         """
         Gets key of terms in current text
+        :param n_key_terms: Number of key terms in result
         :return: Tuple of (Tuple of Key Terms, Processed text by this method)
         """
-        doc, processed_text = self.get_textacy_doc(self.text)
+        ranked_terms, processed_texts = [], []
+        for weight, chunk_key_terms, processed_text in self._map_chunks(partial(_key_terms_chunk, n_key_terms=n_key_terms)):
+            ranked_terms.append((weight, chunk_key_terms))
+            processed_texts.append(processed_text)
 
         return tuple([f"{textrank[0]} - {textrank[1]}" for textrank
-                      in textacy.keyterms.textrank(doc, normalize='lemma', n_keyterms=10)]), processed_text
+                      in merge_ranked_terms(ranked_terms, n_key_terms)]), "\n".join(processed_texts)
 
+    @cached_analysis
     def get_pos_regex(self):
         """
         Gets Pos Regex matches in textacy patterns in english
         :return: Tuple of (Tuple of Pos Regex matches, Processed text by this method)
         """
-        doc, processed_text = self.get_textacy_doc(self.text)
-        pattern = textacy.constants.POS_REGEX_PATTERNS['en']['NP']
-
-        return tuple([str(regex_match) for regex_match
-                      in textacy.extract.pos_regex_matches(doc, pattern)]) + ("\n",) +\
-               tuple([f"{sgrank[0]} - {sgrank[1]}" for sgrank
-                      in textacy.keyterms.sgrank(doc, ngrams=(1, 2, 3, 4), normalize='lower', n_keyterms=0.1)]),\
-               processed_text
-
-    def get_bag_of_terms(self):
+        regex_matches, ranked_terms, processed_texts = [], [], []
+        for chunk_regex_matches, weight, chunk_sgrank, processed_text in self._map_chunks(_pos_regex_chunk):
+            regex_matches.extend(chunk_regex_matches)
+            ranked_terms.append((weight, chunk_sgrank))
+            processed_texts.append(processed_text)
+
+        return tuple(regex_matches) + ("\n",) +\
+               tuple([f"{sgrank[0]} - {sgrank[1]}" for sgrank in merge_ranked_terms(ranked_terms)]),\
+               "\n".join(processed_texts)
+
+    @cached_analysis
+    def get_bag_of_terms(self, n_terms=15):
         """
         Gets bag of terms in current text
+        :param n_terms: Number of the most frequent terms in result
         :return: Tuple of (Tuple of Terms, Processed text by this method)
         """
-        doc, processed_text = self.get_textacy_doc(self.text)
-        bot = doc._.to_bag_of_terms(ngrams=(1, 2, 3), named_entities=True, weighting='count', as_strings=True)
+        bags_of_terms, processed_texts = [], []
+        for chunk_bag_of_terms, processed_text in self._map_chunks(_bag_of_terms_chunk):
+            bags_of_terms.append(chunk_bag_of_terms)
+            processed_texts.append(processed_text)
 
         return tuple([f"{term[0]} - {term[1]}" for term
-                      in sorted(bot.items(), key=lambda x: x[1], reverse=True)[:15]]), processed_text
+                      in merge_counts(bags_of_terms).most_common(n_terms)]), "\n".join(processed_texts)
 
     @staticmethod
     def get_word_movers(text_1, text_2):
@@ -152,107 +351,176 @@ class NLPService:
 
         return word_mover, f"Zpracovaný text 1:\n{preprocess_text_1}\n\nZpracovaný text 2:\n{preprocess_text_2}"
 
+    def get_similar_documents(self, similarity_engine, k=5):
+        """
+        Gets documents the most similar to current text
+        :param similarity_engine: DocumentSimilarityEngine filled with documents (e.g. crawled pages)
+        :param k: Number of documents in result
+        :return: List of tuples (document id, word movers similarity) ordered from the most similar
+        """
+        return similarity_engine.query(self.text, k)
+
+    # Corpus key terms
+
+    def add_page_to_corpus(self, corpus_key_terms, page_id):
+        """
+        Adds current text into corpus of crawled pages
+        :param corpus_key_terms: CorpusKeyTermEngine of the crawl
+        :param page_id: Key of page in results (e.g. URL)
+        """
+        corpus_key_terms.add_document(page_id, self.text)
+
+    def get_corpus_key_terms(self, corpus_key_terms, k=10):
+        """
+        Gets terms distinctive for current text relative to the whole crawl (TF-IDF)
+        :param corpus_key_terms: CorpusKeyTermEngine of the crawl
+        :param k: Number of terms in result
+        :return: Tuple of terms with their scores
+        """
+        return tuple([f"{term} - {score:.4f}" for term, score in corpus_key_terms.get_key_terms(self.text, k)])
+
+    # Vector index
+
+    def add_page_to_vector_index(self, vector_index, page_id):
+        """
+        Inserts document vector of current text into vector index
+        :param vector_index: VectorIndex of pages
+        :param page_id: Key of page returned by queries (e.g. URL)
+        """
+        doc, _ = self.get_textacy_doc(self.text)
+        vector_index.add([page_id], doc.vector[np.newaxis, :])
+
+    def add_terms_to_vector_index(self, vector_index):
+        """
+        Inserts vectors of distinct words of current text, which are not in the index yet, into vector index
+        :param vector_index: VectorIndex of terms
+        """
+        doc, _ = self.get_textacy_doc(self.text)
+
+        terms = dict()
+        for word in extract.words(doc):
+            if word.has_vector and not vector_index.contains(word.lower_):
+                terms.setdefault(word.lower_, word.vector)
+
+        if terms:
+            vector_index.add(list(terms), np.array(list(terms.values())))
+
+    def get_nearest_pages(self, vector_index, k=10, n_probe=None):
+        """
+        Gets pages with meaning the most similar to current text
+        :param vector_index: VectorIndex of pages
+        :param k: Number of pages in result
+        :param n_probe: Number of searched clusters (more is slower but more accurate)
+        :return: List of tuples (page id, cosine similarity)
+        """
+        doc, _ = self.get_textacy_doc(self.text)
+
+        return vector_index.query(doc.vector, k, n_probe)
+
     @staticmethod
-    def show_word_movers_plot(text_1, text_2):
+    def get_nearest_terms(vector_index, term, k=10, n_probe=None):
+        """
+        Gets terms with meaning the most similar to term
+        :param vector_index: VectorIndex of terms
+        :param term: Searched term
+        :param k: Number of terms in result
+        :param n_probe: Number of searched clusters (more is slower but more accurate)
+        :return: List of tuples (term, cosine similarity)
+        """
+        lang = ModelRegistry.get_textacy_lang(NLPService._WORD_MODEL_NAME, disable=('parser',))
+
+        return vector_index.query(lang.vocab[term.lower()].vector, k, n_probe)
+
+    @staticmethod
+    def show_word_movers_plot(text_1, text_2, max_words=2000, projection="pca", export_path=None, max_labels=300):
         """
         Show word movers matplotlib's plot.
         :param text_1: First text
         :param text_2: Second text
+        :param max_words: Maximal number of plotted words, the most frequent words of both texts are kept
+        :param projection: Projection of word vectors into plane - 'pca', 'landmark_mds' or 'mds' (slow, small texts)
+        :param export_path: Path of '.npz' or '.parquet' file for export of distance matrix, nothing is exported if None
+        :param max_labels: Maximal number of words with label in plot
         """
         doc_1, _ = NLPService.get_textacy_doc(text_1)
         doc_2, _ = NLPService.get_textacy_doc(text_2)
 
-        word_idxs = dict()
-        word_vecs = []
-        word_nams = []
-        nums_vecs = 0
-
-        concatenated = [extract.words(doc_1), extract.words(doc_2)]
-        for document in range(len(concatenated)):
-            for word in concatenated[document]:
-                if word.has_vector and word_idxs.setdefault(word.orth, nums_vecs) == nums_vecs:
-                    word_vecs.append(word.vector)
-                    word_nams.append({'word': str(word), 'class': document})
-                    nums_vecs += 1
-        distance_mat = pairwise_distances(word_vecs, metric="cosine").astype(np.double)
-        distance_mat /= distance_mat.max()
-
-        # Create DataFrame
-        w = [w.get('word') for w in word_nams]
-        c = [w.get('class') for w in word_nams]
-        df = pd.DataFrame(data=distance_mat, index=w, columns=w)
-
-        writer = pd.ExcelWriter('output_raw_sim.xlsx')
-        df.to_excel(writer, 'Sheet1')
-        writer.save()
-
-        mds = MDS(n_components=2, dissimilarity="precomputed", random_state=1)
-        pos = mds.fit_transform(df.values)
-
-        xvals = pos[:, 0]
-        yvals = pos[:, 1]
-
-        classes = c if c else [0] * len(xvals)
-        colors = NLPService.COLORING
-        values = list(zip(xvals, yvals, classes, df.columns))
-
-        for x, y, cls, name in values:
-            plt.scatter(x, y, c=colors[cls])
+        words, classes, vectors = NLPService._get_plot_words([extract.words(doc_1), extract.words(doc_2)], max_words)
+        if not words:
+            raise Exception("Texty neobsahují žádná slova s vektory")
+
+        if export_path is not None:
+            NLPService._export_distances(export_path, words, vectors)
+
+        if projection == "pca":
+            pos = NLPService._project_pca(vectors)
+        elif projection == "landmark_mds":
+            pos = NLPService._project_landmark_mds(vectors)
+        elif projection == "mds":
+            distance_mat = pairwise_distances(vectors, metric="cosine").astype(np.double)
+            distance_mat /= max(distance_mat.max(), 1.0e-12)
+            pos = MDS(n_components=2, dissimilarity="precomputed", random_state=1).fit_transform(distance_mat)
+        else:
+            raise ValueError(f"Neznámá projekce '{projection}'")
+
+        colors = np.array(NLPService.COLORING)[classes]
+        plt.scatter(pos[:, 0], pos[:, 1], c=list(colors))
+        # Words are sorted by frequency, so the most frequent ones are labeled
+        for (x, y), name in zip(pos[:max_labels], words[:max_labels]):
             plt.text(x, y, name, fontsize=9)
 
-        # closest = find_closest_words(values)
+        values = list(zip(pos[:, 0], pos[:, 1], classes, words))
         closest = NLPService.find_closest_words(values, classes=classes, focused_class=0)
-        for close_points in closest:
-            x = [close_points[0][0], close_points[1][0]]
-            y = [close_points[0][1], close_points[1][1]]
-            plt.plot(x, y, 'k', alpha=0.5)
+        if closest:
+            plt.gca().add_collection(LineCollection(closest, colors='k', alpha=0.5))
         plt.show()
 
     @staticmethod
     def find_closest_words(coordinates, classes=None, focused_class=None):
-        if classes is not None and focused_class is not None:
-            closest = []
-            sources = []
-            targets = []
-            for i in range(len(coordinates)):
-                if classes[i] == focused_class:
-                    sources.append(coordinates[i])
-                else:
-                    targets.append(coordinates[i])
+        """
+        Finds closest point for points in plane by KD-tree
+        :param coordinates: Sequence of points, first two items of every point are its coordinates
+        :param classes: Classes of points
+        :param focused_class: Closest point of other class is found for every point of this class
+        :return: List of pairs of points
+        """
+        x_y_coord = np.array([(c[0], c[1]) for c in coordinates], dtype=np.double).reshape(-1, 2)
 
-            for s in sources:
-                dist = [np.linalg.norm(np.array([s[0], s[1]]) - np.array([t[0], t[1]])) for t in targets]
-                dist = np.array(dist)
-                if np.min(dist) == 0.0:
-                    idx = np.where(dist == np.partition(dist, 2)[2])[0]
-                else:
-                    idx = np.argmin(dist)
-                closest.append(((s[0], s[1]), (targets[idx][0], targets[idx][1])))
-            return closest
+        if classes is not None and focused_class is not None:
+            focused = np.asarray(classes) == focused_class
+            sources, targets = x_y_coord[focused], x_y_coord[~focused]
+            if not len(sources) or not len(targets):
+                return []
+
+            distances, indices = NLPService._query_tree(targets, sources, min(3, len(targets)))
+            # Point at the same place is skipped, the third closest one is taken like in the pairwise version
+            idx = np.where(distances[:, 0] == 0.0, indices[:, -1], indices[:, 0])
+            return [((s[0], s[1]), (t[0], t[1])) for s, t in zip(sources, targets[idx])]
         else:
-            x_y_coord = [np.array([c[0], c[1]]) for c in coordinates]
-            distances = pairwise_distances(x_y_coord, metric='euclidean').astype(np.double)
-            indices = [np.where(row == np.partition(row, 2)[2])[0] for row in distances]
-            closest = [(x_y_coord[int(i)], x_y_coord[int(indices[i])]) for i in range(len(indices))]
-            return closest
+            if len(x_y_coord) < 2:
+                return []
+
+            # The closest point is the point itself, it is skipped like in the pairwise version
+            _, indices = NLPService._query_tree(x_y_coord, x_y_coord, min(3, len(x_y_coord)))
+            return [(x_y_coord[i], x_y_coord[indices[i, -1]]) for i in range(len(x_y_coord))]
 
     # -----------------
     # Private methods
     # -----------------
 
+    def _check_topic_model_store(self):
+        """
+        Checks that service has topic model store for analyses with stored models
+        """
+        if self._topic_model_store is None:
+            raise ValueError("Služba nemá úložiště tématických modelů")
+
     def _prepare_text_for_lda(self):
         """
         Prepares text for Latent Dirichlet Allocation
         :return: Tokens of the previously defined text
         """
-        nltk.download('stopwords')
-        stop_words = set(nltk.corpus.stopwords.words('english'))
-
-        nltk.download('wordnet')
-        tokens = self._tokenize()
-        tokens = [token for token in tokens if len(token) > 4]
-        tokens = [token for token in tokens if token not in stop_words]
-        tokens = [self._get_lemma(token) for token in tokens]
+        tokens = self.get_lda_tokens()
 
         # Divide tokens for individual lists into one list
         number_parts = int(len(tokens) / 10)
@@ -264,31 +532,128 @@ class NLPService:
 
         return token_list
 
+    @staticmethod
+    def _get_plot_words(documents_words, max_words):
+        """
+        Gets distinct words with vectors of documents, every word belongs to the first document where it is.
+        Only the most frequent words are kept, every document gets the same share of maximal number of words.
+        :return: Tuple of (words sorted by frequency, numpy array of their classes, matrix of their vectors)
+        """
+        word_classes = dict()
+        counts = Counter()
+        vectors = dict()
+        names = dict()
+        for document, words in enumerate(documents_words):
+            for word in words:
+                if word.has_vector and word_classes.setdefault(word.orth, document) == document:
+                    counts[word.orth] += 1
+                    vectors.setdefault(word.orth, word.vector)
+                    names.setdefault(word.orth, str(word))
+
+        per_document = max(1, max_words // len(documents_words))
+        kept = Counter()
+        selected = []
+        for orth, _ in counts.most_common():
+            if kept[word_classes[orth]] < per_document:
+                kept[word_classes[orth]] += 1
+                selected.append(orth)
+
+        return [names[orth] for orth in selected],\
+            np.array([word_classes[orth] for orth in selected], dtype=int),\
+            np.array([vectors[orth] for orth in selected], dtype=np.float32).reshape(len(selected), -1)
+
+    @staticmethod
+    def _export_distances(export_path, words, vectors):
+        """
+        Exports cosine distance matrix of words into '.npz' or '.parquet' file
+        """
+        distance_mat = pairwise_distances(vectors, metric="cosine").astype(np.float32)
+
+        if export_path.endswith(".npz"):
+            np.savez_compressed(export_path, words=np.array(words), distances=distance_mat)
+        elif export_path.endswith(".parquet"):
+            pd.DataFrame(data=distance_mat, index=words, columns=words).to_parquet(export_path)
+        else:
+            raise ValueError("Matici vzdáleností lze exportovat jen do '.npz' nebo '.parquet'")
+
+    @staticmethod
+    def _project_pca(vectors):
+        """
+        Projects vectors into plane by two principal components
+        """
+        centered = vectors - vectors.mean(axis=0)
+        if len(centered) < 2:
+            return np.zeros((len(centered), 2))
+
+        _, _, components = np.linalg.svd(centered, full_matrices=False)
+        pos = centered.dot(components[:2].T)
+
+        return np.hstack((pos, np.zeros((len(pos), 2 - pos.shape[1])))) if pos.shape[1] < 2 else pos
+
+    @staticmethod
+    def _project_landmark_mds(vectors, n_landmarks=300, seed=1):
+        """
+        Projects vectors into plane by landmark MDS - classical MDS of randomly chosen landmarks
+        by cosine distance, other vectors are placed by distance triangulation
+        """
+        unit = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1.0e-12)
+        n_landmarks = min(n_landmarks, len(unit))
+        landmarks = np.random.RandomState(seed).choice(len(unit), n_landmarks, replace=False)
+
+        squared = (1.0 - unit[landmarks].dot(unit[landmarks].T)) ** 2
+        centering = np.eye(n_landmarks) - 1.0 / n_landmarks
+        eigenvalues, eigenvectors = np.linalg.eigh(-0.5 * centering.dot(squared).dot(centering))
+        top = np.argsort(eigenvalues)[::-1][:2]
+        eigenvalues = np.maximum(eigenvalues[top], 1.0e-12)
+
+        pseudo_inverse = eigenvectors[:, top] / np.sqrt(eigenvalues)
+        squared_to_landmarks = (1.0 - unit.dot(unit[landmarks].T)) ** 2
+        pos = -0.5 * (squared_to_landmarks - squared.mean(axis=0)).dot(pseudo_inverse)
+
+        return np.hstack((pos, np.zeros((len(pos), 2 - pos.shape[1])))) if pos.shape[1] < 2 else pos
+
+    @staticmethod
+    def _query_tree(points, queries, k):
+        """
+        Finds k nearest points for every query point by KD-tree
+        :return: Tuple of distances and indices, both with shape (number of queries, k)
+        """
+        distances, indices = cKDTree(points).query(queries, k=k)
+
+        return distances.reshape(len(queries), k), indices.reshape(len(queries), k)
+
     def _tokenize(self):
         """
         Create Latent Dirichlet Allocation tokens
-        :return: List of tokens of Latent Dirichlet Allocation
-        """
-        parser = English()
-        tokens = parser(self.text)
-
-        lda_tokens = []
-        for token in tokens:
-            if token.orth_.isspace():
-                continue
-            elif token.like_url:
-                lda_tokens.append("URL")
-            elif token.orth_.startswith("@"):
-                lda_tokens.append("SCREEN_NAME")
-            else:
-                lda_tokens.append(token.lower_)
-        return lda_tokens
+        :return: Generator of tokens of Latent Dirichlet Allocation
+        """
+        parser = ModelRegistry.get_tokenizer()
+
+        for chunk in self._chunker.split(self.text):
+            for token in parser(chunk.text):
+                if token.orth_.isspace():
+                    continue
+                elif token.like_url:
+                    yield "URL"
+                elif token.orth_.startswith("@"):
+                    yield "SCREEN_NAME"
+                else:
+                    yield token.lower_
+
+    def _map_chunks(self, function):
+        """
+        Applies function to all chunks of current text
+        :param function: Module level function that gets text of one chunk
+        :return: Generator of results for every chunk
+        """
+        return map_chunks(function, self._chunker.split(self.text), self._workers)
 
     @staticmethod
+    @lru_cache(maxsize=LEMMA_CACHE_SIZE)
     def _get_lemma(word):
         """
-        Gets meaning of word.
-        Don't forget to use "nltk.download('wordnet')" before using this method
+        Gets meaning of word. Results are memoized in bounded cache.
+        Don't forget to use "NltkResources.ensure_available()" before using this method
         :param word: Word of which meaning to get
         :return: Meaning of the word
         """
@@ -297,3 +662,81 @@ class NLPService:
             return word
         else:
             return lemma
+
+
+# -----------------
+# Chunk analysis
+# Module level functions, so they can be sent into worker processes. Every function gets text of one chunk
+# and returns only plain data, documents of spaCy are thrown away right after the chunk is analysed.
+# -----------------
+
+def _get_spacy_doc(text):
+    spacy_lang = ModelRegistry.get_spacy_lang(NLPService._WORD_MODEL_NAME)
+    with _SPACY_TIME.time():
+        spacy_doc = spacy_lang(text)
+    _CHARACTERS.inc(len(text))
+    _TOKENS.inc(len(spacy_doc))
+
+    return spacy_doc
+
+
+def _named_entity_recognition_chunk(text):
+    spacy_doc = _get_spacy_doc(text)
+
+    return [(entity.label_, entity.text) for entity in spacy_doc.ents if entity.label_ != "GPE"]
+
+
+def _entity_occurrences_chunk(text):
+    spacy_doc = _get_spacy_doc(text)
+
+    return [(entity.label_, entity.text, entity.start_char, entity.end_char) for entity in spacy_doc.ents
+            if entity.label_ != "GPE"]
+
+
+def _n_grams_chunk(text):
+    doc, processed_text = NLPService.get_textacy_doc(text)
+
+    with _EXTRACTION_TIMES["n_grams"].time():
+        return [str(ngram) for ngram in textacy.extract.ngrams(doc, 3, filter_stops=True,
+                                                               filter_punct=True, filter_nums=False)], processed_text
+
+
+def _named_entity_chunk(text):
+    doc, processed_text = NLPService.get_textacy_doc(text)
+
+    with _EXTRACTION_TIMES["named_entities"].time():
+        return [str(named_entity) for named_entity
+                in textacy.extract.entities(doc, drop_determiners=True)], processed_text
+
+
+def _key_terms_chunk(text, n_key_terms=10):
+    doc, processed_text = NLPService.get_textacy_doc(text)
+    with _EXTRACTION_TIMES["key_terms"].time():
+        key_terms = keyterms.textrank(doc, normalize='lemma',
+                                      n_keyterms=n_key_terms * NLPService.KEY_TERMS_CHUNK_FACTOR)
+
+    return len(doc), key_terms, processed_text
+
+
+def _pos_regex_chunk(text):
+    doc, processed_text = NLPService.get_textacy_doc(text)
+    pattern = textacy.constants.POS_REGEX_PATTERNS['en']['NP']
+
+    with _EXTRACTION_TIMES["pos_regex"].time():
+        return [str(regex_match) for regex_match in textacy.extract.pos_regex_matches(doc, pattern)], len(doc),\
+               keyterms.sgrank(doc, ngrams=(1, 2, 3, 4), normalize='lower', n_keyterms=0.1), processed_text
+
+
+def _bag_of_terms_chunk(text):
+    doc, processed_text = NLPService.get_textacy_doc(text)
+
+    with _EXTRACTION_TIMES["bag_of_terms"].time():
+        return dict(doc._.to_bag_of_terms(ngrams=(1, 2, 3), named_entities=True,
+                                          weighting='count', as_strings=True)), processed_text
+
+
+_PARTIAL_ANALYSES = {
+    "named_entity_recognition": _named_entity_recognition_chunk,
+    "n_grams": _n_grams_chunk,
+    "bag_of_terms": _bag_of_terms_chunk,
+}
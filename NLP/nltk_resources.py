@@ -0,0 +1,86 @@
+# Basic libraries
+import os
+import threading
+# App libraries
+from .lazy_import import lazy_import
+# Third-party libraries
+nltk = lazy_import("nltk")
+
+
+class NltkResources:
+    """
+    Verifies that NLTK data needed by the app are available locally.
+    Verification is done only once per process and never touches network unless downloading is allowed
+    by environment variable NLTK_ALLOW_DOWNLOAD=1.
+    """
+    REQUIRED_RESOURCES = {
+        "stopwords": "corpora/stopwords",
+        "wordnet": "corpora/wordnet",
+    }
+    ALLOW_DOWNLOAD_VARIABLE = "NLTK_ALLOW_DOWNLOAD"
+
+    _verified = False
+    _stop_words = None
+    _lock = threading.Lock()
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    @classmethod
+    def ensure_available(cls):
+        """
+        Checks all required resources, missing ones are downloaded only when it is allowed
+        """
+        if cls._verified:
+            return
+
+        with cls._lock:
+            if cls._verified:
+                return
+
+            missing = [name for name, path in cls.REQUIRED_RESOURCES.items() if not cls._is_available(path)]
+            if missing and cls._is_download_allowed():
+                for name in missing:
+                    nltk.download(name, quiet=True)
+                missing = [name for name in missing if not cls._is_available(cls.REQUIRED_RESOURCES[name])]
+
+            if missing:
+                raise LookupError(f"Chybí data NLTK: {', '.join(missing)}. "
+                                  f"Stáhněte je příkazem 'python -m nltk.downloader {' '.join(missing)}' "
+                                  f"nebo nastavte {cls.ALLOW_DOWNLOAD_VARIABLE}=1.")
+
+            cls._verified = True
+
+    @classmethod
+    def get_stop_words(cls):
+        """
+        Gets english stop words, loaded only once
+        :return: frozenset of stop words
+        """
+        if cls._stop_words is None:
+            cls.ensure_available()
+            cls._stop_words = frozenset(nltk.corpus.stopwords.words('english'))
+
+        return cls._stop_words
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    @staticmethod
+    def _is_available(path):
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            # Corpora may be installed only as zip archives
+            try:
+                nltk.data.find(f"{path}.zip")
+            except LookupError:
+                return False
+
+        return True
+
+    @classmethod
+    def _is_download_allowed(cls):
+        return os.environ.get(cls.ALLOW_DOWNLOAD_VARIABLE, "") == "1"
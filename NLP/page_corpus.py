@@ -0,0 +1,212 @@
+# Basic libraries
+import os
+import json
+# App libraries
+from .lazy_import import lazy_import
+from .nlp_service import NLPService
+# Third-party libraries
+import numpy as np
+# Heavy libraries are imported on first use
+Dictionary = lazy_import("gensim.corpora", "Dictionary")
+
+
+class PageCorpus:
+    """
+    Streamed corpus of crawled pages stored on disk, one document per page.
+    Source is either directory of '.txt' files or JSONL file with 'text' field on every line.
+    Iteration yields token lists and keeps only one page in memory.
+    """
+
+    def __init__(self, source, tokenize=None):
+        """
+        :param source: Path to directory with text files or to JSONL file
+        :param tokenize: Function that gets text and returns list of tokens, LDA tokens of NLPService by default
+        """
+        self._source = source
+        self._tokenize = tokenize if tokenize is not None else self._get_lda_tokens
+
+    def __iter__(self):
+        for text in self.iter_texts():
+            yield self._tokenize(text)
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def iter_texts(self):
+        """
+        Generates raw texts of pages
+        :return: Generator of texts
+        """
+        if os.path.isdir(self._source):
+            for file_name in sorted(os.listdir(self._source)):
+                if file_name.endswith(".txt"):
+                    with open(os.path.join(self._source, file_name), encoding="utf-8") as f:
+                        yield f.read()
+        else:
+            with open(self._source, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)["text"]
+
+    def train_topic_model(self, topic_model_store, name, corpus_path, number_topic=5, passes=1, **pruning):
+        """
+        Trains topic model over all pages of corpus in fixed memory. Corpus is serialized first
+        and then LDA training streams it from disk.
+        :param topic_model_store: TopicModelStore where the model is saved
+        :param name: Name of the model
+        :param corpus_path: Path prefix where serialized corpus is kept
+        :param number_topic: Number of topics
+        :param passes: Number of passes through corpus during training
+        :param pruning: Pruning of vocabulary, see SparseCorpus.build
+        :return: Trained LDA model
+        """
+        corpus, dictionary = SparseCorpus.build(corpus_path, self, **pruning)
+        if not corpus.num_terms:
+            raise ValueError("Korpus neobsahuje žádná slova, téma nelze natrénovat")
+
+        return topic_model_store.train(name, corpus, dictionary, number_topic, passes)
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    @staticmethod
+    def _get_lda_tokens(text):
+        return NLPService(text).get_lda_tokens()
+
+
+class SparseCorpus:
+    """
+    Bag of words corpus serialized as CSR matrix into raw binary files, which are memory-mapped read-only.
+    It can be iterated repeatedly (e.g. by LDA training passes) with constant memory.
+    """
+
+    INDPTR_SUFFIX = ".indptr"
+    INDICES_SUFFIX = ".indices"
+    DATA_SUFFIX = ".data"
+    META_SUFFIX = ".meta.json"
+    DICTIONARY_SUFFIX = ".dictionary"
+
+    def __init__(self, path):
+        """
+        :param path: Path prefix of serialized corpus
+        """
+        with open(path + self.META_SUFFIX, encoding="utf-8") as f:
+            meta = json.load(f)
+
+        self._num_docs = meta["num_docs"]
+        self._num_terms = meta["num_terms"]
+        self._indptr = self._open_memmap(path + self.INDPTR_SUFFIX, np.int64, self._num_docs + 1)
+        self._indices = self._open_memmap(path + self.INDICES_SUFFIX, np.int32, meta["num_nonzero"])
+        self._data = self._open_memmap(path + self.DATA_SUFFIX, np.float32, meta["num_nonzero"])
+
+    def __len__(self):
+        return self._num_docs
+
+    def __iter__(self):
+        for document in range(self._num_docs):
+            yield self[document]
+
+    def __getitem__(self, document):
+        start, end = self._indptr[document], self._indptr[document + 1]
+        return list(zip(self._indices[start:end].tolist(), self._data[start:end].tolist()))
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def num_terms(self):
+        return self._num_terms
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    @classmethod
+    def serialize(cls, path, dictionary, documents):
+        """
+        Writes bag of words of documents on disk one by one
+        :param path: Path prefix of serialized corpus
+        :param dictionary: Gensim dictionary used for bag of words
+        :param documents: Iterable of token lists
+        :return: Memory-mapped SparseCorpus
+        """
+        num_docs = 0
+        num_nonzero = 0
+        with open(path + cls.INDPTR_SUFFIX, "wb") as indptr_file,\
+                open(path + cls.INDICES_SUFFIX, "wb") as indices_file,\
+                open(path + cls.DATA_SUFFIX, "wb") as data_file:
+            indptr_file.write(np.array([0], dtype=np.int64).tobytes())
+            for document in documents:
+                bow = dictionary.doc2bow(document)
+                indices_file.write(np.array([term for term, _ in bow], dtype=np.int32).tobytes())
+                data_file.write(np.array([count for _, count in bow], dtype=np.float32).tobytes())
+                num_nonzero += len(bow)
+                num_docs += 1
+                indptr_file.write(np.array([num_nonzero], dtype=np.int64).tobytes())
+
+        with open(path + cls.META_SUFFIX, "w", encoding="utf-8") as f:
+            json.dump({"num_docs": num_docs, "num_terms": len(dictionary), "num_nonzero": num_nonzero}, f)
+
+        return cls(path)
+
+    @classmethod
+    def build(cls, path, page_corpus, no_below=5, no_above=0.5, keep_n=100000, prune_at=2000000):
+        """
+        Builds dictionary incrementally and serializes corpus of pages. Every page is tokenized only once,
+        tokens are kept in temporary file until vocabulary is pruned. Corpus without pages or with all terms
+        pruned is empty (it has no terms and every page has empty bag of words).
+        :param path: Path prefix of serialized corpus, dictionary is saved next to it
+        :param page_corpus: Iterable of token lists (e.g. PageCorpus)
+        :param no_below: Terms in less documents are removed
+        :param no_above: Terms in more than this fraction of documents are removed
+        :param keep_n: Maximal size of vocabulary
+        :param prune_at: Maximal size of vocabulary during building
+        :return: Tuple of SparseCorpus and its gensim Dictionary
+        """
+        dictionary = Dictionary()
+        tokens_path = path + ".tokens"
+
+        with open(tokens_path, "w", encoding="utf-8") as f:
+            for tokens in page_corpus:
+                dictionary.add_documents([tokens], prune_at=prune_at)
+                f.write(" ".join(tokens) + "\n")
+
+        dictionary.filter_extremes(no_below=no_below, no_above=no_above, keep_n=keep_n)
+        dictionary.save(path + cls.DICTIONARY_SUFFIX)
+
+        try:
+            corpus = cls.serialize(path, dictionary, cls._iter_token_file(tokens_path))
+        finally:
+            os.remove(tokens_path)
+
+        return corpus, dictionary
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads serialized corpus with its dictionary
+        :param path: Path prefix of serialized corpus
+        :return: Tuple of SparseCorpus and its gensim Dictionary
+        """
+        return cls(path), Dictionary.load(path + cls.DICTIONARY_SUFFIX)
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    @staticmethod
+    def _open_memmap(path, dtype, size):
+        # Empty file can not be memory-mapped
+        if not size:
+            return np.zeros(0, dtype=dtype)
+
+        return np.memmap(path, dtype=dtype, mode="r", shape=(size,))
+
+    @staticmethod
+    def _iter_token_file(tokens_path):
+        with open(tokens_path, encoding="utf-8") as f:
+            for line in f:
+                yield line.split()
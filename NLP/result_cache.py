@@ -0,0 +1,163 @@
+# Basic libraries
+import json
+import time
+import pickle
+import sqlite3
+import hashlib
+import inspect
+import threading
+from functools import wraps
+
+
+class AnalysisResultCache:
+    """
+    Persistent cache of analysis results in embedded SQLite database. Results are keyed by hash of text,
+    name of analysis, its parameters and version of models, so any change of them makes a miss.
+    Entries of other model versions are removed on opening and the least recently used entries are evicted
+    when the cache is larger than its limit.
+    """
+
+    DEFAULT_PATH = "analysis_cache.sqlite"
+    # Increment when format of cached results changes (2 - NamedEntity has slots)
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path=DEFAULT_PATH, model_version="", max_bytes=512 * 1024 * 1024):
+        """
+        :param path: Path of database file
+        :param model_version: Version of models producing results, see ModelRegistry.get_model_version
+        :param max_bytes: Maximal size of all cached results
+        """
+        self._model_version = f"{model_version};schema={self.SCHEMA_VERSION}"
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS results ("
+                                     "key TEXT PRIMARY KEY, analysis TEXT, model_version TEXT, "
+                                     "value BLOB, size INTEGER, last_access REAL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+            self._connection.execute("DELETE FROM results WHERE model_version != ?", (self._model_version,))
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def model_version(self):
+        return self._model_version
+
+    @property
+    def size(self):
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def get(self, text, analysis, parameters=None):
+        """
+        Gets cached result
+        :param text: Analysed text
+        :param analysis: Name of analysis
+        :param parameters: JSON serializable parameters of analysis
+        :return: Tuple (True, result) on hit, (False, None) on miss
+        """
+        key = self._get_key(text, analysis, parameters)
+
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False, None
+
+            self._connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+
+        return True, pickle.loads(row[0])
+
+    def put(self, text, analysis, parameters, result):
+        """
+        Saves result into cache and evicts the least recently used results over size limit
+        :param text: Analysed text
+        :param analysis: Name of analysis
+        :param parameters: JSON serializable parameters of analysis
+        :param result: Picklable result
+        """
+        key = self._get_key(text, analysis, parameters)
+        value = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(value) > self._max_bytes:
+            return
+
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                                     (key, analysis, self._model_version, value, len(value), time.time()))
+            self._evict()
+
+    def clear(self):
+        """
+        Removes all cached results
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _get_key(self, text, analysis, parameters):
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        serialized_parameters = json.dumps(parameters, sort_keys=True, default=repr)
+
+        return hashlib.sha256(f"{text_hash}|{analysis}|{serialized_parameters}|{self._model_version}"
+                              .encode("utf-8")).hexdigest()
+
+    def _evict(self):
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+
+        evicted = []
+        for key, size in self._connection.execute("SELECT key, size FROM results ORDER BY last_access"):
+            if total <= self._max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        self._connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+
+def cached_analysis(fn):
+    """
+    Decorator of analysis method which returns cached result when available.
+    Instance has to have attributes '_result_cache' (AnalysisResultCache or None), '_text'
+    and '_cache_parameters' (parameters of instance which change results).
+    Arguments are bound to parameters of the method with defaults, so f(2), f(limit=2) and f() with default
+    limit=2 share one result.
+    """
+    signature = inspect.signature(fn)
+
+    @wraps(fn)
+    def cached_analysis_wrapper(self, *args, **kwargs):
+        if self._result_cache is None:
+            return fn(self, *args, **kwargs)
+
+        bound_arguments = signature.bind(self, *args, **kwargs)
+        bound_arguments.apply_defaults()
+        # The first argument is the instance
+        arguments = dict(list(bound_arguments.arguments.items())[1:])
+
+        analysis = f"{self.__class__.__name__}.{fn.__name__}"
+        parameters = {"arguments": arguments, "instance": self._cache_parameters}
+        hit, result = self._result_cache.get(self._text, analysis, parameters)
+        if hit:
+            return result
+
+        result = fn(self, *args, **kwargs)
+        self._result_cache.put(self._text, analysis, parameters, result)
+        return result
+
+    return cached_analysis_wrapper
@@ -0,0 +1,268 @@
+# Basic libraries
+import heapq
+from collections import Counter
+# App libraries
+from .lazy_import import lazy_import
+from .nlp_service import NLPService
+# Third-party libraries
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix, vstack
+# Heavy libraries are imported on first use
+extract = lazy_import("textacy.similarity", "extract")
+
+
+class DocumentSimilarityEngine:
+    """
+    Finds the most similar documents to a query among many documents by Word Mover's Distance, the same
+    as NLPService.get_word_movers (cosine distance of words divided by the largest distance of both documents).
+    Every document is parsed only once and kept as normalized bag of embeddings (unit word vectors and their
+    relative frequencies) in one contiguous matrix, texts are not kept. Documents are visited best-first
+    by lower bounds of WMD - distance of word centroids, then relaxed WMD - and exact WMD is computed only
+    while a document can still beat the k-th best result, so the result is the exact top k.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, block_documents=64, max_block_elements=4 * 1024 * 1024, embed=None):
+        """
+        :param block_documents: Number of documents which relaxed WMD is computed at once
+        :param max_block_elements: Maximal number of word distances held in memory at once
+        :param embed: Function that gets text and returns tuple (matrix of vectors of distinct words, array of their
+        counts), words of textacy document with vectors by default
+        """
+        self._block_documents = block_documents
+        self._max_block_elements = max_block_elements
+        self._embed = embed if embed is not None else self._embed_words
+
+        self._ids = []
+        self._centroids = None
+        # The largest cosine distance of two words of every document
+        self._max_distances = None
+        self._word_vectors = None
+        self._word_weights = None
+        # Documents words are rows offsets[i]:offsets[i + 1] of word vectors
+        self._offsets = [0]
+
+    def __len__(self):
+        return len(self._ids)
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def add(self, document_id, text):
+        """
+        Adds document to engine
+        :param document_id: Identifier of document returned in results (e.g. URL of page)
+        :param text: Text of document
+        """
+        vectors, weights = self._get_bag_of_embeddings(text)
+        if not len(weights):
+            raise ValueError(f"Dokument '{document_id}' nemá žádná slova s vektory")
+
+        self._append_document(vectors, weights)
+        self._ids.append(document_id)
+
+    def query(self, text, k=5):
+        """
+        Gets documents the most similar to text
+        :param text: Text of query
+        :param k: Number of documents in result
+        :return: List of tuples (document id, word movers similarity) ordered from the most similar
+        """
+        if not self._ids or k <= 0:
+            return []
+
+        vectors, weights = self._get_bag_of_embeddings(text)
+        if not len(weights):
+            return []
+
+        n_documents = len(self._ids)
+        query_max_distance = self._get_max_distance(vectors)
+
+        # Jensen's inequality: WMD of unit vectors with cosine cost (|u - v|^2 / 2) is at least
+        # |centroid difference|^2 / 2, the distance is then divided by at most 2
+        centroid_bounds = np.sum((self._centroids[:n_documents] - weights.dot(vectors)) ** 2, axis=1) / 4
+        order = np.argsort(centroid_bounds, kind="stable")
+        next_document = 0
+
+        # Heap of (lower bound or exact distance, is exact, document)
+        heap = []
+        results = []
+        while len(results) < min(k, n_documents):
+            next_bound = centroid_bounds[order[next_document]] if next_document < n_documents else np.inf
+            if not heap or heap[0][0] > next_bound:
+                candidates = order[next_document:next_document + self._block_documents]
+                next_document += len(candidates)
+                relaxed_bounds = self._get_relaxed_word_movers(vectors, weights, query_max_distance, candidates)
+                for document, bound in zip(candidates.tolist(), relaxed_bounds.tolist()):
+                    heapq.heappush(heap, (bound, False, document))
+                continue
+
+            distance, is_exact, document = heapq.heappop(heap)
+            if is_exact:
+                results.append((self._ids[document], 1.0 - distance))
+            else:
+                heapq.heappush(heap, (self._get_word_movers(vectors, weights, query_max_distance, document),
+                                      True, document))
+
+        return results
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _get_bag_of_embeddings(self, text):
+        """
+        Gets unit vectors of distinct words of text and their relative frequencies
+        """
+        vectors, counts = self._embed(text)
+        if not len(counts):
+            return np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+        matrix = np.array(vectors, dtype=np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1.0e-12)
+        weights = np.asarray(counts, dtype=np.float64)
+
+        return matrix, weights / weights.sum()
+
+    @staticmethod
+    def _embed_words(text):
+        doc, _ = NLPService.get_textacy_doc(text)
+
+        counts = Counter()
+        vectors = {}
+        for word in extract.words(doc):
+            if word.has_vector:
+                counts[word.orth] += 1
+                vectors.setdefault(word.orth, word.vector)
+
+        return [vectors[orth] for orth in counts], [counts[orth] for orth in counts]
+
+    def _append_document(self, vectors, weights):
+        n_documents = len(self._ids)
+        n_words = self._offsets[-1]
+
+        if self._centroids is None:
+            self._centroids = np.zeros((self.INITIAL_CAPACITY, vectors.shape[1]), dtype=np.float32)
+            self._max_distances = np.zeros(self.INITIAL_CAPACITY, dtype=np.float64)
+            self._word_vectors = np.zeros((self.INITIAL_CAPACITY, vectors.shape[1]), dtype=np.float32)
+            self._word_weights = np.zeros(self.INITIAL_CAPACITY, dtype=np.float64)
+
+        if n_documents == len(self._centroids):
+            self._centroids = self._grow(self._centroids, n_documents + 1)
+            self._max_distances = self._grow(self._max_distances, n_documents + 1)
+        if n_words + len(weights) > len(self._word_weights):
+            self._word_vectors = self._grow(self._word_vectors, n_words + len(weights))
+            self._word_weights = self._grow(self._word_weights, n_words + len(weights))
+
+        self._centroids[n_documents] = weights.dot(vectors)
+        self._max_distances[n_documents] = self._get_max_distance(vectors)
+        self._word_vectors[n_words:n_words + len(weights)] = vectors
+        self._word_weights[n_words:n_words + len(weights)] = weights
+        self._offsets.append(n_words + len(weights))
+
+    @staticmethod
+    def _grow(array, minimal_length):
+        """
+        Doubles capacity of array until it has at least minimal length
+        """
+        length = len(array)
+        while length < minimal_length:
+            length *= 2
+
+        grown = np.zeros((length,) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def _get_block_rows(self, n_columns):
+        # Number of rows of distance block, so the block has at most max_block_elements
+        return max(1, self._max_block_elements // max(1, n_columns))
+
+    def _get_max_distance(self, vectors):
+        """
+        Gets the largest cosine distance of two words, computed in blocks
+        """
+        max_distance = 0.0
+        block_rows = self._get_block_rows(len(vectors))
+        for start in range(0, len(vectors), block_rows):
+            max_distance = max(max_distance, float(1.0 - vectors[start:start + block_rows].dot(vectors.T).min()))
+
+        return max_distance
+
+    def _get_relaxed_word_movers(self, vectors, weights, query_max_distance, candidates):
+        """
+        Computes relaxed Word Mover's Distance (lower bound of exact one) for candidates. Every word moves all
+        its weight to the nearest word of the other document, larger of both directions is the bound.
+        Distances of words are computed in blocks of candidate words, so memory stays bounded for long pages.
+        """
+        offsets = np.asarray(self._offsets)
+        starts, ends = offsets[candidates], offsets[candidates + 1]
+        rows = np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+        # Index of candidate of every gathered row
+        segments = np.repeat(np.arange(len(candidates)), ends - starts)
+
+        query_minimums = np.full((len(weights), len(candidates)), np.inf)
+        documents_to_query = np.zeros(len(candidates))
+        cross_max_distances = np.zeros(len(candidates))
+
+        block_rows = self._get_block_rows(len(weights))
+        for block_start in range(0, len(rows), block_rows):
+            block = slice(block_start, block_start + block_rows)
+            block_segments = segments[block]
+            distances = 1.0 - vectors.dot(self._word_vectors[rows[block]].T).astype(np.float64)
+
+            segment_starts = np.flatnonzero(np.diff(block_segments, prepend=-1))
+            block_candidates = block_segments[segment_starts]
+            query_minimums[:, block_candidates] = np.minimum(
+                query_minimums[:, block_candidates], np.minimum.reduceat(distances, segment_starts, axis=1))
+            cross_max_distances[block_candidates] = np.maximum(
+                cross_max_distances[block_candidates], np.maximum.reduceat(distances.max(axis=0), segment_starts))
+            np.add.at(documents_to_query, block_segments, self._word_weights[rows[block]] * distances.min(axis=0))
+
+        max_distances = np.maximum(np.maximum(cross_max_distances, self._max_distances[candidates]),
+                                   query_max_distance)
+        relaxed = np.maximum(weights.dot(query_minimums), documents_to_query)
+
+        return np.where(max_distances > 0, relaxed / np.where(max_distances > 0, max_distances, 1.0), 0.0)
+
+    def _get_word_movers(self, vectors, weights, query_max_distance, document):
+        """
+        Computes exact Word Mover's Distance of query and document from stored word vectors
+        """
+        start, end = self._offsets[document], self._offsets[document + 1]
+        distances = np.maximum(1.0 - vectors.dot(self._word_vectors[start:end].T).astype(np.float64), 0.0)
+        max_distance = max(query_max_distance, self._max_distances[document], float(distances.max()))
+        if max_distance <= 0:
+            return 0.0
+
+        return get_earth_movers_distance(weights, self._word_weights[start:end], distances / max_distance)
+
+
+def get_earth_movers_distance(source_weights, target_weights, costs):
+    """
+    Solves transportation problem of Earth Mover's Distance by linear programming
+    :param source_weights: Weights of source points, they sum to 1
+    :param target_weights: Weights of target points, they sum to 1
+    :param costs: Matrix of costs of moving unit of weight from source point (row) to target point (column)
+    :return: Minimal total cost
+    """
+    n_sources, n_targets = costs.shape
+    variables = np.arange(n_sources * n_targets)
+    # Flow from source i to target j is variable i * n_targets + j
+    source_sums = coo_matrix((np.ones(len(variables)), (variables // n_targets, variables)),
+                             shape=(n_sources, len(variables)))
+    target_sums = coo_matrix((np.ones(len(variables)), (variables % n_targets, variables)),
+                             shape=(n_targets, len(variables)))
+    target_weights = np.asarray(target_weights, dtype=np.float64)
+    source_weights = np.asarray(source_weights, dtype=np.float64)
+    # Both sides are normalized again, so the problem is feasible despite rounding
+    result = linprog(costs.ravel(), A_eq=vstack([source_sums, target_sums]).tocsr(),
+                     b_eq=np.concatenate((source_weights / source_weights.sum(),
+                                          target_weights / target_weights.sum())),
+                     bounds=(0, None), method="highs")
+    if not result.success:
+        raise RuntimeError(f"Word Mover's Distance nelze spočítat: {result.message}")
+
+    return float(result.fun)
@@ -0,0 +1,126 @@
+# Basic libraries
+import re
+# App libraries
+from .text_chunking import SENTENCE_REGEX
+from .lazy_import import lazy_import
+# Third-party libraries
+import numpy as np
+TfidfVectorizer = lazy_import("sklearn.feature_extraction.text", "TfidfVectorizer")
+
+
+LINE_REGEX = re.compile(r"\n+")
+
+
+class TextRankSummarizer:
+    """
+    Extractive summarization by TextRank. Sentences are vertices of graph weighted by cosine similarity
+    of their TF-IDF vectors. The similarity matrix is never built, every PageRank iteration is done
+    by two sparse matrix-vector products, so the cost is linear in the size of text.
+    """
+
+    def __init__(self, damping=0.85, tolerance=1.0e-6, max_iterations=100):
+        """
+        :param damping: Damping factor of PageRank
+        :param tolerance: Iteration stops when scores change less than this (L1 norm)
+        :param max_iterations: Maximal number of PageRank iterations
+        """
+        self._damping = damping
+        self._tolerance = tolerance
+        self._max_iterations = max_iterations
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def summarize(self, text=None, doc=None, ratio=0.2, word_count=None):
+        """
+        Gets the most important sentences in their original order
+        :param text: Text to summarize, used when doc is not defined
+        :param doc: spaCy Doc with sentence boundaries, its sentences are reused
+        :param ratio: Fraction of sentences in result
+        :param word_count: Maximal number of words in result, takes precedence over ratio
+        :return: Summarized text, one sentence per line
+        """
+        sentences = self.get_doc_sentences(doc) if doc is not None else self.split_sentences(text)
+        if not sentences:
+            return ""
+
+        scores = self.rank_sentences(sentences)
+        selected = self._select(sentences, np.argsort(-scores, kind="stable"), ratio, word_count)
+
+        return "\n".join([sentences[i] for i in sorted(selected)])
+
+    def rank_sentences(self, sentences):
+        """
+        Scores sentences by PageRank over their similarity graph
+        :param sentences: List of sentences
+        :return: Numpy array of scores
+        """
+        n_sentences = len(sentences)
+        try:
+            # Rows are L2 normalized, so similarity of two sentences is dot product of their rows
+            tf_idf = TfidfVectorizer(stop_words="english").fit_transform(sentences).tocsr()
+        except ValueError:
+            # There are no terms at all (e.g. only stop words)
+            return np.full(n_sentences, 1.0 / n_sentences)
+
+        tf_idf_t = tf_idf.T.tocsr()
+        # Similarity of sentence with itself is not an edge of the graph
+        self_similarity = np.asarray(tf_idf.multiply(tf_idf).sum(axis=1)).ravel()
+        degree = tf_idf.dot(tf_idf_t.dot(np.ones(n_sentences))) - self_similarity
+        has_edges = degree > 1.0e-12
+        inverse_degree = np.zeros(n_sentences)
+        inverse_degree[has_edges] = 1.0 / degree[has_edges]
+
+        scores = np.full(n_sentences, 1.0 / n_sentences)
+        for _ in range(self._max_iterations):
+            weighted = scores * inverse_degree
+            propagated = tf_idf.dot(tf_idf_t.dot(weighted)) - self_similarity * weighted
+            # Score of sentences without edges is spread evenly to keep the sum of scores
+            dangling = scores[~has_edges].sum() / n_sentences
+            new_scores = (1.0 - self._damping) / n_sentences + self._damping * (propagated + dangling)
+
+            if np.abs(new_scores - scores).sum() < self._tolerance:
+                return new_scores
+            scores = new_scores
+
+        return scores
+
+    @staticmethod
+    def split_sentences(text):
+        """
+        Splits text into sentences at lines and sentence ending punctuation
+        :param text: Text to split
+        :return: List of sentences
+        """
+        return [sentence.strip() for line in LINE_REGEX.split(text) for sentence in SENTENCE_REGEX.split(line)
+                if sentence.strip()]
+
+    @staticmethod
+    def get_doc_sentences(doc):
+        """
+        Gets sentences of spaCy Doc
+        :param doc: spaCy Doc with sentence boundaries
+        :return: List of sentences
+        """
+        return [sentence.text.strip() for sentence in doc.sents if sentence.text.strip()]
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    @staticmethod
+    def _select(sentences, ranking, ratio, word_count):
+        if word_count is None:
+            return ranking[:max(1, int(len(sentences) * ratio))]
+
+        selected = []
+        words = 0
+        for i in ranking:
+            sentence_words = len(sentences[i].split())
+            if selected and words + sentence_words > word_count:
+                break
+            selected.append(i)
+            words += sentence_words
+
+        return selected
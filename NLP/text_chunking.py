@@ -0,0 +1,189 @@
+# Basic libraries
+import re
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+# App libraries
+from .model_registry import ModelRegistry
+
+TextChunk = namedtuple("TextChunk", ("start", "text"))
+
+PARAGRAPH_REGEX = re.compile(r"\n\s*\n")
+SENTENCE_REGEX = re.compile(r"(?<=[.!?])\s+")
+WORD_REGEX = re.compile(r"\S+")
+
+
+class TextChunker:
+    """
+    Splits long text into bounded windows at paragraph or sentence boundaries.
+    Windows are generated lazily, so only one window has to be processed at a time.
+    """
+
+    DEFAULT_MAX_LENGTH = 100000
+
+    def __init__(self, max_length=DEFAULT_MAX_LENGTH):
+        if max_length <= 0:
+            raise ValueError("Maximal length of chunk has to be positive")
+
+        self._max_length = max_length
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def max_length(self):
+        return self._max_length
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def needs_chunking(self, text):
+        """
+        Checks whether text is longer than one window
+        :param text: Text to check
+        :return: True if text has to be split
+        """
+        return len(text) > self._max_length
+
+    def split(self, text):
+        """
+        Splits text into windows not longer than maximal length.
+        Paragraphs are kept together when possible, then sentences, then words.
+        :param text: Text to split
+        :return: Generator of TextChunk with offset of the window in original text and its text
+        """
+        window_start = None
+        window_end = None
+
+        for start, end in self._iter_pieces(text):
+            if window_start is not None and end - window_start > self._max_length:
+                yield TextChunk(window_start, text[window_start:window_end])
+                window_start = None
+
+            if window_start is None:
+                window_start = start
+            window_end = end
+
+        if window_start is not None:
+            yield TextChunk(window_start, text[window_start:window_end])
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _iter_pieces(self, text):
+        """
+        Generates (start, end) offsets of pieces not longer than maximal length
+        """
+        for start, end in self._iter_spans(text, PARAGRAPH_REGEX, 0, len(text)):
+            if end - start <= self._max_length:
+                yield start, end
+                continue
+
+            for sentence_start, sentence_end in self._iter_spans(text, SENTENCE_REGEX, start, end):
+                if sentence_end - sentence_start <= self._max_length:
+                    yield sentence_start, sentence_end
+                else:
+                    yield from self._iter_words(text, sentence_start, sentence_end)
+
+    def _iter_words(self, text, start, end):
+        """
+        Splits too long sentence into words, a single too long word is cut hard
+        """
+        for match in WORD_REGEX.finditer(text, start, end):
+            for piece_start in range(match.start(), match.end(), self._max_length):
+                yield piece_start, min(piece_start + self._max_length, match.end())
+
+    @staticmethod
+    def _iter_spans(text, separator, start, end):
+        """
+        Generates spans between separators in text[start:end] (separators are not part of spans)
+        """
+        span_start = start
+        for match in separator.finditer(text, start, end):
+            if match.start() > span_start:
+                yield span_start, match.start()
+            span_start = match.end()
+
+        if end > span_start:
+            yield span_start, end
+
+
+# -----------------
+# Processing of chunks
+# -----------------
+
+def map_chunks(function, chunks, workers=1):
+    """
+    Applies function to every chunk, optionally in worker processes.
+    At most two chunks per worker are in flight, so memory stays bounded for any number of chunks.
+    :param function: Module level function (has to be picklable) that gets text of chunk
+    :param chunks: Iterable of TextChunk
+    :param workers: Number of worker processes, 1 means processing in current process
+    :return: Generator of function results in the order of chunks
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield function(chunk.text)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=ModelRegistry.attach_shared_vectors,
+                             initargs=(ModelRegistry.get_shared_vectors_directory(),)) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk.text))
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+
+        for future in pending:
+            yield future.result()
+
+
+# -----------------
+# Merging of partial results
+# -----------------
+
+def merge_sets(partial_results):
+    """
+    Merges iterables of hashable items (e.g. named entities) into one set
+    :param partial_results: Iterable of iterables
+    :return: Set of all items
+    """
+    merged = set()
+    for partial_result in partial_results:
+        merged.update(partial_result)
+    return merged
+
+
+def merge_counts(partial_results):
+    """
+    Sums counts of the same keys (e.g. n-grams or bag of terms)
+    :param partial_results: Iterable of dictionaries key -> count
+    :return: Counter with summed counts
+    """
+    merged = Counter()
+    for partial_result in partial_results:
+        merged.update(partial_result)
+    return merged
+
+
+def merge_ranked_terms(partial_results, n_terms=None):
+    """
+    Re-ranks terms ranked separately in chunks. Score of a term is average of its chunk scores
+    weighted by chunk size, chunks where the term was not ranked contribute by zero.
+    :param partial_results: Iterable of tuples (chunk weight, iterable of (term, score))
+    :param n_terms: Number of terms in result, None means all of them
+    :return: List of (term, score) ordered from the best
+    """
+    scores = Counter()
+    total_weight = 0
+    for weight, ranked_terms in partial_results:
+        total_weight += weight
+        for term, score in ranked_terms:
+            scores[term] += score * weight
+
+    if not total_weight:
+        return []
+
+    return [(term, score / total_weight) for term, score in scores.most_common(n_terms)]
@@ -0,0 +1,229 @@
+# Basic libraries
+import os
+import uuid
+import shutil
+import threading
+# App libraries
+from .lazy_import import lazy_import
+# Third-party libraries
+Dictionary = lazy_import("gensim.corpora", "Dictionary")
+LdaModel = lazy_import("gensim.models.ldamodel", "LdaModel")
+LdaMulticore = lazy_import("gensim.models.ldamulticore", "LdaMulticore")
+
+
+class TopicModelStore:
+    """
+    Directory of trained LDA topic models. Every model is trained once, saved with its dictionary
+    and then only loaded (memory-mapped) for inference or updated online with new documents.
+    Every save writes a new version folder of the model and then switches file CURRENT to it by atomic
+    replace, so files memory-mapped by other instances are never overwritten. The least recently used
+    models are removed when there are more than max_models of them.
+    """
+
+    DEFAULT_DIRECTORY = "topic_models"
+    DEFAULT_MAX_MODELS = 100
+    MODEL_FILE = "model.gensim"
+    DICTIONARY_FILE = "dictionary.gensim"
+    CURRENT_FILE = "CURRENT"
+
+    # Path of model -> lock held across loading, updating and saving of the model, shared by all instances
+    _model_locks = {}
+    _model_locks_lock = threading.Lock()
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, workers=None, max_models=DEFAULT_MAX_MODELS):
+        """
+        :param directory: Directory where models are stored
+        :param workers: Number of worker processes for training, None means number of CPUs - 1
+        :param max_models: Maximal number of stored models, None means no limit
+        """
+        self._directory = directory
+        self._workers = workers
+        self._max_models = max_models
+        self._models = {}
+        self._lock = threading.Lock()
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def directory(self):
+        return self._directory
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def has_model(self, name):
+        """
+        Checks whether model is already trained
+        :param name: Name of the model
+        :return: True if model exists
+        """
+        return name in self._models or self._get_version_path(name) is not None
+
+    def train(self, name, corpus, dictionary, number_topic=5, passes=15):
+        """
+        Trains new model on multiple cores and saves it into the store
+        :param name: Name of the model
+        :param corpus: Re-iterable bag of words corpus
+        :param dictionary: Gensim dictionary of the corpus
+        :param number_topic: Number of topics
+        :param passes: Number of passes through corpus during training
+        :return: Trained LDA model
+        """
+        lda_model = LdaMulticore(corpus, num_topics=number_topic, id2word=dictionary,
+                                 passes=passes, workers=self._workers)
+        self._save(name, lda_model, dictionary)
+        self._evict(keep=name)
+
+        return lda_model
+
+    def get_or_train(self, name, corpus, dictionary, number_topic=5, passes=15):
+        """
+        Gets model from the store, trains it only if it does not exist yet
+        :return: LDA model
+        """
+        if self.has_model(name):
+            return self.load(name)[0]
+
+        return self.train(name, corpus, dictionary, number_topic, passes)
+
+    def load(self, name):
+        """
+        Loads model with its dictionary, large arrays of the model are memory-mapped read-only
+        :param name: Name of the model
+        :return: Tuple of LDA model and its dictionary
+        """
+        loaded = self._models.get(name)
+        if loaded is not None:
+            return loaded
+
+        # Version folder cannot be replaced by save of this process during loading
+        with self._get_model_lock(name):
+            loaded = self._models.get(name)
+            if loaded is None:
+                path = self._get_version_path(name)
+                if path is None:
+                    raise FileNotFoundError(f"Model '{name}' neexistuje")
+                loaded = (LdaModel.load(os.path.join(path, self.MODEL_FILE), mmap='r'),
+                          Dictionary.load(os.path.join(path, self.DICTIONARY_FILE)))
+                with self._lock:
+                    self._models[name] = loaded
+                self._touch(name)
+
+            return loaded
+
+    def update(self, name, documents):
+        """
+        Updates model online with new documents (e.g. from newly crawled pages).
+        Words unknown to the model dictionary are ignored.
+        :param name: Name of the model
+        :param documents: Iterable of token lists
+        :return: Updated LDA model
+        """
+        with self._get_model_lock(name):
+            path = self._get_version_path(name)
+            if path is None:
+                raise FileNotFoundError(f"Model '{name}' neexistuje")
+            lda_model = LdaModel.load(os.path.join(path, self.MODEL_FILE))
+            dictionary = Dictionary.load(os.path.join(path, self.DICTIONARY_FILE))
+
+            lda_model.update([dictionary.doc2bow(document) for document in documents])
+            self._save(name, lda_model, dictionary)
+        self._evict(keep=name)
+
+        return lda_model
+
+    def get_document_topics(self, name, tokens, minimum_probability=None):
+        """
+        Assigns topics to a new document without any training
+        :param name: Name of the model
+        :param tokens: Tokens of the document
+        :param minimum_probability: Topics with lower probability are left out
+        :return: List of (topic id, probability)
+        """
+        lda_model, dictionary = self.load(name)
+
+        return lda_model.get_document_topics(dictionary.doc2bow(tokens), minimum_probability=minimum_probability)
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _save(self, name, lda_model, dictionary):
+        with self._get_model_lock(name):
+            version = uuid.uuid4().hex
+            os.makedirs(self._get_path(name, version))
+            lda_model.save(self._get_path(name, version, self.MODEL_FILE))
+            dictionary.save(self._get_path(name, version, self.DICTIONARY_FILE))
+
+            previous_version = self._get_current_version(name)
+            temporary_path = self._get_path(name, f"{self.CURRENT_FILE}.{version}")
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                f.write(version)
+            os.replace(temporary_path, self._get_path(name, self.CURRENT_FILE))
+
+            with self._lock:
+                self._models[name] = (lda_model, dictionary)
+
+            # Mapped files of previous version stay valid until they are unmapped (on Windows removal fails)
+            if previous_version is not None:
+                shutil.rmtree(self._get_path(name, previous_version), ignore_errors=True)
+
+    def _evict(self, keep):
+        """
+        Removes the least recently used models above max_models, it must not be called with a model lock held
+        :param keep: Name of model which is never removed (just saved)
+        """
+        if self._max_models is None or not os.path.isdir(self._directory):
+            return
+
+        models = []
+        for name in os.listdir(self._directory):
+            try:
+                models.append((os.path.getmtime(self._get_path(name, self.CURRENT_FILE)), name))
+            except OSError:
+                continue
+
+        models.sort(reverse=True)
+        for _, name in models[self._max_models:]:
+            if name == keep:
+                continue
+            with self._get_model_lock(name):
+                with self._lock:
+                    self._models.pop(name, None)
+                shutil.rmtree(self._get_path(name), ignore_errors=True)
+
+    def _touch(self, name):
+        # Time of last use of model for eviction
+        try:
+            os.utime(self._get_path(name, self.CURRENT_FILE))
+        except OSError:
+            pass
+
+    def _get_current_version(self, name):
+        try:
+            with open(self._get_path(name, self.CURRENT_FILE), encoding="utf-8") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _get_version_path(self, name):
+        """
+        :return: Folder of current version of model or None when model does not exist
+        """
+        version = self._get_current_version(name)
+        if version is None:
+            return None
+
+        path = self._get_path(name, version)
+        return path if os.path.isfile(os.path.join(path, self.MODEL_FILE)) else None
+
+    def _get_model_lock(self, name):
+        key = os.path.abspath(self._get_path(name))
+        with TopicModelStore._model_locks_lock:
+            return TopicModelStore._model_locks.setdefault(key, threading.RLock())
+
+    def _get_path(self, name, *parts):
+        return os.path.join(self._directory, name, *parts)
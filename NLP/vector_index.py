@@ -0,0 +1,264 @@
+# Basic libraries
+import os
+import json
+# Third-party libraries
+import numpy as np
+
+
+class VectorIndex:
+    """
+    Approximate nearest neighbour index of vectors by cosine similarity (inverted file - IVF).
+    Vectors are clustered around centroids trained by spherical k-means and a query searches only
+    vectors of the nearest clusters. Number of clusters and number of probed clusters give tradeoff
+    between recall and latency. Until the index is trained it searches exactly. The index is trained when
+    it has n_lists * 4 vectors and retrained whenever it grows RETRAINING_GROWTH times since the last training,
+    so clusters follow the inserted data.
+    """
+
+    INITIAL_CAPACITY = 1024
+    TRAINING_ITERATIONS = 10
+    MAXIMAL_TRAINING_SAMPLE = 50000
+    # Index is retrained when number of its vectors grows this many times since the last training
+    RETRAINING_GROWTH = 4
+
+    VECTORS_FILE = "vectors.npy"
+    LISTS_FILE = "lists.npy"
+    CENTROIDS_FILE = "centroids.npy"
+    KEYS_FILE = "keys.json"
+    META_FILE = "meta.json"
+
+    def __init__(self, dimension, n_lists=256, n_probe=8, seed=1):
+        """
+        :param dimension: Dimension of vectors
+        :param n_lists: Number of clusters, more clusters means faster but less accurate search
+        :param n_probe: Number of searched clusters, more probed clusters means slower but more accurate search
+        :param seed: Seed of random generator used by training
+        """
+        self._check_n_probe(n_probe)
+        self._dimension = dimension
+        self._n_lists = n_lists
+        self._n_probe = n_probe
+        self._seed = seed
+
+        self._keys = []
+        self._key_set = None
+        self._vectors = np.zeros((self.INITIAL_CAPACITY, dimension), dtype=np.float32)
+        # Cluster of every vector, -1 while the index is not trained
+        self._lists = np.full(self.INITIAL_CAPACITY, -1, dtype=np.int32)
+        self._centroids = None
+        # Number of vectors the clusters were trained on
+        self._trained_size = 0
+        self._inverted_lists = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def dimension(self):
+        return self._dimension
+
+    @property
+    def is_trained(self):
+        return self._centroids is not None
+
+    @property
+    def n_probe(self):
+        return self._n_probe
+
+    @n_probe.setter
+    def n_probe(self, value):
+        self._check_n_probe(value)
+        self._n_probe = value
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def contains(self, key):
+        """
+        Checks whether key is already in index
+        :param key: Key of vector
+        :return: True if key is in index
+        """
+        if self._key_set is None:
+            self._key_set = set(self._keys)
+
+        return key in self._key_set
+
+    def add(self, keys, vectors):
+        """
+        Inserts vectors into index. Index is trained automatically when it has enough vectors and retrained
+        when it grows RETRAINING_GROWTH times since the last training, see needs_training.
+        :param keys: Keys of vectors returned by queries (e.g. URL of page or term)
+        :param vectors: Matrix of vectors, one row per key
+        """
+        vectors = self._normalize(vectors)
+        start = len(self._keys)
+        end = start + len(vectors)
+
+        if end > len(self._vectors):
+            capacity = max(len(self._vectors), self.INITIAL_CAPACITY)
+            while capacity < end:
+                capacity *= 2
+            self._vectors = self._resize(self._vectors, capacity, 0)
+            self._lists = self._resize(self._lists, capacity, -1)
+
+        self._vectors[start:end] = vectors
+        self._keys.extend(keys)
+        if self._key_set is not None:
+            self._key_set.update(keys)
+
+        if self.needs_training():
+            self.train()
+        elif self.is_trained:
+            self._assign(start, end)
+
+    def needs_training(self):
+        """
+        Checks whether index has enough vectors for its first training or grew enough since the last one
+        :return: True if index should be (re)trained
+        """
+        if not self.is_trained:
+            return len(self._keys) >= self._n_lists * 4
+
+        return len(self._keys) >= self._trained_size * self.RETRAINING_GROWTH
+
+    def train(self):
+        """
+        Trains clusters on vectors inserted so far and assigns all vectors into them. It can be called
+        explicitly (e.g. after inserting many vectors into loaded index), costs one pass of k-means over
+        at most MAXIMAL_TRAINING_SAMPLE vectors and assignment of all vectors.
+        """
+        if not self._keys:
+            raise ValueError("Index neobsahuje žádné vektory, nelze jej natrénovat")
+
+        vectors = self._vectors[:len(self._keys)]
+        generator = np.random.RandomState(self._seed)
+        if len(vectors) > self.MAXIMAL_TRAINING_SAMPLE:
+            vectors = vectors[generator.choice(len(vectors), self.MAXIMAL_TRAINING_SAMPLE, replace=False)]
+
+        n_lists = min(self._n_lists, len(vectors))
+        centroids = vectors[generator.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(self.TRAINING_ITERATIONS):
+            assignments = vectors.dot(centroids.T).argmax(axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            # Empty clusters keep their previous centroid
+            non_empty = np.bincount(assignments, minlength=n_lists) > 0
+            centroids[non_empty] = self._normalize(sums[non_empty])
+
+        self._centroids = centroids
+        self._trained_size = len(self._keys)
+        self._assign(0, len(self._keys))
+
+    def query(self, vector, k=10, n_probe=None):
+        """
+        Gets nearest vectors by cosine similarity
+        :param vector: Query vector
+        :param k: Number of results
+        :param n_probe: Number of searched clusters, default of index is used when not defined
+        :return: List of tuples (key, cosine similarity) ordered from the most similar
+        """
+        if n_probe is not None:
+            self._check_n_probe(n_probe)
+        if not self._keys:
+            return []
+
+        vector = self._normalize(np.asarray(vector, dtype=np.float32)[np.newaxis, :])[0]
+        candidates = self._get_candidates(vector, n_probe if n_probe is not None else self._n_probe)
+        if not len(candidates):
+            return []
+
+        similarities = self._vectors[candidates].dot(vector)
+        if k < len(similarities):
+            best = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            best = np.arange(len(similarities))
+        best = best[np.argsort(-similarities[best], kind="stable")]
+
+        return [(self._keys[candidates[i]], float(similarities[i])) for i in best]
+
+    def save(self, directory):
+        """
+        Saves index into directory, keys are saved in their own file, so metadata stays small
+        :param directory: Directory of index
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, self.VECTORS_FILE), self._vectors[:len(self._keys)])
+        np.save(os.path.join(directory, self.LISTS_FILE), self._lists[:len(self._keys)])
+        if self.is_trained:
+            np.save(os.path.join(directory, self.CENTROIDS_FILE), self._centroids)
+
+        with open(os.path.join(directory, self.KEYS_FILE), "w", encoding="utf-8") as f:
+            json.dump(self._keys, f)
+        with open(os.path.join(directory, self.META_FILE), "w", encoding="utf-8") as f:
+            json.dump({"dimension": self._dimension, "n_lists": self._n_lists, "n_probe": self._n_probe,
+                       "seed": self._seed, "trained_size": self._trained_size}, f)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Loads index from directory. Vectors are memory-mapped read-only, they are copied into memory
+        only when new vectors are inserted.
+        :param directory: Directory of index
+        :return: VectorIndex
+        """
+        with open(os.path.join(directory, cls.META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        index = cls(meta["dimension"], meta["n_lists"], meta["n_probe"], meta["seed"])
+        index._trained_size = meta["trained_size"]
+        with open(os.path.join(directory, cls.KEYS_FILE), encoding="utf-8") as f:
+            index._keys = json.load(f)
+        index._vectors = np.load(os.path.join(directory, cls.VECTORS_FILE), mmap_mode="r")
+        index._lists = np.load(os.path.join(directory, cls.LISTS_FILE))
+
+        centroids_path = os.path.join(directory, cls.CENTROIDS_FILE)
+        if os.path.isfile(centroids_path):
+            index._centroids = np.load(centroids_path)
+
+        return index
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _assign(self, start, end):
+        self._lists[start:end] = self._vectors[start:end].dot(self._centroids.T).argmax(axis=1)
+        self._inverted_lists = None
+
+    def _get_candidates(self, vector, n_probe):
+        n_keys = len(self._keys)
+        if not self.is_trained or n_probe >= len(self._centroids):
+            return np.arange(n_keys)
+
+        if self._inverted_lists is None:
+            # Vectors sorted by their cluster, cluster c is segment bounds[c]:bounds[c + 1]
+            order = np.argsort(self._lists[:n_keys], kind="stable")
+            bounds = np.searchsorted(self._lists[:n_keys][order], np.arange(len(self._centroids) + 1))
+            self._inverted_lists = (order, bounds)
+
+        order, bounds = self._inverted_lists
+        probed = np.argpartition(-self._centroids.dot(vector), n_probe - 1)[:n_probe]
+
+        return np.concatenate([order[bounds[c]:bounds[c + 1]] for c in probed])
+
+    @staticmethod
+    def _check_n_probe(n_probe):
+        if n_probe < 1:
+            raise ValueError(f"Počet prohledávaných shluků musí být alespoň 1, zadáno {n_probe}")
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1.0e-12)
+
+    @staticmethod
+    def _resize(array, capacity, fill_value):
+        resized = np.full((capacity,) + array.shape[1:], fill_value, dtype=array.dtype)
+        resized[:len(array)] = array
+        return resized
@@ -0,0 +1,87 @@
+# Basic libraries
+from functools import partial
+# App libraries
+from CLI.batch_runner import ANALYSES
+from NLP.model_registry import ModelRegistry
+from NLP.nlp_service import NLPService
+from WebParsing.web_parser import WebParser
+from .pipeline_runner import PipelineRunner, Stage
+
+
+def fetch_page(url):
+    """
+    Downloads page, pages which are not valid HTML URLs are dropped. Content type is checked in headers
+    of the response, so no extra request is made.
+    :param url: URL of page
+    :return: HTML of page or None
+    """
+    if not WebParser.is_url_valid(url):
+        return None
+
+    return WebParser.fetch_html(url, html_only=True)
+
+
+def parse_page(html):
+    """
+    Parses downloaded page
+    :param html: HTML of page
+    :return: WebParser with loaded page
+    """
+    return WebParser.from_html(html)
+
+
+def extract_content(web_parser):
+    """
+    Gets text of parsed page, empty pages are dropped
+    :param web_parser: WebParser with loaded page
+    :return: Text of page or None
+    """
+    text = web_parser.get_all_text()
+    return text if text.strip() else None
+
+
+def analyze_text(text, analysis):
+    """
+    Runs NLP analysis on text
+    :param text: Text of page
+    :param analysis: Name of analysis, key of ANALYSES of batch runner
+    :return: Tuple (list of result lines, processed text)
+    """
+    return ANALYSES[analysis](NLPService(text))
+
+
+def create_crawl_pipeline(analysis, sink, fetch_workers=8, parse_workers=2, extract_workers=1, nlp_workers=2,
+                          queue_size=64):
+    """
+    Creates pipeline fetch -> parse -> content extraction -> NLP -> sink. NLP stage runs in worker processes.
+    :param analysis: Name of analysis, key of ANALYSES of batch runner (e.g. 'n-grams')
+    :param sink: Function called with URL and result of analysis of every page
+    :param fetch_workers: Number of threads downloading pages
+    :param parse_workers: Number of threads parsing pages
+    :param extract_workers: Number of threads extracting text of pages
+    :param nlp_workers: Number of NLP worker processes
+    :param queue_size: Maximal number of pages waiting between two stages
+    :return: PipelineRunner, its 'run' method gets iterable of (URL, URL)
+    """
+    if analysis not in ANALYSES:
+        raise ValueError(f"Neznámá analýza '{analysis}', dostupné: {', '.join(ANALYSES)}")
+
+    return PipelineRunner([Stage("fetch", fetch_page, fetch_workers),
+                           Stage("parse", parse_page, parse_workers),
+                           Stage("extract", extract_content, extract_workers),
+                           Stage("nlp", partial(analyze_text, analysis=analysis), nlp_workers, processes=True,
+                                 initializer=ModelRegistry.attach_shared_vectors,
+                                 initargs=(ModelRegistry.get_shared_vectors_directory(),))],
+                          sink, queue_size)
+
+
+def run_crawl_analysis(urls, analysis, sink, **options):
+    """
+    Streams pages of URLs through pipeline
+    :param urls: Iterable of URLs (e.g. result of WebParser.get_all_following_links)
+    :param analysis: Name of analysis, key of ANALYSES of batch runner
+    :param sink: Function called with URL and result of analysis of every page
+    :param options: Numbers of workers and queue size, see create_crawl_pipeline
+    :return: Tuple of StageStatistics
+    """
+    return create_crawl_pipeline(analysis, sink, **options).run((url, url) for url in urls)
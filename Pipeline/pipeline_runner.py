@@ -0,0 +1,253 @@
+# Basic libraries
+import time
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+# App libraries
+from AdvancedLogging.logger import Logger
+
+
+class Stage:
+    """
+    One step of pipeline. Function gets value of item and returns new value, None drops the item.
+    """
+
+    def __init__(self, name, function, workers=1, processes=False, initializer=None, initargs=()):
+        """
+        :param name: Name of the stage used in statistics
+        :param function: Function processing value of one item, it has to be picklable when processes are used
+        :param workers: Number of workers of the stage
+        :param processes: Run function in worker processes instead of threads (for CPU bound stages like NLP)
+        :param initializer: Function called at start of every worker process
+        :param initargs: Arguments of initializer
+        """
+        if workers < 1:
+            raise ValueError("Stage has to have at least one worker")
+
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.processes = processes
+        self.initializer = initializer
+        self.initargs = initargs
+
+
+class StageStatistics:
+    """
+    Counters of one stage collected while pipeline runs
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.name}: {self.processed} items, {self.dropped} dropped, {self.errors} errors, " \
+               f"{self.throughput:.2f} items/s, busy {self.busy_time:.2f} s"
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+
+        return (self.finished if self.finished is not None else time.perf_counter()) - self.started
+
+    @property
+    def throughput(self):
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def mark_started(self):
+        with self._lock:
+            if self.started is None:
+                self.started = time.perf_counter()
+
+    def mark_finished(self):
+        with self._lock:
+            self.finished = time.perf_counter()
+
+    def record(self, duration, dropped=False, error=False):
+        with self._lock:
+            self.busy_time += duration
+            if error:
+                self.errors += 1
+            elif dropped:
+                self.dropped += 1
+            else:
+                self.processed += 1
+
+
+class PipelineRunner:
+    """
+    Runs items through stages connected by bounded queues. When a queue is full, previous stage waits,
+    so the number of items in memory is bounded regardless of the number of input items.
+    Items are tuples (key, value), stages transform only values and keys (e.g. URLs) are kept.
+    When sink fails, pipeline is cancelled, when input fails, items read before are finished.
+    Both errors are raised by run after all threads end.
+    """
+
+    _END = object()
+    # Seconds between checks of cancellation while waiting on queue
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, stages, sink, queue_size=64):
+        """
+        :param stages: List of Stage
+        :param sink: Function called with key and final value of every item, it is called from one thread only
+        :param queue_size: Maximal number of items waiting between two stages
+        """
+        self._stages = stages
+        self._sink = sink
+        self._queue_size = queue_size
+        self._logger = Logger(self.__class__.__name__)
+        self._statistics = [StageStatistics(stage.name) for stage in stages]
+        self._lock = threading.Lock()
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def statistics(self):
+        return tuple(self._statistics)
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def run(self, items):
+        """
+        Runs all items through pipeline and waits until all of them are in sink
+        :param items: Iterable of (key, value), it is consumed lazily
+        :return: Tuple of StageStatistics
+        """
+        self._statistics = [StageStatistics(stage.name) for stage in self._stages]
+        queues = [queue.Queue(maxsize=self._queue_size) for _ in range(len(self._stages) + 1)]
+        executors = [ProcessPoolExecutor(max_workers=stage.workers, initializer=stage.initializer,
+                                         initargs=stage.initargs) if stage.processes else None
+                     for stage in self._stages]
+        cancelled = threading.Event()
+        feed_errors = []
+        threads = [threading.Thread(target=self._feed, args=(items, queues[0], cancelled, feed_errors),
+                                    daemon=True)]
+
+        for i, stage in enumerate(self._stages):
+            finished_workers = [0]
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, executors[i], self._statistics[i], queues[i], queues[i + 1], finished_workers,
+                          cancelled),
+                    daemon=True))
+
+        try:
+            for thread in threads:
+                thread.start()
+            self._drain(queues[-1], cancelled)
+        except BaseException:
+            cancelled.set()
+            raise
+        finally:
+            for thread in threads:
+                if thread.ident is not None:
+                    thread.join()
+            for executor in executors:
+                if executor is not None:
+                    executor.shutdown()
+
+        for statistics in self._statistics:
+            self._logger.info(str(statistics))
+
+        if feed_errors:
+            raise feed_errors[0]
+
+        return self.statistics
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _put(self, output_queue, item, cancelled):
+        """
+        Puts item into queue, waits while it is full
+        :return: False if pipeline was cancelled before item was put
+        """
+        while not cancelled.is_set():
+            try:
+                output_queue.put(item, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def _get(self, input_queue, cancelled):
+        """
+        Gets item from queue, waits while it is empty
+        :return: Item or end when pipeline was cancelled
+        """
+        while not cancelled.is_set():
+            try:
+                return input_queue.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                pass
+
+        return self._END
+
+    def _feed(self, items, output_queue, cancelled, errors):
+        try:
+            for item in items:
+                if not self._put(output_queue, item, cancelled):
+                    break
+        except Exception as ex:
+            # It is raised by run when items read before are finished
+            errors.append(ex)
+        finally:
+            self._put(output_queue, self._END, cancelled)
+
+    def _work(self, stage, executor, statistics, input_queue, output_queue, finished_workers, cancelled):
+        statistics.mark_started()
+
+        while True:
+            item = self._get(input_queue, cancelled)
+            if item is self._END:
+                # Other workers of the same stage have to see the end too
+                self._put(input_queue, self._END, cancelled)
+                break
+
+            key, value = item
+            start = time.perf_counter()
+            try:
+                if executor is not None:
+                    result = executor.submit(stage.function, value).result()
+                else:
+                    result = stage.function(value)
+            except Exception as ex:
+                statistics.record(time.perf_counter() - start, error=True)
+                self._logger.error(f"{stage.name} - {key}: {ex}")
+                continue
+
+            statistics.record(time.perf_counter() - start, dropped=result is None)
+            if result is not None:
+                self._put(output_queue, (key, result), cancelled)
+
+        with self._lock:
+            finished_workers[0] += 1
+            last = finished_workers[0] == stage.workers
+
+        if last:
+            statistics.mark_finished()
+            self._put(output_queue, self._END, cancelled)
+
+    def _drain(self, input_queue, cancelled):
+        while True:
+            item = self._get(input_queue, cancelled)
+            if item is self._END:
+                break
+
+            self._sink(*item)
@@ -0,0 +1,285 @@
+# Basic libraries
+import os
+import json
+import shutil
+# App libraries
+from .postings import PostingList, EMPTY_POSTING_LIST, get_varint_lengths, encode_varints, decode_varints, \
+    encode_deltas, decode_deltas
+# Third-party libraries
+import numpy as np
+
+
+class IndexSegment:
+    """
+    Immutable part of inverted index stored in its own directory. Documents, term frequencies and positions
+    of all terms are delta-encoded in three memory-mapped streams, so opening of segment reads only its term
+    dictionary and a query decodes only postings of its terms. Documents of segment are numbered from zero,
+    only mask of deleted documents can change after the segment is written.
+    """
+
+    TERMS_FILE = "terms.txt"
+    TERM_TABLE_FILE = "terms.npy"
+    DOCUMENTS_FILE = "documents.bin"
+    FREQUENCIES_FILE = "frequencies.bin"
+    POSITIONS_FILE = "positions.bin"
+    LENGTHS_FILE = "lengths.npy"
+    KEYS_FILE = "keys.json"
+    DELETED_FILE = "deleted.npy"
+
+    # Columns of term table, it has one extra row with ends of streams
+    DOCUMENTS_OFFSET, FREQUENCIES_OFFSET, POSITIONS_OFFSET, DOCUMENT_FREQUENCY = range(4)
+
+    def __init__(self, directory):
+        """
+        Opens segment written before
+        :param directory: Directory of segment
+        """
+        self._directory = directory
+
+        with open(os.path.join(directory, self.TERMS_FILE), encoding="utf-8") as f:
+            self._terms = {term: i for i, term in enumerate(f.read().split("\n")) if term}
+        with open(os.path.join(directory, self.KEYS_FILE), encoding="utf-8") as f:
+            self._keys = json.load(f)
+
+        self._term_table = np.load(os.path.join(directory, self.TERM_TABLE_FILE))
+        self._lengths = np.load(os.path.join(directory, self.LENGTHS_FILE))
+        self._documents = self._map(self.DOCUMENTS_FILE)
+        self._frequencies = self._map(self.FREQUENCIES_FILE)
+        self._positions = self._map(self.POSITIONS_FILE)
+
+        deleted_path = os.path.join(directory, self.DELETED_FILE)
+        self._deleted = np.load(deleted_path) if os.path.isfile(deleted_path) else np.zeros(len(self._keys), bool)
+        self._deleted_changed = False
+
+    def __len__(self):
+        return len(self._keys)
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def name(self):
+        return os.path.basename(self._directory)
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def keys(self):
+        return self._keys
+
+    @property
+    def lengths(self):
+        """
+        Number of tokens of every document
+        """
+        return self._lengths
+
+    @property
+    def deleted(self):
+        """
+        Mask of deleted documents
+        """
+        return self._deleted
+
+    @property
+    def live_count(self):
+        return len(self._keys) - int(self._deleted.sum())
+
+    @property
+    def terms(self):
+        return self._terms.keys()
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def get_document_frequency(self, term):
+        """
+        Gets number of documents of segment which contain term, deleted documents included
+        :param term: Term
+        :return: Document frequency
+        """
+        row = self._terms.get(term)
+
+        return 0 if row is None else int(self._term_table[row, self.DOCUMENT_FREQUENCY])
+
+    def get_postings(self, term, positions=False):
+        """
+        Gets postings of term, deleted documents included
+        :param term: Term
+        :param positions: Decode also positions of term in documents
+        :return: PostingList, positions are None when they are not requested
+        """
+        row = self._terms.get(term)
+        if row is None:
+            return EMPTY_POSTING_LIST
+
+        (documents_start, frequencies_start, positions_start, _), (documents_end, frequencies_end, positions_end, _) = \
+            self._term_table[row:row + 2].tolist()
+
+        frequencies = decode_varints(self._frequencies[frequencies_start:frequencies_end])
+        term_positions = None
+        if positions:
+            term_positions = decode_deltas(decode_varints(self._positions[positions_start:positions_end]), frequencies)
+
+        return PostingList(np.cumsum(decode_varints(self._documents[documents_start:documents_end])), frequencies,
+                           term_positions)
+
+    def get_occurrences(self):
+        """
+        Decodes the whole segment
+        :return: Tuple of numpy arrays (number of term, document, position) of all occurrences of all terms,
+        they are ordered by term, document and position
+        """
+        document_frequencies = self._term_table[:-1, self.DOCUMENT_FREQUENCY]
+        documents = decode_deltas(decode_varints(self._documents), document_frequencies)
+        frequencies = decode_varints(self._frequencies)
+        positions = decode_deltas(decode_varints(self._positions), frequencies)
+        terms = np.repeat(np.arange(len(document_frequencies)), document_frequencies)
+
+        return np.repeat(terms, frequencies), np.repeat(documents, frequencies), positions
+
+    def get_terms(self):
+        """
+        Gets terms in order of their numbers
+        :return: List of terms
+        """
+        return sorted(self._terms, key=self._terms.get)
+
+    def delete(self, document):
+        """
+        Marks document as deleted, the change is saved by save_deletions
+        :param document: Number of document in segment
+        """
+        self._deleted[document] = True
+        self._deleted_changed = True
+
+    def save_deletions(self):
+        if self._deleted_changed:
+            np.save(os.path.join(self._directory, self.DELETED_FILE), self._deleted)
+            self._deleted_changed = False
+
+    def remove(self):
+        """
+        Removes files of segment, segment must not be used afterwards
+        """
+        self._documents = self._frequencies = self._positions = None
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    @classmethod
+    def write(cls, directory, documents):
+        """
+        Writes segment of documents
+        :param directory: Directory of new segment
+        :param documents: List of (key, list of tokens)
+        :return: IndexSegment
+        """
+        vocabulary = dict()
+        term_ids = []
+        for _, tokens in documents:
+            term_ids.extend([vocabulary.setdefault(token, len(vocabulary)) for token in tokens])
+
+        lengths = np.array([len(tokens) for _, tokens in documents], dtype=np.int64)
+        occurrence_documents = np.repeat(np.arange(len(documents)), lengths)
+        occurrence_positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        terms = sorted(vocabulary)
+        ranks = np.empty(len(terms), dtype=np.int64)
+        ranks[[vocabulary[term] for term in terms]] = np.arange(len(terms))
+
+        return cls._write(directory, terms, ranks[np.array(term_ids, dtype=np.int64)], occurrence_documents,
+                          occurrence_positions, [key for key, _ in documents], lengths.astype(np.int32))
+
+    @classmethod
+    def merge(cls, directory, segments):
+        """
+        Merges segments into one new segment, deleted documents are dropped. Documents keep order of segments.
+        :param directory: Directory of new segment
+        :param segments: List of IndexSegment
+        :return: IndexSegment
+        """
+        terms = sorted(set().union(*[segment.terms for segment in segments]))
+        ranks = {term: rank for rank, term in enumerate(terms)}
+
+        keys, lengths, occurrences = [], [], []
+        for segment in segments:
+            alive = ~segment.deleted
+            # New number of every document of segment, -1 for deleted documents
+            document_map = np.where(alive, np.cumsum(alive) - 1 + len(keys), -1)
+            term_map = np.array([ranks[term] for term in segment.get_terms()], dtype=np.int64)
+
+            term_numbers, documents, positions = segment.get_occurrences()
+            documents = document_map[documents]
+            kept = documents >= 0
+            occurrences.append((term_map[term_numbers[kept]], documents[kept], positions[kept]))
+
+            keys.extend([key for key, is_alive in zip(segment.keys, alive.tolist()) if is_alive])
+            lengths.append(segment.lengths[alive])
+
+        term_ranks, documents, positions = [np.concatenate(values) for values in zip(*occurrences)]
+
+        return cls._write(directory, terms, term_ranks, documents, positions, keys, np.concatenate(lengths))
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _map(self, file_name):
+        path = os.path.join(self._directory, file_name)
+
+        return np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.zeros(0, dtype=np.uint8)
+
+    @classmethod
+    def _write(cls, directory, terms, term_ranks, documents, positions, keys, lengths):
+        """
+        Writes segment files from all occurrences of terms
+        :param terms: Sorted list of terms
+        :param term_ranks: numpy array with index into terms of every occurrence
+        :param documents: numpy array with document of every occurrence
+        :param positions: numpy array with position of every occurrence in its document
+        """
+        os.makedirs(directory)
+
+        order = np.lexsort((positions, documents, term_ranks))
+        term_ranks, documents, positions = term_ranks[order], documents[order], positions[order]
+
+        # Postings are groups of occurrences with the same term and document
+        changed = np.ones(len(order), dtype=bool)
+        changed[1:] = (term_ranks[1:] != term_ranks[:-1]) | (documents[1:] != documents[:-1])
+        posting_starts = np.flatnonzero(changed)
+        frequencies = np.diff(np.append(posting_starts, len(order)))
+        posting_terms, posting_documents = term_ranks[posting_starts], documents[posting_starts]
+
+        changed = np.ones(len(posting_starts), dtype=bool)
+        changed[1:] = posting_terms[1:] != posting_terms[:-1]
+        term_starts = np.flatnonzero(changed)
+        document_frequencies = np.diff(np.append(term_starts, len(posting_starts)))
+
+        document_deltas = encode_deltas(posting_documents, document_frequencies)
+        position_deltas = encode_deltas(positions, frequencies)
+
+        term_table = np.zeros((len(term_starts) + 1, 4), dtype=np.int64)
+        term_table[:-1, cls.DOCUMENT_FREQUENCY] = document_frequencies
+        for column, values, starts in ((cls.DOCUMENTS_OFFSET, document_deltas, term_starts),
+                                       (cls.FREQUENCIES_OFFSET, frequencies, term_starts),
+                                       (cls.POSITIONS_OFFSET, position_deltas, posting_starts[term_starts])):
+            if len(starts):
+                term_table[1:, column] = np.cumsum(np.add.reduceat(get_varint_lengths(values), starts))
+
+        for file_name, values in ((cls.DOCUMENTS_FILE, document_deltas), (cls.FREQUENCIES_FILE, frequencies),
+                                  (cls.POSITIONS_FILE, position_deltas)):
+            with open(os.path.join(directory, file_name), "wb") as f:
+                f.write(encode_varints(values))
+
+        with open(os.path.join(directory, cls.TERMS_FILE), "w", encoding="utf-8") as f:
+            f.write("\n".join([terms[rank] for rank in posting_terms[term_starts].tolist()]))
+        with open(os.path.join(directory, cls.KEYS_FILE), "w", encoding="utf-8") as f:
+            json.dump(keys, f)
+
+        np.save(os.path.join(directory, cls.TERM_TABLE_FILE), term_table)
+        np.save(os.path.join(directory, cls.LENGTHS_FILE), lengths)
+
+        return cls(directory)
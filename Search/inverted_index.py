@@ -0,0 +1,326 @@
+# Basic libraries
+import os
+import json
+import math
+from collections import OrderedDict
+# App libraries
+from .index_segment import IndexSegment
+from .query_parser import TermQuery, PhraseQuery, AndQuery, OrQuery, NotQuery, tokenize, parse_query
+# Third-party libraries
+import numpy as np
+
+
+class InvertedIndex:
+    """
+    On-disk full-text index of pages with BM25 ranking.
+    New pages are collected in memory and written as small immutable segments, segments of similar size
+    are merged into bigger ones when a segment is written (tiered merging, it runs synchronously in add
+    and commit), so adding of pages stays cheap on average and number of segments searched by a query stays
+    logarithmic. Re-added page replaces its previous version.
+    New pages become searchable after commit, deleted (and replaced) pages are hidden from searches
+    immediately, their deletions are written on disk by commit.
+    """
+
+    MANIFEST_FILE = "segments.json"
+    SEGMENT_PREFIX = "segment_"
+
+    # Parameters of BM25
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, directory="search_index", buffer_documents=10000, merge_factor=10):
+        """
+        :param directory: Directory of index, existing index is opened
+        :param buffer_documents: Number of pages kept in memory before they are written as new segment
+        :param merge_factor: Number of segments of similar size which are merged into one
+        """
+        if merge_factor < 2:
+            raise ValueError("Merge factor has to be at least 2")
+
+        self._directory = directory
+        self._buffer_documents = buffer_documents
+        self._merge_factor = merge_factor
+
+        self._buffer = OrderedDict()
+        self._segments = []
+        self._next_segment = 0
+        # Key of page -> (segment, number of document in segment)
+        self._locations = dict()
+
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def __len__(self):
+        return sum(segment.live_count for segment in self._segments) + len(self._buffer)
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def segments(self):
+        return tuple(self._segments)
+
+    @property
+    def pending_count(self):
+        """
+        Number of pages added after the last commit
+        """
+        return len(self._buffer)
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def contains(self, key):
+        return key in self._buffer or key in self._locations
+
+    def add(self, key, text):
+        """
+        Adds page into index, previous version of the page is replaced
+        :param key: Key of page returned by searches (e.g. URL)
+        :param text: Text of page
+        """
+        self.delete(key)
+        self._buffer[key] = tokenize(text)
+
+        if len(self._buffer) >= self._buffer_documents:
+            self._flush()
+
+    def delete(self, key):
+        """
+        Removes page from index
+        :param key: Key of page
+        """
+        if self._buffer.pop(key, None) is not None:
+            return
+
+        location = self._locations.pop(key, None)
+        if location is not None:
+            segment, document = location
+            segment.delete(document)
+
+    def commit(self):
+        """
+        Writes pending pages and deletions on disk, pages become searchable
+        """
+        self._flush()
+        for segment in self._segments:
+            segment.save_deletions()
+
+    def search(self, query, k=10):
+        """
+        Searches committed pages
+        :param query: Query, see parse_query (e.g. 'python AND "web parsing" NOT java')
+        :param k: Number of pages in result
+        :return: List of tuples (key of page, BM25 score) ordered from the best
+        """
+        parsed_query = parse_query(query)
+        if parsed_query is None:
+            return []
+
+        statistics = self._get_statistics()
+        candidates = []
+        for segment in self._segments:
+            documents, scores = self._evaluate(parsed_query, segment, statistics)
+            alive = ~segment.deleted[documents]
+            documents, scores = documents[alive], scores[alive]
+
+            if len(documents) > k:
+                best = np.argpartition(-scores, k - 1)[:k]
+                documents, scores = documents[best], scores[best]
+
+            candidates.extend(zip(scores.tolist(), [segment.keys[document] for document in documents.tolist()]))
+
+        candidates.sort(key=lambda candidate: -candidate[0])
+
+        return [(key, score) for score, key in candidates[:k]]
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _open(self):
+        manifest_path = os.path.join(self._directory, self.MANIFEST_FILE)
+        if not os.path.isfile(manifest_path):
+            return
+
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        self._next_segment = manifest["next_segment"]
+        for name in manifest["segments"]:
+            segment = IndexSegment(os.path.join(self._directory, name))
+            self._segments.append(segment)
+            self._add_locations(segment)
+
+    def _save_manifest(self):
+        manifest_path = os.path.join(self._directory, self.MANIFEST_FILE)
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"segments": [segment.name for segment in self._segments],
+                       "next_segment": self._next_segment}, f)
+        # Manifest is replaced atomically, so index on disk is always consistent
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+    def _get_new_segment_directory(self):
+        name = f"{self.SEGMENT_PREFIX}{self._next_segment:06d}"
+        self._next_segment += 1
+
+        return os.path.join(self._directory, name)
+
+    def _add_locations(self, segment):
+        deleted = segment.deleted
+        for document, key in enumerate(segment.keys):
+            if not deleted[document]:
+                self._locations[key] = (segment, document)
+
+    def _flush(self):
+        if not self._buffer:
+            return
+
+        segment = IndexSegment.write(self._get_new_segment_directory(), list(self._buffer.items()))
+        self._buffer.clear()
+        self._segments.append(segment)
+        self._add_locations(segment)
+        self._save_manifest()
+
+        self._merge_segments()
+
+    def _get_level(self, segment):
+        return int(math.log(max(len(segment), 1) / self._buffer_documents, self._merge_factor)) \
+            if len(segment) > self._buffer_documents else 0
+
+    def _merge_segments(self):
+        """
+        Merges runs of neighbouring segments of the same level until there is none
+        """
+        while True:
+            levels = [self._get_level(segment) for segment in self._segments]
+            start = next((i for i in range(len(levels) - self._merge_factor + 1)
+                          if len(set(levels[i:i + self._merge_factor])) == 1), None)
+            if start is None:
+                return
+
+            merged_segments = self._segments[start:start + self._merge_factor]
+            for segment in merged_segments:
+                segment.save_deletions()
+
+            segment = IndexSegment.merge(self._get_new_segment_directory(), merged_segments)
+            self._segments[start:start + self._merge_factor] = [segment]
+            self._add_locations(segment)
+            self._save_manifest()
+
+            for merged_segment in merged_segments:
+                merged_segment.remove()
+
+    def _get_statistics(self):
+        """
+        Gets statistics of collection needed by BM25 - number of pages, average length and cache of IDF
+        """
+        count = sum(segment.live_count for segment in self._segments)
+        length = sum(int(np.asarray(segment.lengths)[~segment.deleted].sum()) for segment in self._segments)
+
+        return {"count": count, "average_length": length / count if count else 1.0, "idf": dict()}
+
+    def _get_idf(self, term, statistics):
+        idf = statistics["idf"].get(term)
+        if idf is None:
+            document_frequency = sum(segment.get_document_frequency(term) for segment in self._segments)
+            count = statistics["count"]
+            idf = statistics["idf"][term] = math.log(1.0 + (count - document_frequency + 0.5) /
+                                                     (document_frequency + 0.5))
+
+        return idf
+
+    def _score(self, idf, frequencies, lengths, statistics):
+        frequencies = frequencies.astype(np.float64)
+        normalization = self.K1 * (1.0 - self.B + self.B * lengths / statistics["average_length"])
+
+        return idf * frequencies * (self.K1 + 1.0) / (frequencies + normalization)
+
+    def _evaluate(self, query, segment, statistics):
+        """
+        Evaluates query in segment
+        :return: Tuple of (ascending numbers of matching documents, their scores)
+        """
+        if isinstance(query, TermQuery):
+            documents, frequencies, _ = segment.get_postings(query.term)
+            return documents, self._score(self._get_idf(query.term, statistics), frequencies,
+                                          segment.lengths[documents], statistics)
+
+        if isinstance(query, PhraseQuery):
+            return self._evaluate_phrase(query, segment, statistics)
+
+        if isinstance(query, AndQuery):
+            documents, scores = self._evaluate(query.queries[0], segment, statistics)
+            for sub_query in query.queries[1:]:
+                if not len(documents):
+                    break
+                other_documents, other_scores = self._evaluate(sub_query, segment, statistics)
+                documents, indices, other_indices = np.intersect1d(documents, other_documents, assume_unique=True,
+                                                                   return_indices=True)
+                scores = scores[indices] + other_scores[other_indices]
+
+            for excluded in query.excluded:
+                if not len(documents):
+                    break
+                keep = ~np.isin(documents, self._evaluate(excluded, segment, statistics)[0], assume_unique=True)
+                documents, scores = documents[keep], scores[keep]
+
+            return documents, scores
+
+        if isinstance(query, OrQuery):
+            results = [self._evaluate(sub_query, segment, statistics) for sub_query in query.queries]
+            documents = np.unique(np.concatenate([sub_documents for sub_documents, _ in results]))
+            scores = np.zeros(len(documents))
+            for sub_documents, sub_scores in results:
+                scores[np.searchsorted(documents, sub_documents)] += sub_scores
+
+            return documents, scores
+
+        if isinstance(query, NotQuery):
+            documents = np.setdiff1d(np.arange(len(segment)), self._evaluate(query.query, segment, statistics)[0],
+                                     assume_unique=True)
+            return documents, np.zeros(len(documents))
+
+        raise ValueError(f"Neznámý typ dotazu '{type(query).__name__}'")
+
+    def _evaluate_phrase(self, query, segment, statistics):
+        """
+        Finds documents where terms of phrase follow each other, phrase frequency is scored by BM25
+        """
+        postings = [segment.get_postings(term, positions=True) for term in query.terms]
+
+        # Positions are compared only in documents which contain all terms
+        candidates = postings[0].documents
+        for posting_list in postings[1:]:
+            candidates = np.intersect1d(candidates, posting_list.documents, assume_unique=True)
+
+        # Start of phrase is encoded together with document into one integer, so the keys of every term
+        # are ascending and matching starts are found by binary search; terms are checked from the rarest
+        matches = None
+        for i in sorted(range(len(postings)), key=lambda j: len(postings[j].positions)):
+            documents, frequencies, positions = postings[i]
+            starts = positions - i
+            relevant = np.repeat(np.isin(documents, candidates, assume_unique=True), frequencies) & (starts >= 0)
+            keys = (np.repeat(documents, frequencies) << 32 | starts)[relevant]
+
+            if matches is None:
+                matches = keys
+            elif len(keys):
+                found = keys[np.minimum(np.searchsorted(keys, matches), len(keys) - 1)] == matches
+                matches = matches[found]
+            else:
+                matches = keys
+
+            if not len(matches):
+                return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        documents, phrase_frequencies = np.unique(matches >> 32, return_counts=True)
+        idf = sum(self._get_idf(term, statistics) for term in query.terms)
+
+        return documents, self._score(idf, phrase_frequencies, segment.lengths[documents], statistics)
@@ -0,0 +1,97 @@
+# Basic libraries
+from collections import namedtuple
+# Third-party libraries
+import numpy as np
+
+
+# Postings of one term, positions of all documents are concatenated in order of documents
+# and every document has as many positions as is its term frequency
+PostingList = namedtuple("PostingList", ("documents", "frequencies", "positions"))
+
+EMPTY_POSTING_LIST = PostingList(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+
+def get_varint_lengths(values):
+    """
+    Gets number of bytes of every value encoded as variable-length integer
+    :param values: numpy array of non-negative integers
+    :return: numpy array of lengths
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        lengths += rest > 0
+        rest >>= np.uint64(7)
+
+    return lengths
+
+
+def encode_varints(values):
+    """
+    Encodes non-negative integers as variable-length integers (7 bits per byte, high bit marks continuation)
+    :param values: Array-like of non-negative integers
+    :return: Bytes
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    if not len(values):
+        return b""
+
+    lengths = get_varint_lengths(values)
+    starts = np.cumsum(lengths) - lengths
+    owners = np.repeat(np.arange(len(values)), lengths)
+    shifts = ((np.arange(lengths.sum()) - starts[owners]) * 7).astype(np.uint64)
+
+    encoded = ((values[owners] >> shifts) & np.uint64(0x7f)).astype(np.uint8)
+    continuation = np.ones(len(encoded), dtype=bool)
+    continuation[starts + lengths - 1] = False
+    encoded[continuation] |= 0x80
+
+    return encoded.tobytes()
+
+
+def decode_varints(data):
+    """
+    Decodes variable-length integers encoded by encode_varints
+    :param data: Bytes or numpy array of uint8
+    :return: numpy array of int64
+    """
+    encoded = np.frombuffer(data, dtype=np.uint8)
+    if not len(encoded):
+        return np.zeros(0, dtype=np.int64)
+
+    ends = encoded < 0x80
+    starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    owners = np.cumsum(np.concatenate(([0], ends[:-1])))
+    shifts = ((np.arange(len(encoded)) - starts[owners]) * 7).astype(np.uint64)
+
+    return np.add.reduceat((encoded & 0x7f).astype(np.uint64) << shifts, starts).astype(np.int64)
+
+
+def encode_deltas(values, group_lengths):
+    """
+    Delta-encodes ascending values of consecutive groups, first value of every group is kept whole
+    :param values: numpy array of values ascending inside groups
+    :param group_lengths: numpy array of positive lengths of groups
+    :return: numpy array of deltas
+    """
+    deltas = np.diff(values, prepend=0)
+    starts = np.cumsum(group_lengths) - group_lengths
+    deltas[starts] = values[starts]
+
+    return deltas
+
+
+def decode_deltas(deltas, group_lengths):
+    """
+    Decodes values encoded by encode_deltas
+    :param deltas: numpy array of deltas
+    :param group_lengths: numpy array of positive lengths of groups
+    :return: numpy array of values
+    """
+    sums = np.cumsum(deltas)
+    starts = np.cumsum(group_lengths) - group_lengths
+    # Cumulative sum runs across groups, sum before the first value of group is subtracted
+    bases = np.concatenate(([0], sums))[starts]
+
+    return sums - np.repeat(bases, group_lengths)
@@ -0,0 +1,135 @@
+# Basic libraries
+import re
+from collections import namedtuple
+
+
+TOKEN_REGEX = re.compile(r"\w+")
+QUERY_TOKEN_REGEX = re.compile(r'"([^"]*)"|(\()|(\))|([^\s()"]+)')
+
+# Nodes of parsed query
+TermQuery = namedtuple("TermQuery", ("term",))
+PhraseQuery = namedtuple("PhraseQuery", ("terms",))
+AndQuery = namedtuple("AndQuery", ("queries", "excluded"))
+OrQuery = namedtuple("OrQuery", ("queries",))
+NotQuery = namedtuple("NotQuery", ("query",))
+
+
+def tokenize(text):
+    """
+    Splits text into lowercase tokens used by the index and by queries
+    :param text: Text
+    :return: List of tokens
+    """
+    return TOKEN_REGEX.findall(text.lower())
+
+
+def parse_query(query):
+    """
+    Parses query. Words and "phrases" separated by spaces have to be all in document (AND is implicit),
+    operators AND, OR and NOT are supported together with parentheses, OR has the lowest priority.
+    Parts without any word (e.g. '???', '""' or missing operand of operator) are left out.
+    :param query: Query text, e.g. 'python AND (web OR "text analysis") NOT java'
+    :return: Tree of query nodes, None for empty query
+    """
+    return _QueryParser(query).parse()
+
+
+class _QueryParser:
+    """
+    Recursive descent parser of queries
+    """
+
+    OPERATORS = ("AND", "OR", "NOT")
+
+    def __init__(self, query):
+        self._tokens = []
+        for phrase, left, right, word in QUERY_TOKEN_REGEX.findall(query):
+            if phrase:
+                self._tokens.append(("phrase", phrase))
+            elif left or right:
+                self._tokens.append((left or right, None))
+            elif word in self.OPERATORS:
+                self._tokens.append((word, None))
+            else:
+                self._tokens.append(("word", word))
+        self._position = 0
+
+    def parse(self):
+        if not self._tokens:
+            return None
+
+        query = self._parse_or()
+        if self._position < len(self._tokens):
+            raise ValueError(f"Neočekávaná část dotazu na pozici {self._position + 1}")
+
+        return query
+
+    def _peek(self):
+        return self._tokens[self._position][0] if self._position < len(self._tokens) else None
+
+    def _next(self):
+        token = self._tokens[self._position]
+        self._position += 1
+
+        return token
+
+    def _parse_or(self):
+        queries = [self._parse_and()]
+        while self._peek() == "OR":
+            self._next()
+            queries.append(self._parse_and())
+
+        queries = [query for query in queries if query is not None]
+        if not queries:
+            return None
+
+        return queries[0] if len(queries) == 1 else OrQuery(tuple(queries))
+
+    def _parse_and(self):
+        queries, excluded = [], []
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self._next()
+                continue
+
+            query = self._parse_not()
+            if isinstance(query, NotQuery):
+                excluded.append(query.query)
+            elif query is not None:
+                queries.append(query)
+
+        if not queries and not excluded:
+            return None
+        if not excluded and len(queries) == 1:
+            return queries[0]
+        if not queries:
+            return NotQuery(excluded[0] if len(excluded) == 1 else OrQuery(tuple(excluded)))
+
+        return AndQuery(tuple(queries), tuple(excluded))
+
+    def _parse_not(self):
+        kind, value = self._next()
+        if kind == "NOT":
+            if self._peek() in (None, "OR", ")"):
+                return None
+            query = self._parse_not()
+            return NotQuery(query) if query is not None else None
+        if kind == "(":
+            query = self._parse_or()
+            if self._peek() != ")":
+                raise ValueError("Chybí uzavírací závorka")
+            self._next()
+            return query
+        if kind == "phrase":
+            terms = tuple(tokenize(value))
+            if not terms:
+                return None
+            return TermQuery(terms[0]) if len(terms) == 1 else PhraseQuery(terms)
+        if kind == "word":
+            terms = tokenize(value)
+            if not terms:
+                return None
+            # Words joined by punctuation (e.g. e-mail) are searched as phrase
+            return TermQuery(terms[0]) if len(terms) == 1 else PhraseQuery(tuple(terms))
+
+        raise ValueError(f"Neočekávaný operátor '{kind}'")
@@ -0,0 +1,283 @@
+# Basic libraries
+import json
+import threading
+from concurrent import futures
+from socketserver import ThreadingMixIn
+from http.server import HTTPServer, BaseHTTPRequestHandler
+# App libraries
+from AdvancedLogging.logger import Logger
+from CLI.batch_runner import ANALYSES, QUERIES, parse_query
+from WebParsing.page_cache import PageCache
+from Instrumentation.metrics import METRICS
+from NLP.lazy_import import prewarm
+from NLP.nlp_service import NLPService
+from WebParsing.web_parser import WebParser
+from .micro_batcher import MicroBatcher, ServiceOverloadedError
+
+
+def _named_entity_recognition_batch(texts):
+    return [{"result": [named_entity.__repr__() for named_entity in named_entities], "processed_text": None}
+            for named_entities in NLPService.get_named_entity_recognition_of_texts(texts)]
+
+
+def _create_batch_analysis(analysis, topic_model_store=None):
+    """
+    Creates batch function of analysis which has no batch version, texts of batch are analysed one by one
+    """
+    def analyze_texts(texts):
+        results = []
+        for text in texts:
+            try:
+                result, processed_text = ANALYSES[analysis](NLPService(text, topic_model_store=topic_model_store))
+                results.append({"result": [str(line) for line in result], "processed_text": processed_text})
+            except Exception as ex:
+                results.append({"error": ex.__str__()})
+
+        return results
+
+    return analyze_texts
+
+
+def create_default_analyses(topic_model_store=None):
+    """
+    Creates batch functions of all analyses of the main window, named entity recognition processes
+    whole batch in one nlp.pipe call
+    :param topic_model_store: TopicModelStore shared by requests, topic models are trained in memory when None
+    :return: Dictionary name -> function that gets list of texts and returns list of result dictionaries
+    """
+    analyses = {name: _create_batch_analysis(name, topic_model_store) for name in ANALYSES}
+    analyses["entities"] = _named_entity_recognition_batch
+
+    return analyses
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles HTTP requests, every request runs in its own thread
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, self.server.analysis_server.get_health())
+        elif self.path == "/metrics":
+            self._send_body(200, METRICS.to_prometheus_text().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send_json(404, {"error": f"Neznámá adresa '{self.path}'"})
+
+    def do_POST(self):
+        analysis_server = self.server.analysis_server
+        routes = {"/analyze": lambda request: analysis_server.analyze(request.get("analysis"), request.get("text")),
+                  "/parse": lambda request: analysis_server.parse(request.get("query"), request.get("url"),
+                                                                  request.get("html"))}
+        try:
+            route = routes.get(self.path)
+            if route is None:
+                self._send_json(404, {"error": f"Neznámá adresa '{self.path}'"})
+                return
+
+            self._send_json(200, route(self._read_json()))
+        except ServiceOverloadedError as ex:
+            self._send_json(503, {"error": ex.__str__()}, {"Retry-After": "1"})
+        except futures.TimeoutError:
+            self._send_json(504, {"error": "Vypršel čas zpracování požadavku"})
+        except _RequestTooLargeError as ex:
+            self._send_json(413, {"error": ex.__str__()})
+        except ValueError as ex:
+            self._send_json(400, {"error": ex.__str__()})
+        except Exception as ex:
+            self._send_json(500, {"error": ex.__str__()})
+
+    def log_message(self, format, *args):
+        self.server.analysis_server.logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length > AnalysisServer.MAX_BODY_SIZE:
+            # Connection cannot be reused, the body is not read
+            self.close_connection = True
+            raise _RequestTooLargeError()
+
+        try:
+            request = json.loads(self.rfile.read(length).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ValueError("Tělo požadavku není validní JSON")
+        if not isinstance(request, dict):
+            raise ValueError("Tělo požadavku musí být JSON objekt")
+
+        return request
+
+    def _send_json(self, status, payload, headers=None):
+        self._send_body(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+                        "application/json; charset=utf-8", headers)
+
+    def _send_body(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _RequestTooLargeError(Exception):
+    def __init__(self):
+        super(_RequestTooLargeError, self).__init__("Požadavek je příliš velký")
+
+
+class AnalysisServer:
+    """
+    Long-running local HTTP service with warm models. Endpoints:
+    POST /analyze {"analysis": name, "text": text} - NLP analysis, concurrent requests of the same analysis
+    are processed in batches, when too many requests wait the service answers 503 (load shedding)
+    POST /parse {"query": query, "url": url} or {"query": query, "html": html} - web parser query
+    GET /health - state of queues and batches
+    GET /metrics - durations of stages and counters in Prometheus text format
+    """
+
+    # Maximal size of request body in bytes
+    MAX_BODY_SIZE = 16 * 1024 * 1024
+    # Text analysed by all analyses on warm up, so models are loaded before the first request
+    WARM_UP_TEXT = "Barack Obama visited Prague in April and talked about the European Union."
+
+    def __init__(self, host="127.0.0.1", port=8765, analyses=None, max_batch_size=32, max_wait=0.01,
+                 max_queue_size=256, request_timeout=60, max_parse_requests=16, page_loader=None):
+        """
+        :param host: Address of the server, the service is local by default
+        :param port: Port of the server, 0 chooses a free port
+        :param analyses: Dictionary name -> function that gets list of texts and returns list of result
+        dictionaries, create_default_analyses() by default
+        :param max_batch_size: Maximal number of texts analysed at once
+        :param max_wait: Maximal time in seconds the first request of batch waits for other requests
+        :param max_queue_size: Maximal number of waiting requests of one analysis
+        :param request_timeout: Maximal time in seconds of waiting for result of analysis
+        :param max_parse_requests: Maximal number of concurrently processed web parser queries
+        :param page_loader: Function that gets URL and returns WebParser with loaded page, see PageCache
+        """
+        self.logger = Logger(self.__class__.__name__)
+        self._analyses = analyses if analyses is not None else create_default_analyses()
+        self._request_timeout = request_timeout
+        self._batchers = {name: MicroBatcher(function, max_batch_size, max_wait, max_queue_size, f"batcher-{name}")
+                          for name, function in self._analyses.items()}
+        self._page_cache = PageCache(loader=page_loader)
+        self._parse_slots = threading.BoundedSemaphore(max_parse_requests)
+
+        self._http_server = _ThreadingHTTPServer((host, port), _RequestHandler)
+        self._http_server.analysis_server = self
+        self._thread = None
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def address(self):
+        return self._http_server.server_address
+
+    @property
+    def url(self):
+        host, port = self.address[:2]
+        return f"http://{host}:{port}"
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def warm_up(self):
+        """
+        Imports libraries and loads models by analysing short text with all analyses
+        """
+        prewarm()
+        for name, function in self._analyses.items():
+            try:
+                function([self.WARM_UP_TEXT])
+            except Exception as ex:
+                self.logger.warning(f"Analýzu '{name}' se nepodařilo připravit: {ex}")
+
+    def start(self):
+        """
+        Starts serving requests in background thread
+        """
+        self._thread = threading.Thread(target=self._http_server.serve_forever, name="AnalysisServer", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Služba běží na {self.url}")
+
+    def serve_forever(self):
+        self.logger.info(f"Služba běží na {self.url}")
+        self._http_server.serve_forever()
+
+    def close(self):
+        """
+        Stops the server and finishes waiting requests
+        """
+        self._http_server.shutdown()
+        self._http_server.server_close()
+        for batcher in self._batchers.values():
+            batcher.close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def analyze(self, analysis, text):
+        """
+        Analyses text, request waits in queue for the next batch of the analysis
+        :param analysis: Name of analysis
+        :param text: Analysed text
+        :return: Result dictionary
+        """
+        batcher = self._batchers.get(analysis)
+        if batcher is None:
+            raise ValueError(f"Neznámá analýza '{analysis}', dostupné: {', '.join(self._batchers)}")
+        if not isinstance(text, str):
+            raise ValueError("Chybí text k analýze")
+
+        future = batcher.submit(text)
+        try:
+            result = future.result(self._request_timeout)
+        except futures.TimeoutError:
+            future.cancel()
+            raise
+
+        if "error" in result:
+            raise RuntimeError(result["error"])
+
+        return result
+
+    def parse(self, query, url=None, html=None):
+        """
+        Runs web parser query on page of URL (downloaded pages are cached) or on given HTML
+        :param query: Query, e.g. 'links' or 'tag:h1'
+        :param url: URL of page
+        :param html: HTML of page, it is used instead of URL
+        :return: Result dictionary
+        """
+        if not isinstance(query, str):
+            raise ValueError("Chybí dotaz")
+        name, argument = parse_query(query)
+        if html is None and not WebParser.is_url_valid(url or ""):
+            raise ValueError("Url není validní!")
+
+        if not self._parse_slots.acquire(blocking=False):
+            raise ServiceOverloadedError()
+        try:
+            if html is not None:
+                web_parser = WebParser.from_html(html)
+            else:
+                web_parser = self._page_cache.get(url, refresh=self._page_cache.is_stale(url)).web_parser
+
+            return {"result": [str(line) for line in QUERIES[name](web_parser, argument)]}
+        finally:
+            self._parse_slots.release()
+
+    def get_health(self):
+        """
+        :return: Dictionary with state of the service
+        """
+        return {"status": "ok",
+                "analyses": {name: dict(batcher.statistics, queued=batcher.queued)
+                             for name, batcher in self._batchers.items()},
+                "cached_pages": len(self._page_cache)}
@@ -0,0 +1,146 @@
+# Basic libraries
+import time
+import queue
+import threading
+from concurrent.futures import Future
+# App libraries
+from AdvancedLogging.logger import Logger
+
+
+class ServiceOverloadedError(Exception):
+    """
+    Raised when request queue is full, the request is rejected instead of waiting
+    """
+
+    def __init__(self):
+        super(ServiceOverloadedError, self).__init__("Služba je přetížena, zkuste to později")
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into batches, so one call of batch function (e.g. nlp.pipe) processes
+    more requests at once. A batch is processed when it is full or when its oldest request waited max_wait.
+    Requests wait in bounded queue, when it is full new requests are rejected (load shedding).
+    """
+
+    _STOP = object()
+
+    def __init__(self, process_batch, max_batch_size=32, max_wait=0.01, max_queue_size=256, name="MicroBatcher"):
+        """
+        :param process_batch: Function that gets list of items and returns list of results in the same order
+        :param max_batch_size: Maximal number of items in one batch
+        :param max_wait: Maximal time in seconds the first item of batch waits for other items
+        :param max_queue_size: Maximal number of waiting items
+        :param name: Name of the worker thread
+        """
+        self._process_batch = process_batch
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._logger = Logger(self.__class__.__name__)
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._items = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def queued(self):
+        return self._queue.qsize()
+
+    @property
+    def statistics(self):
+        """
+        :return: Dictionary with numbers of processed batches and items and average size of batch
+        """
+        with self._lock:
+            return {"batches": self._batches, "items": self._items,
+                    "average_batch_size": self._items / self._batches if self._batches else 0.0}
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def submit(self, item):
+        """
+        Adds item to the next batch
+        :param item: Item passed to batch function
+        :return: Future with result of the item, cancelled future is left out of its batch
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            raise ServiceOverloadedError()
+
+        return future
+
+    def close(self):
+        """
+        Processes already queued items and stops the worker thread
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            request = self._queue.get()
+            if request is self._STOP:
+                break
+
+            batch = [request]
+            deadline = time.perf_counter() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is self._STOP:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            self._process(batch)
+
+    def _process(self, batch):
+        # Requests whose clients stopped waiting are not processed
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            results = self._process_batch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"Batch function returned {len(results)} results for {len(batch)} items")
+        except Exception as ex:
+            self._logger.exception(f"Batch of {len(batch)} items failed: {ex}")
+            for _, future in batch:
+                future.set_exception(ex)
+            return
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(batch)
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
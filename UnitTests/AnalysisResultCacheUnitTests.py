@@ -0,0 +1,89 @@
+# Basic libraries
+import os
+import unittest
+import tempfile
+# App Libraries
+from NLP.result_cache import AnalysisResultCache, cached_analysis
+
+
+class _Analysis:
+    def __init__(self, text, result_cache):
+        self._text = text
+        self._result_cache = result_cache
+        self._cache_parameters = {"option": 1}
+        self.calls = 0
+
+    @cached_analysis
+    def get_words(self, limit=None):
+        self.calls += 1
+        return tuple(self._text.split()[:limit])
+
+
+class AnalysisResultCacheTests(unittest.TestCase):
+    """Tests for AnalysisResultCache class"""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, "cache.sqlite")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test__get__with_saved_result__should_return_hit(self):
+        cache = AnalysisResultCache(self._path, "v1")
+        cache.put("text", "ner", {"a": 1}, ("result",))
+
+        self.assertEqual(cache.get("text", "ner", {"a": 1}), (True, ("result",)))
+        self.assertEqual(cache.get("text", "ner", {"a": 2}), (False, None))
+        self.assertEqual(cache.get("other text", "ner", {"a": 1}), (False, None))
+        cache.close()
+
+    def test__init__with_other_model_version__should_invalidate_results(self):
+        cache = AnalysisResultCache(self._path, "v1")
+        cache.put("text", "ner", None, "result")
+        cache.close()
+
+        same_version = AnalysisResultCache(self._path, "v1")
+        self.assertEqual(same_version.get("text", "ner"), (True, "result"))
+        same_version.close()
+
+        new_version = AnalysisResultCache(self._path, "v2")
+        self.assertEqual(new_version.get("text", "ner"), (False, None))
+        self.assertEqual(new_version.size, 0)
+        new_version.close()
+
+    def test__put__over_size_limit__should_evict_least_recently_used(self):
+        cache = AnalysisResultCache(self._path, "v1", max_bytes=2500)
+        cache.put("first", "ner", None, "x" * 1000)
+        cache.put("second", "ner", None, "x" * 1000)
+        cache.get("first", "ner")
+        cache.put("third", "ner", None, "x" * 1000)
+
+        self.assertTrue(cache.get("first", "ner")[0])
+        self.assertFalse(cache.get("second", "ner")[0])
+        self.assertTrue(cache.get("third", "ner")[0])
+        self.assertLessEqual(cache.size, 2500)
+        cache.close()
+
+    def test__cached_analysis__with_same_text_and_parameters__should_compute_once(self):
+        cache = AnalysisResultCache(self._path, "v1")
+        analysis = _Analysis("a b c", cache)
+
+        self.assertEqual(analysis.get_words(2), ("a", "b"))
+        self.assertEqual(analysis.get_words(2), ("a", "b"))
+        self.assertEqual(analysis.get_words(1), ("a",))
+        self.assertEqual(analysis.calls, 2)
+        self.assertEqual(_Analysis("a b c", cache).get_words(2), ("a", "b"))
+        cache.close()
+
+    def test__cached_analysis__with_positional_keyword_and_default_argument__should_compute_once(self):
+        cache = AnalysisResultCache(self._path, "v1")
+        analysis = _Analysis("a b c", cache)
+
+        self.assertEqual(analysis.get_words(), ("a", "b", "c"))
+        self.assertEqual(analysis.get_words(None), ("a", "b", "c"))
+        self.assertEqual(analysis.get_words(limit=None), ("a", "b", "c"))
+        self.assertEqual(analysis.get_words(limit=2), ("a", "b"))
+        self.assertEqual(analysis.get_words(2), ("a", "b"))
+        self.assertEqual(analysis.calls, 2)
+        cache.close()
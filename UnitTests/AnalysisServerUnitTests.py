@@ -0,0 +1,95 @@
+# Basic libraries
+import json
+import time
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+# App Libraries
+from Service.analysis_server import AnalysisServer
+
+
+class AnalysisServerTests(unittest.TestCase):
+    """Integration tests for AnalysisServer running on localhost"""
+
+    def setUp(self):
+        self._batch_sizes = []
+        self._release = threading.Event()
+        self._release.set()
+        self._server = AnalysisServer(port=0, analyses={"upper": self._upper}, max_batch_size=16, max_wait=0.1,
+                                      max_queue_size=4)
+        self._server.start()
+
+    def tearDown(self):
+        self._release.set()
+        self._server.close()
+
+    def test__analyze__with_concurrent_requests__should_batch_them(self):
+        texts = [f"text {i}" for i in range(8)]
+
+        with ThreadPoolExecutor(8) as executor:
+            responses = list(executor.map(lambda text: self._post("/analyze", {"analysis": "upper", "text": text}),
+                                          texts))
+
+        self.assertEqual([body["result"] for _, body in responses], [[text.upper()] for text in texts])
+        self.assertLess(len(self._batch_sizes), len(texts))
+        self.assertEqual(sum(self._batch_sizes), len(texts))
+
+    def test__analyze__with_full_queue__should_return_503(self):
+        self._release.clear()
+        self._server.close()
+        self._server = AnalysisServer(port=0, analyses={"upper": self._upper}, max_batch_size=1, max_wait=0,
+                                      max_queue_size=2)
+        self._server.start()
+
+        with ThreadPoolExecutor(8) as executor:
+            responses = [executor.submit(self._post, "/analyze", {"analysis": "upper", "text": "a"})
+                         for _ in range(8)]
+            # Rejected requests are answered immediately, accepted ones wait for the blocked batch
+            time.sleep(0.5)
+            self._release.set()
+            statuses = [response.result(5)[0] for response in responses]
+
+        self.assertEqual(set(statuses), {200, 503})
+        self.assertLessEqual(statuses.count(200), 3)
+
+    def test__analyze__with_unknown_analysis__should_return_400(self):
+        status, body = self._post("/analyze", {"analysis": "unknown", "text": "a"})
+
+        self.assertEqual(status, 400)
+        self.assertIn("unknown", body["error"])
+
+    def test__parse__with_html__should_return_result_of_query(self):
+        status, body = self._post("/parse", {"query": "tag:h1", "html": "<html><body><h1>Nadpis</h1></body></html>"})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(body["result"], ["Nadpis"])
+
+    def test__health__should_return_statistics_of_analyses(self):
+        self._post("/analyze", {"analysis": "upper", "text": "a"})
+
+        with urllib.request.urlopen(self._server.url + "/health", timeout=5) as response:
+            body = json.loads(response.read().decode("utf-8"))
+
+        self.assertEqual(body["status"], "ok")
+        self.assertEqual(body["analyses"]["upper"]["items"], 1)
+
+    def _upper(self, texts):
+        self._release.wait(5)
+        self._batch_sizes.append(len(texts))
+
+        return [{"result": [text.upper()], "processed_text": None} for text in texts]
+
+    def _post(self, path, payload):
+        request = urllib.request.Request(self._server.url + path, json.dumps(payload).encode("utf-8"),
+                                         {"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as ex:
+            return ex.code, json.loads(ex.read().decode("utf-8"))
+
+
+if __name__ == '__main__':
+    unittest.main()
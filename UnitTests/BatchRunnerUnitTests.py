@@ -0,0 +1,83 @@
+# Basic libraries
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+# App Libraries
+from CLI import batch_runner
+from CLI.batch_runner import BatchItem, BatchRunner, parse_page, parse_query, read_text
+from CLI.result_writers import JsonLinesWriter
+from Instrumentation.metrics import METRICS
+
+
+class BatchRunnerTests(unittest.TestCase):
+    """Tests for headless batch mode"""
+
+    def test__parse_query__with_missing_argument__should_raise_error(self):
+        self.assertEqual(parse_query("tag:h1"), ("tag", "h1"))
+        self.assertRaises(ValueError, parse_query, "tag")
+        self.assertRaises(ValueError, parse_query, "links:2")
+        self.assertRaises(ValueError, parse_query, "unknown")
+
+    def test__parse_page__should_add_record_of_every_query(self):
+        item = BatchItem("http://a.cz", [], "<html><body><h1>Nadpis</h1><a href='http://b.cz'>b</a></body></html>")
+
+        parsed = parse_page(item, ["links", "tag:h1"])
+
+        self.assertEqual([(record["operation"], record["result"]) for record in parsed.records],
+                         [("links", ["http://b.cz"]), ("tag:h1", ["Nadpis"])])
+        self.assertIn("Nadpis", parsed.content)
+
+    def test__read_text__with_missing_file__should_record_error(self):
+        item = read_text(BatchItem("missing_file.txt", [], None))
+
+        self.assertIsNone(item.content)
+        self.assertEqual(item.records[0]["operation"], "read")
+        self.assertIsNotNone(item.records[0]["error"])
+
+    def test__run_text_files__without_analysis__should_raise_error(self):
+        self.assertRaises(ValueError, BatchRunner(None, queries=["links"]).run_text_files, ["a.txt"])
+
+    def test__run_text_files__with_worker_processes__should_merge_their_metrics(self):
+        records = []
+        counter = METRICS.counter("batch_runner_test_words_total")
+        counter.reset()
+
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.dict(batch_runner.ANALYSES, {"words": _count_words}):
+            paths = []
+            for i in range(4):
+                paths.append(os.path.join(directory, f"{i}.txt"))
+                with open(paths[-1], "w", encoding="utf-8") as f:
+                    f.write("a b c")
+
+            BatchRunner(_ListWriter(records), analyses=["words"], workers=2).run_text_files(paths)
+
+        self.assertEqual([record["result"] for record in records], [["a", "b", "c"]] * 4)
+        self.assertEqual(counter.value, 12)
+
+    def test__json_lines_writer__should_write_record_per_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            with JsonLinesWriter(path) as writer:
+                writer.write({"source": "a", "result": ["ř"]})
+                writer.write({"source": "b", "result": []})
+
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual([json.loads(line)["source"] for line in f], ["a", "b"])
+
+
+class _ListWriter:
+    def __init__(self, records):
+        self.write = records.append
+
+
+def _count_words(nlp_service):
+    words = nlp_service.text.split()
+    METRICS.counter("batch_runner_test_words_total").inc(len(words))
+    return words, None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# Basic libraries
+import unittest
+# App Libraries
+from NLP.corpus_key_terms import CorpusKeyTermEngine
+# Third-party libraries
+import numpy as np
+
+
+class CorpusKeyTermEngineTests(unittest.TestCase):
+    """Tests for CorpusKeyTermEngine class"""
+
+    def test__add_document__with_pages__should_count_document_frequency(self):
+        engine = self._get_engine()
+
+        idf = engine.get_idf()
+
+        self.assertEqual(len(engine), 3)
+        self.assertEqual(engine.get_matrix().shape, (3, engine.vocabulary_size))
+        self.assertLess(idf[engine._vocabulary["page"]], idf[engine._vocabulary["python"]])
+
+    def test__add_document__with_matrix_held_by_caller__should_keep_the_matrix_unchanged(self):
+        engine = CorpusKeyTermEngine(ngrams=(1,), tokenize=str.split)
+        engine.add_document("a", "page python")
+        matrix = engine.get_matrix()
+
+        for i in range(CorpusKeyTermEngine.INITIAL_CAPACITY):
+            engine.add_document(f"page{i}", f"page word{i} other{i}")
+
+        self.assertEqual(matrix.shape, (1, 2))
+        self.assertEqual(matrix.toarray().tolist(), [[1.0, 1.0]])
+        self.assertEqual(engine.get_matrix().shape, (CorpusKeyTermEngine.INITIAL_CAPACITY + 1, engine.vocabulary_size))
+        self.assertEqual(engine.get_matrix().sum(), 3 * CorpusKeyTermEngine.INITIAL_CAPACITY + 2)
+
+    def test__get_all_key_terms__with_common_term__should_prefer_distinctive_terms(self):
+        engine = self._get_engine()
+
+        result = engine.get_all_key_terms(k=1)
+
+        self.assertEqual(result, {"a": [("python", result["a"][0][1])],
+                                  "b": [("java", result["b"][0][1])],
+                                  "c": [("rust", result["c"][0][1])]})
+
+    def test__get_all_key_terms__with_k__should_match_per_page_scoring(self):
+        engine = self._get_engine()
+
+        result = engine.get_all_key_terms(k=3)
+
+        for page, text in self._get_pages():
+            expected = engine.get_key_terms(text, k=3)
+            self.assertEqual([term for term, _ in result[page]], [term for term, _ in expected])
+            np.testing.assert_allclose([score for _, score in result[page]], [score for _, score in expected],
+                                       rtol=1e-5)
+
+    def test__get_key_terms__with_unknown_words__should_skip_them(self):
+        engine = self._get_engine()
+
+        self.assertEqual(engine.get_key_terms("unknown words only"), [])
+
+    def _get_engine(self):
+        engine = CorpusKeyTermEngine(ngrams=(1,), tokenize=str.split)
+        for page, text in self._get_pages():
+            engine.add_document(page, text)
+
+        return engine
+
+    @staticmethod
+    def _get_pages():
+        return (("a", "page python python code"),
+                ("b", "page java code"),
+                ("c", "page rust rust rust"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# Basic libraries
+import pickle
+import unittest
+import tempfile
+# App Libraries
+from NLP.entity_store import EntityStore
+from NLP.nlp_result import NamedEntity
+
+
+class NamedEntityTests(unittest.TestCase):
+    """Tests for NamedEntity class"""
+
+    def test__eq__with_same_label_and_text__should_deduplicate(self):
+        entities = {NamedEntity("ORG", "Google"), NamedEntity("ORG", "Google"), NamedEntity("PERSON", "Google")}
+
+        self.assertEqual(len(entities), 2)
+
+    def test__pickle__with_entity__should_keep_equality(self):
+        entity = NamedEntity("ORG", "Google")
+
+        loaded = pickle.loads(pickle.dumps(entity))
+
+        self.assertEqual(loaded, entity)
+        self.assertEqual(repr(loaded), "ORG - Google")
+
+
+class EntityStoreTests(unittest.TestCase):
+    """Tests for EntityStore class"""
+
+    def test__get_top_entities__with_label__should_count_occurrences(self):
+        store = self._get_store()
+
+        self.assertEqual(store.get_top_entities("ORG", k=2),
+                         [(NamedEntity("ORG", "Google"), 3), (NamedEntity("ORG", "Seznam"), 2)])
+
+    def test__get_top_entities__by_documents__should_count_documents(self):
+        store = self._get_store()
+
+        self.assertEqual(store.get_top_entities("ORG", k=1, by_documents=True), [(NamedEntity("ORG", "Seznam"), 2)])
+
+    def test__count_by_label__with_distinct__should_count_distinct_texts(self):
+        store = self._get_store()
+
+        self.assertEqual(store.count_by_label(), [("ORG", 5), ("PERSON", 1)])
+        self.assertEqual(store.count_by_label(distinct=True), [("ORG", 2), ("PERSON", 1)])
+
+    def test__remove__with_document__should_drop_its_occurrences(self):
+        store = self._get_store()
+
+        store.remove("b")
+
+        self.assertEqual(len(store), 5)
+        self.assertEqual(store.get_documents(NamedEntity("ORG", "Seznam")), [("a", 1)])
+        self.assertEqual(store.get_entities("b"), ())
+
+    def test__load__with_saved_store__should_return_same_results(self):
+        store = self._get_store()
+
+        with tempfile.TemporaryDirectory() as directory:
+            store.save(directory)
+            loaded = EntityStore.load(directory)
+
+        self.assertEqual(loaded.get_top_entities(k=3), store.get_top_entities(k=3))
+        self.assertEqual(loaded.get_entities("a"), (NamedEntity("ORG", "Google"), NamedEntity("ORG", "Seznam"),
+                                                    NamedEntity("PERSON", "Jan Novák")))
+
+    @staticmethod
+    def _get_store():
+        store = EntityStore()
+        store.add("a", [("ORG", "Google", 0, 6), ("ORG", "Google", 20, 26), ("ORG", "Google", 40, 46),
+                        ("ORG", "Seznam", 50, 56), ("PERSON", "Jan Novák", 60, 69)])
+        store.add("b", [("ORG", "Seznam", 0, 6)])
+
+        return store
+
+
+if __name__ == '__main__':
+    unittest.main()
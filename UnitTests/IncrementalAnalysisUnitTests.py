@@ -0,0 +1,79 @@
+# Basic libraries
+import os
+import re
+import tempfile
+import unittest
+from unittest import mock
+# App Libraries
+from NLP import nlp_service
+from NLP.incremental_analysis import IncrementalAnalyzer
+from NLP.nlp_service import NLPService
+from NLP.result_cache import AnalysisResultCache
+
+PARAGRAPHS = ["Alpha Beta went to Gamma.", "Delta\nEpsilon met Zeta there.", "Eta stayed home.",
+              "Theta Iota wrote to Kappa Lambda.", "Mu arrived late."]
+MAX_CHUNK_LENGTH = 60
+
+
+class IncrementalAnalyzerTests(unittest.TestCase):
+    """Tests for IncrementalAnalyzer class"""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._cache = AnalysisResultCache(os.path.join(self._directory.name, "cache.sqlite"), "v1")
+        # Fake analyses depend on context, entity of capitalized words may continue in the next paragraph
+        patches = [mock.patch.object(nlp_service, "_named_entity_recognition_chunk", _entities_chunk),
+                   mock.patch.object(nlp_service, "_n_grams_chunk", _n_grams_chunk),
+                   mock.patch.object(nlp_service, "_bag_of_terms_chunk", _bag_of_terms_chunk),
+                   mock.patch.dict(nlp_service._PARTIAL_ANALYSES, {"named_entity_recognition": _entities_chunk,
+                                                                  "n_grams": _n_grams_chunk,
+                                                                  "bag_of_terms": _bag_of_terms_chunk})]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self._cache.close()
+        self._directory.cleanup()
+
+    def test__analyses__with_multi_paragraph_text__should_equal_nlp_service(self):
+        text = "\n\n".join(PARAGRAPHS)
+        service = NLPService(text, max_chunk_length=MAX_CHUNK_LENGTH)
+        analyzer = IncrementalAnalyzer(self._cache, MAX_CHUNK_LENGTH)
+
+        self.assertGreater(len(analyzer.split_blocks(text)), 2)
+        self.assertEqual(set(analyzer.get_named_entity_recognition(text)),
+                         set(service.get_named_entity_recognition()))
+        self.assertEqual(analyzer.get_n_grams(text), service.get_n_grams())
+        self.assertEqual(analyzer.get_bag_of_terms(text), service.get_bag_of_terms())
+
+    def test__get_named_entity_recognition__with_changed_paragraph__should_analyse_only_changed_blocks(self):
+        text = "\n\n".join(PARAGRAPHS)
+        changed_text = "\n\n".join(PARAGRAPHS[:-1] + ["Nu arrived late."])
+        analyzer = IncrementalAnalyzer(self._cache, MAX_CHUNK_LENGTH)
+        analyzer.get_named_entity_recognition(text)
+        computed_blocks = analyzer.computed_blocks
+
+        result = analyzer.get_named_entity_recognition(changed_text)
+
+        self.assertEqual(len(analyzer.get_changed_blocks(text, changed_text)), 1)
+        self.assertEqual(analyzer.computed_blocks - computed_blocks, 1)
+        self.assertEqual(set(result), set(NLPService(changed_text, max_chunk_length=MAX_CHUNK_LENGTH)
+                                          .get_named_entity_recognition()))
+
+
+def _entities_chunk(text):
+    return [("ENTITY", re.sub(r"\s+", " ", entity)) for entity in re.findall(r"[A-Z]\w+(?:\s+[A-Z]\w+)*", text)]
+
+
+def _n_grams_chunk(text):
+    words = text.lower().split()
+    return [f"{first} {second}" for first, second in zip(words, words[1:])], text.lower()
+
+
+def _bag_of_terms_chunk(text):
+    return {word: text.lower().split().count(word) for word in text.lower().split()}, text.lower()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# Basic libraries
+import unittest
+import tempfile
+# App Libraries
+from Search.inverted_index import InvertedIndex
+from Search.postings import encode_varints, decode_varints
+from Search.query_parser import parse_query, TermQuery, PhraseQuery, AndQuery, OrQuery
+# Third-party libraries
+import numpy as np
+
+
+class PostingsTests(unittest.TestCase):
+    """Tests for compression of postings"""
+
+    def test__decode_varints__with_encoded_values__should_return_original_values(self):
+        values = np.array([0, 1, 127, 128, 300, 2 ** 40])
+
+        encoded = encode_varints(values)
+
+        self.assertEqual(len(encoded), 1 + 1 + 1 + 2 + 2 + 6)
+        np.testing.assert_array_equal(decode_varints(encoded), values)
+
+
+class QueryParserTests(unittest.TestCase):
+    """Tests for parse_query function"""
+
+    def test__parse_query__with_operators__should_respect_priority(self):
+        query = parse_query('Web AND "text analysis" OR java NOT python')
+
+        self.assertEqual(query, OrQuery((AndQuery((TermQuery("web"), PhraseQuery(("text", "analysis"))), ()),
+                                         AndQuery((TermQuery("java"),), (TermQuery("python"),)))))
+
+    def test__parse_query__with_missing_parenthesis__should_raise(self):
+        with self.assertRaises(ValueError):
+            parse_query("(web OR java")
+
+    def test__parse_query__with_empty_parts__should_leave_them_out(self):
+        self.assertEqual(parse_query('python OR ??? AND "" OR (NOT)'), TermQuery("python"))
+        for query in ("???", '""', "AND", "()", "NOT ???"):
+            self.assertIsNone(parse_query(query))
+
+
+class InvertedIndexTests(unittest.TestCase):
+    """Tests for InvertedIndex class"""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test__search__with_term__should_rank_by_bm25(self):
+        index = self._get_index()
+
+        result = index.search("python")
+
+        self.assertEqual([key for key, _ in result], ["c", "a"])
+        self.assertGreater(result[0][1], result[1][1])
+
+    def test__search__with_query_without_words__should_return_empty_list(self):
+        index = self._get_index()
+
+        self.assertEqual(index.search("??? AND"), [])
+        self.assertEqual([key for key, _ in index.search("python OR")], ["c", "a"])
+
+    def test__search__with_phrase__should_match_only_following_terms(self):
+        index = self._get_index()
+
+        self.assertEqual([key for key, _ in index.search('"web parsing"')], ["a"])
+        self.assertEqual(index.search('"parsing web"'), [])
+
+    def test__search__with_boolean_query__should_filter_pages(self):
+        index = self._get_index()
+
+        self.assertEqual(sorted(key for key, _ in index.search("web NOT java")), ["a", "c"])
+        self.assertEqual(sorted(key for key, _ in index.search("java OR nothing")), ["b", "d"])
+        self.assertEqual([key for key, _ in index.search("NOT web")], ["d"])
+
+    def test__add__with_merged_segments__should_replace_page_and_survive_reopening(self):
+        index = self._get_index()
+        index.add("b", "python only now")
+        index.delete("d")
+        index.commit()
+
+        reopened = InvertedIndex(self._directory.name, buffer_documents=2, merge_factor=2)
+
+        self.assertEqual(len(reopened), 3)
+        self.assertEqual(reopened.search("java"), [])
+        self.assertEqual(sorted(key for key, _ in reopened.search("python")), ["a", "b", "c"])
+        self.assertEqual(reopened.search("nothing"), [])
+
+    def _get_index(self):
+        index = InvertedIndex(self._directory.name, buffer_documents=2, merge_factor=2)
+        index.add("a", "Python web parsing and text analysis")
+        index.add("b", "Java web server")
+        index.add("c", "Python text analysis of web pages in python")
+        index.add("d", "nothing here")
+        index.commit()
+
+        return index
+
+
+if __name__ == '__main__':
+    unittest.main()
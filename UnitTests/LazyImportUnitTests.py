@@ -0,0 +1,31 @@
+# Basic libraries
+import unittest
+# App Libraries
+from NLP.lazy_import import LazyImport, get_import_times
+
+
+class LazyImportTests(unittest.TestCase):
+    """Tests for LazyImport class"""
+
+    def test__init__should_not_import_module(self):
+        proxy = LazyImport("json.decoder", "JSONDecoder")
+
+        self.assertFalse(proxy.is_imported)
+
+    def test__call__with_attribute__should_import_module_and_record_time(self):
+        proxy = LazyImport("json", "dumps")
+
+        result = proxy([1, 2])
+
+        self.assertEqual(result, "[1, 2]")
+        self.assertTrue(proxy.is_imported)
+        self.assertIn("json", get_import_times())
+
+    def test__getattr__should_return_attribute_of_module(self):
+        proxy = LazyImport("os.path")
+
+        self.assertEqual(proxy.join("a", "b"), "a/b" if proxy.sep == "/" else "a\\b")
+
+
+if __name__ == '__main__':
+    unittest.main()
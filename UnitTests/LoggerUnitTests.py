@@ -0,0 +1,90 @@
+# Basic libraries
+import io
+import os
+import json
+import tempfile
+import unittest
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+# App Libraries
+from AdvancedLogging.logger import Logger
+
+
+class LoggerTests(unittest.TestCase):
+    """Tests for Logger class"""
+
+    def setUp(self):
+        self._stream = io.StringIO()
+        Logger.configure(stream=self._stream, json_format=False)
+
+    def tearDown(self):
+        Logger.configure()
+
+    def test__init__with_same_name__should_write_record_once(self):
+        Logger("LoggerTests.same")
+        logger = Logger("LoggerTests.same")
+
+        logger.info("message")
+
+        lines = self._get_lines()
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].endswith("LoggerTests.same - INFO - message"))
+
+    def test__progress__within_interval__should_log_first_and_final_message(self):
+        logger = Logger("LoggerTests.progress", progress_interval=60)
+
+        for i in range(1, 1001):
+            logger.progress("Links:%d/%d", i, 1000, final=i == 1000)
+
+        lines = self._get_lines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith("Links:1/1000"))
+        self.assertTrue(lines[1].endswith("Links:1000/1000 (+998 vynecháno)"))
+
+    def test__configure__with_json_format__should_write_json_lines(self):
+        Logger.configure(stream=self._stream, json_format=True)
+        logger = Logger("LoggerTests.json")
+
+        logger.info("page %s", "a.cz", extra={"url": "http://a.cz"})
+        try:
+            raise ValueError("chyba")
+        except ValueError:
+            logger.exception("failed")
+
+        records = [json.loads(line) for line in self._get_lines()]
+        self.assertEqual([(record["level"], record["message"]) for record in records],
+                         [("INFO", "page a.cz"), ("ERROR", "failed")])
+        self.assertEqual(records[0]["url"], "http://a.cz")
+        self.assertIn("ValueError: chyba", records[1]["exception"])
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Fork is not available")
+    def test__worker_processes__with_record_queued_before_fork__should_write_every_record_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "log.txt")
+            with open(path, "w", buffering=1, encoding="utf-8") as stream:
+                Logger.configure(stream=stream, json_format=False)
+                Logger("LoggerTests.fork").info("before pool")
+
+                with ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("fork")) as executor:
+                    self.assertEqual(list(executor.map(_log_in_worker, range(4))), list(range(4)))
+                Logger.configure()
+
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual(sum(line.endswith("before pool") for line in lines), 1)
+        for i in range(4):
+            self.assertEqual(sum(line.endswith(f"in worker {i}") for line in lines), 1)
+
+    def _get_lines(self):
+        Logger.flush()
+        return self._stream.getvalue().splitlines()
+
+
+def _log_in_worker(i):
+    Logger("LoggerTests.worker").info("in worker %d", i)
+    return i
+
+
+if __name__ == '__main__':
+    unittest.main()
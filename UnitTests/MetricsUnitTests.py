@@ -0,0 +1,97 @@
+# Basic libraries
+import os
+import tempfile
+import unittest
+# App Libraries
+from Instrumentation.metrics import METRICS, Histogram, MetricsRegistry
+from WebParsing.web_parser import WebParser
+
+
+class MetricsTests(unittest.TestCase):
+    """Tests for metrics registry"""
+
+    def test__histogram__should_estimate_quantiles_from_buckets(self):
+        histogram = Histogram(buckets=(1, 2, 3, 4))
+
+        for value in (0.5, 1.5, 1.5, 2.5, 3.5, 3.5, 3.5, 3.5):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot["count"], 8)
+        self.assertAlmostEqual(snapshot["sum"], 20.0)
+        self.assertEqual((snapshot["min"], snapshot["max"]), (0.5, 3.5))
+        self.assertTrue(2 <= snapshot["p50"] <= 3)
+        self.assertTrue(3 <= snapshot["p95"] <= 3.5)
+
+    def test__timed__should_observe_every_call(self):
+        registry = MetricsRegistry()
+
+        @registry.timed("stage_seconds", stage="test")
+        def function(value):
+            return value * 2
+
+        self.assertEqual([function(i) for i in range(3)], [0, 2, 4])
+        self.assertEqual(registry.histogram("stage_seconds", stage="test").count, 3)
+
+    def test__to_prometheus_text__should_contain_cumulative_buckets_and_counters(self):
+        registry = MetricsRegistry()
+        registry.counter("pages_total", "Downloaded pages").inc(3)
+        histogram = registry.histogram("stage_seconds", buckets=(0.1, 1.0), stage='a"b')
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        lines = registry.to_prometheus_text().splitlines()
+
+        self.assertIn("# HELP pages_total Downloaded pages", lines)
+        self.assertIn("pages_total 3", lines)
+        self.assertIn('stage_seconds_bucket{stage="a\\"b",le="0.1"} 1', lines)
+        self.assertIn('stage_seconds_bucket{stage="a\\"b",le="+Inf"} 2', lines)
+        self.assertIn('stage_seconds_count{stage="a\\"b"} 2', lines)
+
+    def test__merge_state__with_state_of_other_registry__should_add_values(self):
+        registry, worker_registry = MetricsRegistry(), MetricsRegistry()
+        registry.counter("pages_total", "Downloaded pages").inc(2)
+        registry.histogram("stage_seconds", buckets=(0.1, 1.0), stage="a").observe(0.5)
+        worker_registry.counter("pages_total").inc(3)
+        worker_registry.histogram("stage_seconds", buckets=(0.1, 1.0), stage="a").observe(0.05)
+        worker_registry.histogram("stage_seconds", buckets=(0.1, 1.0), stage="b").observe(2.0)
+
+        registry.merge_state(worker_registry.get_state(reset=True))
+
+        self.assertEqual(registry.counter("pages_total").value, 5)
+        histogram = registry.histogram("stage_seconds", stage="a")
+        self.assertEqual(histogram.get_bucket_counts(), [1, 1, 0])
+        self.assertEqual((histogram.snapshot()["min"], histogram.snapshot()["max"]), (0.05, 0.5))
+        self.assertEqual(registry.histogram("stage_seconds", stage="b").count, 1)
+        self.assertEqual(worker_registry.counter("pages_total").value, 0)
+        self.assertEqual(worker_registry.histogram("stage_seconds", stage="b").count, 0)
+
+    def test__histogram__with_other_type_of_same_name__should_raise_error(self):
+        registry = MetricsRegistry()
+        registry.counter("pages_total")
+
+        self.assertRaises(ValueError, registry.histogram, "pages_total")
+
+    def test__from_html__should_count_parsed_page(self):
+        parse_time = METRICS.histogram("web_parser_stage_seconds", stage="parse")
+        count = parse_time.count
+
+        WebParser.from_html("<html><body>text</body></html>")
+
+        self.assertEqual(parse_time.count, count + 1)
+
+    def test__dump_prometheus__should_write_file(self):
+        registry = MetricsRegistry()
+        registry.counter("pages_total").inc()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.prom")
+            registry.dump_prometheus(path)
+
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("pages_total 1", f.read())
+            self.assertEqual(os.listdir(directory), ["metrics.prom"])
+
+
+if __name__ == '__main__':
+    unittest.main()
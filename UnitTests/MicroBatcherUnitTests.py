@@ -0,0 +1,64 @@
+# Basic libraries
+import time
+import threading
+import unittest
+# App Libraries
+from Service.micro_batcher import MicroBatcher, ServiceOverloadedError
+
+
+class MicroBatcherTests(unittest.TestCase):
+    """Tests for MicroBatcher class"""
+
+    def setUp(self):
+        self._batches = []
+
+    def test__submit__with_concurrent_items__should_process_them_in_one_batch(self):
+        batcher = MicroBatcher(self._process, max_batch_size=10, max_wait=0.2)
+
+        results = [future.result(5) for future in [batcher.submit(i) for i in range(5)]]
+        batcher.close()
+
+        self.assertEqual(results, [0, 2, 4, 6, 8])
+        self.assertEqual(self._batches, [[0, 1, 2, 3, 4]])
+
+    def test__submit__over_max_batch_size__should_split_batches(self):
+        batcher = MicroBatcher(self._process, max_batch_size=2, max_wait=0.2)
+
+        for future in [batcher.submit(i) for i in range(5)]:
+            future.result(5)
+        batcher.close()
+
+        self.assertEqual(self._batches, [[0, 1], [2, 3], [4]])
+
+    def test__submit__with_full_queue__should_raise_overloaded_error(self):
+        release = threading.Event()
+        batcher = MicroBatcher(lambda items: release.wait(5) and items, max_batch_size=1, max_wait=0,
+                               max_queue_size=1)
+        first = batcher.submit(1)
+        # The first item is taken by the worker, the second one fills the queue
+        while batcher.queued:
+            time.sleep(0.01)
+        second = batcher.submit(2)
+
+        self.assertRaises(ServiceOverloadedError, batcher.submit, 3)
+        release.set()
+        self.assertEqual((first.result(5), second.result(5)), (1, 2))
+        batcher.close()
+
+    def test__submit__with_failing_batch__should_set_exception_of_all_items(self):
+        batcher = MicroBatcher(lambda items: 1 / 0, max_batch_size=10, max_wait=0.2)
+
+        submitted = [batcher.submit(i) for i in range(3)]
+        batcher.close()
+
+        for future in submitted:
+            self.assertRaises(ZeroDivisionError, future.result, 5)
+
+    def _process(self, items):
+        self._batches.append(items)
+
+        return [item * 2 for item in items]
+
+
+if __name__ == '__main__':
+    unittest.main()
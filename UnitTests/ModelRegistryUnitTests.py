@@ -0,0 +1,63 @@
+# Basic libraries
+import os
+import tempfile
+import unittest
+# App Libraries
+from NLP.model_registry import ModelRegistry
+from Pipeline.pipeline_runner import PipelineRunner, Stage
+# Third-party libraries
+import numpy as np
+import spacy
+
+WORDS = ["python", "web", "parser"]
+
+
+class ModelRegistryTests(unittest.TestCase):
+    """Tests for ModelRegistry class"""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._model = os.path.join(self._directory.name, "model")
+        self._shared = os.path.join(self._directory.name, "shared")
+        lang = spacy.blank("en")
+        for i, word in enumerate(WORDS):
+            lang.vocab.set_vector(word, np.arange(4, dtype=np.float32) + i)
+        lang.to_disk(self._model)
+
+    def tearDown(self):
+        ModelRegistry.attach_shared_vectors(None)
+        self._directory.cleanup()
+
+    def test__attach_shared_vectors__should_load_model_with_exported_vectors(self):
+        self.assertFalse(ModelRegistry.has_shared_vectors(self._model, self._shared))
+        ModelRegistry.export_shared_vectors(self._model, self._shared)
+        self.assertTrue(ModelRegistry.has_shared_vectors(self._model, self._shared))
+
+        ModelRegistry.attach_shared_vectors(self._shared)
+        lang = ModelRegistry.get_spacy_lang(self._model)
+
+        self.assertIsInstance(lang.vocab.vectors.data, np.memmap)
+        self.assertEqual(_get_vectors(self._model), [list(np.arange(4.0) + i) for i in range(len(WORDS))])
+
+    def test__run__with_worker_processes__should_use_shared_vectors_in_workers(self):
+        ModelRegistry.export_shared_vectors(self._model, self._shared)
+        ModelRegistry.attach_shared_vectors(self._shared)
+        results = {}
+        runner = PipelineRunner([Stage("vectors", _get_vectors, workers=2, processes=True,
+                                       initializer=ModelRegistry.attach_shared_vectors, initargs=(self._shared,))],
+                                results.__setitem__)
+
+        runner.run((i, self._model) for i in range(2))
+
+        self.assertEqual(results, {i: _get_vectors(self._model) for i in range(2)})
+
+
+def _get_vectors(model):
+    lang = ModelRegistry.get_spacy_lang(model)
+    assert ModelRegistry.get_shared_vectors_directory() is not None
+    assert isinstance(lang.vocab.vectors.data, np.memmap)
+    return [lang.vocab[word].vector.tolist() for word in WORDS]
+
+
+if __name__ == '__main__':
+    unittest.main()
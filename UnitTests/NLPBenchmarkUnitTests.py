@@ -0,0 +1,106 @@
+# Basic libraries
+import os
+import time
+import tempfile
+import unittest
+from contextlib import contextmanager
+# App Libraries
+from Benchmarks import nlp_benchmark
+from Benchmarks.nlp_benchmark import generate_corpus, run_benchmark, save_results, load_results, find_regressions
+from Benchmarks.summarization_benchmark import load_sample_sentences
+# Third-party libraries
+from gensim.corpora import Dictionary
+
+
+class NLPBenchmarkTests(unittest.TestCase):
+    """Tests for benchmark of NLP analyses"""
+
+    def test__generate_corpus__with_pages__should_split_words_and_be_deterministic(self):
+        pages = generate_corpus(1003, 4)
+
+        self.assertEqual(len(pages), 4)
+        self.assertEqual(sum(len(page.split()) for page in pages), 1003)
+        self.assertEqual(pages, generate_corpus(1003, 4))
+        self.assertNotEqual(pages[0], pages[1])
+
+    def test__generate_corpus__should_use_words_of_sample_text(self):
+        sample_words = {word.strip(".").lower() for sentence in load_sample_sentences() for word in sentence.split()}
+
+        pages = generate_corpus(500, 2)
+
+        self.assertTrue({word.strip(".").lower() for page in pages for word in page.split()} <= sample_words)
+        self.assertTrue(any(name in " ".join(pages) for name in ("Paris", "London", "Berlin", "NASA", "Apple")))
+
+    def test__measure__with_prepared_call__should_not_measure_preparation(self):
+        calls = []
+
+        seconds, _ = nlp_benchmark.measure(_PreparedAnalysis(calls), ["a", "b"])
+
+        self.assertLess(seconds, 0.1)
+        self.assertEqual(calls, ["a", "b", "a", "b"])
+
+    def test__run_benchmark__with_failing_analysis__should_record_error_and_continue(self):
+        analyses = {"words": lambda page: page.split(), "failing": _fail}
+
+        results = run_benchmark((100, 1000), (1, 2), analyses)
+
+        self.assertEqual(len(results), 8)
+        words_results = [result for result in results if result["analysis"] == "words"]
+        self.assertTrue(all(result["seconds"] >= 0 and result["peak_memory"] > 0 for result in words_results))
+        failing_results = [result for result in results if result["analysis"] == "failing"]
+        self.assertTrue(all(result["error"] == "Model není dostupný" for result in failing_results))
+
+    def test__measure__with_topic_model__should_train_it_in_every_run(self):
+        documents = [["python", "code", "web"], ["java", "code", "page"], ["rust", "web", "page"]]
+        dictionary = Dictionary(documents)
+        corpus = [dictionary.doc2bow(document) for document in documents]
+        trained = []
+
+        def train_topics(nlp_service):
+            store = nlp_service.topic_model_store
+            trained.append(not store.has_model("topics"))
+            store.get_or_train("topics", corpus, dictionary, number_topic=2, passes=1)
+
+        nlp_benchmark.measure(nlp_benchmark._ServiceAnalysis(train_topics), generate_corpus(50), repeat=2)
+
+        self.assertEqual(trained, [True, True, True])
+
+    def test__save_results__should_be_loaded_by_load_results(self):
+        results = run_benchmark((100,), (1,), {"words": lambda page: page.split()}, trace_memory=False)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            save_results(path, results)
+
+            self.assertEqual(load_results(path), results)
+
+    def test__find_regressions__with_slower_and_failing_analyses__should_report_them(self):
+        baseline = [_result("ner", 1.0, 1000), _result("n-grams", 1.0, 1000), _result("topics", 0.01, 1000),
+                    _result("summarization", 1.0, 1000)]
+        current = [_result("ner", 1.1, 1000), _result("n-grams", 2.0, 3000), _result("topics", 0.05, 1000),
+                   _result("summarization", None, None, "Chyba")]
+
+        regressions = find_regressions(baseline, current, time_threshold=0.25, memory_threshold=0.25)
+
+        self.assertEqual(sorted((regression["analysis"], regression["metric"]) for regression in regressions),
+                         [("n-grams", "peak_memory"), ("n-grams", "seconds"), ("summarization", "error")])
+
+
+class _PreparedAnalysis:
+    def __init__(self, calls):
+        self._calls = calls
+
+    @contextmanager
+    def prepare(self, page):
+        time.sleep(0.1)
+        yield lambda: self._calls.append(page)
+        time.sleep(0.1)
+
+
+def _fail(page):
+    raise RuntimeError("Model není dostupný")
+
+
+def _result(analysis, seconds, peak_memory, error=None):
+    return {"analysis": analysis, "words": 1000, "pages": 1, "seconds": seconds, "peak_memory": peak_memory,
+            "error": error}
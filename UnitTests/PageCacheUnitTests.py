@@ -0,0 +1,79 @@
+# Basic libraries
+import time
+import unittest
+import threading
+# App Libraries
+from WebParsing.page_cache import PageCache
+from WebParsing.web_parser import WebParser
+
+
+class PageCacheTests(unittest.TestCase):
+    """Tests for PageCache class"""
+
+    def setUp(self):
+        self._loaded_urls = []
+
+    def test__get__with_cached_url__should_load_page_once(self):
+        cache = PageCache(loader=self._load)
+
+        first = cache.get("http://a.cz")
+        second = cache.get("http://a.cz")
+
+        self.assertIs(first, second)
+        self.assertEqual(self._loaded_urls, ["http://a.cz"])
+
+    def test__get__with_refresh__should_load_page_again(self):
+        cache = PageCache(loader=self._load)
+        first = cache.get("http://a.cz")
+
+        refreshed = cache.get("http://a.cz", refresh=True)
+
+        self.assertIsNot(first, refreshed)
+        self.assertEqual(len(self._loaded_urls), 2)
+        self.assertEqual(cache.size, refreshed.web_parser.page_size)
+
+    def test__get__with_concurrent_requests__should_load_page_once(self):
+        cache = PageCache(loader=self._load_slowly)
+
+        threads = [threading.Thread(target=cache.get, args=("http://a.cz",)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self._loaded_urls, ["http://a.cz"])
+
+    def test__get__over_size_limit__should_drop_least_recently_used_page(self):
+        cache = PageCache(max_bytes=150, loader=self._load)
+        cache.get("http://a.cz")
+        cache.get("http://b.cz")
+        cache.get("http://a.cz")
+
+        cache.get("http://c.cz")
+
+        self.assertTrue(cache.contains("http://a.cz"))
+        self.assertFalse(cache.contains("http://b.cz"))
+        self.assertTrue(cache.contains("http://c.cz"))
+
+    def test__is_stale__with_old_page__should_return_true(self):
+        cache = PageCache(max_age=0.01, loader=self._load)
+        cache.get("http://a.cz")
+
+        time.sleep(0.02)
+
+        self.assertTrue(cache.is_stale("http://a.cz"))
+        self.assertFalse(cache.is_stale("http://b.cz"))
+
+    def _load(self, url):
+        self._loaded_urls.append(url)
+
+        return WebParser.from_html(f"<html><body>{url}{' ' * 20}</body></html>")
+
+    def _load_slowly(self, url):
+        time.sleep(0.05)
+
+        return self._load(url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# Basic libraries
+import os
+import json
+import tempfile
+import unittest
+# App Libraries
+from NLP.page_corpus import PageCorpus, SparseCorpus
+from NLP.topic_model_store import TopicModelStore
+
+TEXTS = ["python code web parser", "java code class parser", "rust web memory page", "python page web text"]
+
+
+class PageCorpusTests(unittest.TestCase):
+    """Tests for PageCorpus and SparseCorpus classes"""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, "corpus")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test__build__with_jsonl_pages__should_be_reopened_by_load(self):
+        corpus, dictionary = SparseCorpus.build(self._path, self._get_jsonl_corpus(TEXTS), no_below=2, no_above=1.0)
+
+        loaded_corpus, loaded_dictionary = SparseCorpus.load(self._path)
+        self.assertEqual(len(loaded_corpus), len(TEXTS))
+        self.assertEqual(loaded_corpus.num_terms, len(dictionary))
+        self.assertEqual(dict(loaded_dictionary.token2id), dict(dictionary.token2id))
+        self.assertEqual(list(loaded_corpus), [dictionary.doc2bow(text.split()) for text in TEXTS])
+        self.assertEqual(list(loaded_corpus), list(corpus))
+        self.assertFalse(os.path.exists(self._path + ".tokens"))
+
+    def test__iter__with_directory_of_texts__should_yield_pages_in_order_of_files(self):
+        pages = os.path.join(self._directory.name, "pages")
+        os.makedirs(pages)
+        for i, text in enumerate(TEXTS):
+            with open(os.path.join(pages, f"{i}.txt"), "w", encoding="utf-8") as f:
+                f.write(text)
+        with open(os.path.join(pages, "ignored.html"), "w", encoding="utf-8") as f:
+            f.write("<p>html</p>")
+
+        self.assertEqual(list(PageCorpus(pages, tokenize=str.split)), [text.split() for text in TEXTS])
+
+    def test__build__without_pages__should_return_empty_corpus(self):
+        corpus, dictionary = SparseCorpus.build(self._path, self._get_jsonl_corpus([]))
+
+        loaded_corpus, _ = SparseCorpus.load(self._path)
+        self.assertEqual((len(corpus), corpus.num_terms, len(dictionary)), (0, 0, 0))
+        self.assertEqual(list(loaded_corpus), [])
+
+    def test__build__with_all_terms_pruned__should_return_corpus_without_terms(self):
+        corpus, dictionary = SparseCorpus.build(self._path, self._get_jsonl_corpus(TEXTS), no_below=5)
+
+        self.assertEqual((corpus.num_terms, len(dictionary)), (0, 0))
+        self.assertEqual(list(SparseCorpus(self._path)), [[]] * len(TEXTS))
+
+    def test__train_topic_model__with_empty_corpus__should_raise(self):
+        store = TopicModelStore(os.path.join(self._directory.name, "models"), workers=1)
+
+        with self.assertRaises(ValueError):
+            self._get_jsonl_corpus([]).train_topic_model(store, "topics", self._path)
+        self.assertFalse(store.has_model("topics"))
+
+    def _get_jsonl_corpus(self, texts):
+        path = os.path.join(self._directory.name, "pages.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for text in texts:
+                f.write(json.dumps({"text": text}) + "\n")
+
+        return PageCorpus(path, tokenize=str.split)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# Basic libraries
+import unittest
+import threading
+# App Libraries
+from Pipeline.crawl_pipeline import create_crawl_pipeline
+from Pipeline.pipeline_runner import PipelineRunner, Stage
+
+
+def _square(value):
+    return value * value
+
+
+class PipelineRunnerTests(unittest.TestCase):
+    """Tests for PipelineRunner class"""
+
+    def test__run__with_more_workers__should_process_all_items(self):
+        results = {}
+        runner = PipelineRunner([Stage("double", lambda value: value * 2, workers=4),
+                                 Stage("increment", lambda value: value + 1, workers=2)],
+                                lambda key, value: results.__setitem__(key, value), queue_size=2)
+
+        statistics = runner.run((i, i) for i in range(200))
+
+        self.assertEqual(results, {i: i * 2 + 1 for i in range(200)})
+        self.assertEqual([s.processed for s in statistics], [200, 200])
+
+    def test__run__with_none_result__should_drop_item(self):
+        results = []
+        runner = PipelineRunner([Stage("odd", lambda value: value if value % 2 else None)],
+                                lambda key, value: results.append(value))
+
+        statistics = runner.run((i, i) for i in range(10))
+
+        self.assertEqual(sorted(results), [1, 3, 5, 7, 9])
+        self.assertEqual(statistics[0].dropped, 5)
+
+    def test__run__with_failing_item__should_count_error_and_continue(self):
+        results = []
+        runner = PipelineRunner([Stage("invert", lambda value: 1 / value, workers=2)],
+                                lambda key, value: results.append(key))
+
+        statistics = runner.run((i, i) for i in range(5))
+
+        self.assertEqual(sorted(results), [1, 2, 3, 4])
+        self.assertEqual(statistics[0].errors, 1)
+
+    def test__run__with_slow_sink__should_bound_items_in_flight(self):
+        fed = []
+        in_flight = []
+        lock = threading.Lock()
+
+        def items():
+            for i in range(100):
+                with lock:
+                    fed.append(i)
+                yield i, i
+
+        def sink(key, value):
+            with lock:
+                in_flight.append(len(fed) - key)
+
+        runner = PipelineRunner([Stage("identity", lambda value: value)], sink, queue_size=3)
+        runner.run(items())
+
+        # Items waiting in two queues, one in the worker, one being fed and one being in sink
+        self.assertLessEqual(max(in_flight), 3 * 2 + 3)
+
+    def test__run__with_process_stage__should_process_all_items(self):
+        results = {}
+        runner = PipelineRunner([Stage("square", _square, workers=2, processes=True)],
+                                lambda key, value: results.__setitem__(key, value))
+
+        runner.run((i, i) for i in range(20))
+
+        self.assertEqual(results, {i: i * i for i in range(20)})
+
+    def test__run__with_failing_sink__should_cancel_workers_and_raise_error(self):
+        def sink(key, value):
+            raise IOError("Disk je plný")
+
+        runner = PipelineRunner([Stage("identity", lambda value: value, workers=2),
+                                 Stage("increment", lambda value: value + 1, workers=2)], sink, queue_size=2)
+
+        with self.assertRaisesRegex(IOError, "Disk je plný"):
+            runner.run((i, i) for i in range(1000))
+
+        # Workers are not blocked on full queues, all of them ended
+        self.assertTrue(all(statistics.finished is not None for statistics in runner.statistics))
+        self.assertLess(sum(statistics.processed for statistics in runner.statistics), 2000)
+
+    def test__run__with_failing_input__should_finish_read_items_and_raise_error(self):
+        results = []
+
+        def items():
+            for i in range(10):
+                yield i, i
+            raise ValueError("Vstup je poškozený")
+
+        runner = PipelineRunner([Stage("identity", lambda value: value, workers=2)],
+                                lambda key, value: results.append(key), queue_size=2)
+
+        with self.assertRaisesRegex(ValueError, "Vstup je poškozený"):
+            runner.run(items())
+
+        self.assertEqual(sorted(results), list(range(10)))
+
+    def test__create_crawl_pipeline__with_unknown_analysis__should_raise_error(self):
+        self.assertIsInstance(create_crawl_pipeline("n-grams", print), PipelineRunner)
+        for analysis in ("get_page_topics", "__init__", "unknown"):
+            with self.assertRaises(ValueError):
+                create_crawl_pipeline(analysis, print)
@@ -0,0 +1,96 @@
+# Basic libraries
+import os
+import time
+import tempfile
+import unittest
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+# App Libraries
+from Instrumentation.profiling import Profiler, profile_public_methods, load_case, replay_case, compare_cases
+from WebParsing.web_parser import WebParser
+
+
+class ProfilingTests(unittest.TestCase):
+    """Tests for opt-in profiling of public methods"""
+
+    HTML = "<html><body><h1>Title</h1><a href='http://a.cz'>A</a><a href='mailto:b@c.cz'>B</a></body></html>"
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._previous_directory = Profiler.get_directory()
+
+    def tearDown(self):
+        if self._previous_directory is None:
+            Profiler.disable()
+        else:
+            Profiler.enable(self._previous_directory)
+        self._directory.cleanup()
+
+    def test__public_method__with_profiling_disabled__should_not_save_case(self):
+        Profiler.disable()
+
+        self.assertEqual(WebParser.from_html(self.HTML).get_all_links(), ("http://a.cz",))
+        self.assertEqual(os.listdir(self._directory.name), [])
+
+    def test__public_method__with_profiling_enabled__should_save_profile_allocations_and_page(self):
+        Profiler.enable(self._directory.name)
+
+        self.assertEqual(WebParser.from_html(self.HTML).get_items_by_tag("h1"), ("Title",))
+
+        case_directory = self._get_case_directories()[-1]
+        for file_name in (Profiler.PROFILE_FILE, Profiler.PROFILE_TEXT_FILE, Profiler.ALLOCATIONS_FILE,
+                          Profiler.PAGE_FILE):
+            self.assertTrue(os.path.exists(os.path.join(case_directory, file_name)))
+
+        case = load_case(case_directory)
+        self.assertEqual(case["function"], "WebParser.get_items_by_tag")
+        self.assertEqual(case["replay_arguments"], ["h1"])
+        self.assertIn("<h1>Title</h1>", case["page"])
+        self.assertIsNone(case["error"])
+
+    def test__public_method__with_nested_public_calls__should_save_only_outermost_call(self):
+        Profiler.enable(self._directory.name)
+
+        # from_html (class method) calls _parse_html only, get_all_emails calls private method
+        WebParser.from_html(self.HTML).get_all_emails()
+
+        functions = sorted(load_case(directory)["function"] for directory in self._get_case_directories())
+        self.assertEqual(functions, ["WebParser.from_html", "WebParser.get_all_emails"])
+
+    def test__public_method__with_overlapping_calls_in_threads__should_profile_both(self):
+        Profiler.enable(self._directory.name)
+        barrier = threading.Barrier(2)
+
+        # The first call finishes while the second one still runs
+        with ThreadPoolExecutor(2) as executor:
+            results = list(executor.map(lambda delay: _SlowService().run(barrier, delay), (0, 0.2)))
+
+        self.assertEqual(results, [0, 0.2])
+        self.assertEqual(len(self._get_case_directories()), 2)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test__replay_case__should_save_new_case_which_can_be_compared(self):
+        Profiler.enable(self._directory.name)
+        WebParser.from_html(self.HTML).get_items_by_tag("a")
+        first_directory = self._get_case_directories()[-1]
+
+        replay_directory = os.path.join(self._directory.name, "replay")
+        self.assertEqual(replay_case(first_directory, replay_directory), ("A", "B"))
+        self.assertEqual(Profiler.get_directory(), self._directory.name)
+
+        second_directory = os.path.join(replay_directory, os.listdir(replay_directory)[0])
+        self.assertEqual(load_case(second_directory)["function"], "WebParser.get_items_by_tag")
+        self.assertIn("get_items_by_tag", compare_cases(first_directory, second_directory))
+
+    def _get_case_directories(self):
+        return [os.path.join(self._directory.name, name) for name in sorted(os.listdir(self._directory.name))
+                if name != "replay"]
+
+
+@profile_public_methods
+class _SlowService:
+    def run(self, barrier, delay):
+        barrier.wait()
+        time.sleep(delay)
+        return delay
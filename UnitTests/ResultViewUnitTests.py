@@ -0,0 +1,51 @@
+# Basic libraries
+import unittest
+# App Libraries
+from GUI.ResultView import ResultLinesModel
+
+
+class ResultLinesModelTests(unittest.TestCase):
+    """Tests for ResultLinesModel class"""
+
+    def test__set_text__with_many_lines__should_fetch_first_batch(self):
+        model = ResultLinesModel()
+        text = "\n".join(str(number) for number in range(ResultLinesModel.FETCH_BATCH * 2 + 5))
+
+        model.set_text(text)
+
+        self.assertEqual(model.rowCount(), ResultLinesModel.FETCH_BATCH)
+        self.assertEqual(model.line_count, ResultLinesModel.FETCH_BATCH * 2 + 5)
+        self.assertIs(model.get_text(), text)
+
+    def test__fetch_more__should_add_rows_up_to_line_count(self):
+        model = ResultLinesModel()
+        model.set_text("\n".join(str(number) for number in range(ResultLinesModel.FETCH_BATCH + 5)))
+
+        while model.canFetchMore(model.index(-1)):
+            model.fetchMore(model.index(-1))
+
+        self.assertEqual(model.rowCount(), ResultLinesModel.FETCH_BATCH + 5)
+
+    def test__set_filter__should_show_only_matching_lines(self):
+        model = ResultLinesModel()
+        model.set_text("Praha\nBrno\nPRAHA 2\nOstrava")
+
+        model.set_filter("praha")
+
+        self.assertEqual([model.data(model.index(row)) for row in range(model.rowCount())], ["Praha", "PRAHA 2"])
+        self.assertEqual(model.get_text(), "Praha\nBrno\nPRAHA 2\nOstrava")
+
+    def test__append_lines__with_filter__should_add_matching_rows(self):
+        model = ResultLinesModel()
+        model.set_text("Praha\nBrno")
+        model.set_filter("praha")
+
+        model.append_lines(["Ostrava", "Praha 5"])
+
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.get_line(1), "Praha 5")
+        self.assertEqual(model.get_text(), "Praha\nBrno\nOstrava\nPraha 5")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+# Basic libraries
+import unittest
+from collections import Counter
+# App Libraries
+from NLP.similarity_engine import DocumentSimilarityEngine
+# Third-party libraries
+import numpy as np
+from scipy.optimize import linprog
+
+VOCABULARY = ["python", "java", "rust", "code", "web", "page", "parser", "memory", "class", "text", "crawler",
+              "link", "topic", "model", "query", "index"]
+DOCUMENTS = ["python code web parser", "java code class parser parser", "rust memory page web",
+             "python page web text", "crawler link link page web", "topic model text text query",
+             "index query page link", "java class memory code", "python python crawler web link",
+             "model topic index", "rust code parser", "text page web"]
+QUERIES = ["python web crawler", "java code", "topic text model query", "rust rust memory index page"]
+
+
+class DocumentSimilarityEngineTests(unittest.TestCase):
+    """Tests for DocumentSimilarityEngine class"""
+
+    def test__query__with_small_blocks__should_equal_brute_force_word_movers(self):
+        engine = self._get_engine(block_documents=3, max_block_elements=7)
+
+        for query in QUERIES:
+            expected = sorted(((document_id, 1.0 - _word_movers(query, document))
+                               for document_id, document in enumerate(DOCUMENTS)), key=lambda item: -item[1])
+            result = engine.query(query, k=4)
+
+            self.assertEqual(len(result), 4)
+            for (document_id, similarity), (_, expected_similarity) in zip(result, expected):
+                self.assertAlmostEqual(similarity, expected_similarity, places=5)
+                self.assertAlmostEqual(similarity, 1.0 - _word_movers(query, DOCUMENTS[document_id]), places=5)
+
+    def test__query__with_k_above_documents_count__should_return_every_document(self):
+        engine = self._get_engine()
+
+        result = engine.query(DOCUMENTS[0], k=100)
+
+        self.assertEqual(len(result), len(DOCUMENTS))
+        self.assertEqual(result[0][0], 0)
+        self.assertAlmostEqual(result[0][1], 1.0, places=5)
+
+    def test__query__without_known_words__should_return_empty_list(self):
+        engine = self._get_engine()
+
+        self.assertEqual(engine.query("unknown words", k=3), [])
+        self.assertEqual(DocumentSimilarityEngine(embed=_embed).query("python", k=3), [])
+
+    def test__relaxed_word_movers__should_be_lower_bound_of_word_movers(self):
+        engine = self._get_engine(max_block_elements=5)
+        candidates = np.arange(len(DOCUMENTS))
+
+        for query in QUERIES:
+            vectors, weights = engine._get_bag_of_embeddings(query)
+            max_distance = engine._get_max_distance(vectors)
+            relaxed = engine._get_relaxed_word_movers(vectors, weights, max_distance, candidates)
+            centroid = np.sum((engine._centroids[:len(DOCUMENTS)] - weights.dot(vectors)) ** 2, axis=1) / 4
+
+            exact = np.array([_word_movers(query, document) for document in DOCUMENTS])
+            self.assertTrue(np.all(relaxed <= exact + 1e-6))
+            self.assertTrue(np.all(centroid <= exact + 1e-6))
+
+    @staticmethod
+    def _get_engine(**kwargs):
+        engine = DocumentSimilarityEngine(embed=_embed, **kwargs)
+        for document_id, document in enumerate(DOCUMENTS):
+            engine.add(document_id, document)
+        return engine
+
+
+def _get_vector(word):
+    return np.random.RandomState(VOCABULARY.index(word)).normal(size=8)
+
+
+def _embed(text):
+    counts = Counter(word for word in text.split() if word in VOCABULARY)
+    return [_get_vector(word) for word in counts], list(counts.values())
+
+
+def _word_movers(text_1, text_2):
+    # Brute force as in textacy: EMD of bags of words over all their words, cosine distances divided by maximum
+    words_1, words_2 = text_1.split(), text_2.split()
+    words = sorted(set(words_1) | set(words_2))
+    vectors = [_get_vector(word) / np.linalg.norm(_get_vector(word)) for word in words]
+    distances = np.array([[max(0.0, 1.0 - vector_1.dot(vector_2)) for vector_2 in vectors] for vector_1 in vectors])
+    distances /= distances.max()
+    bow_1 = np.array([words_1.count(word) / len(words_1) for word in words])
+    bow_2 = np.array([words_2.count(word) / len(words_2) for word in words])
+
+    n = len(words)
+    equalities = []
+    for i in range(n):
+        row = np.zeros((n, n))
+        row[i, :] = 1
+        equalities.append(row.ravel())
+    for j in range(n):
+        column = np.zeros((n, n))
+        column[:, j] = 1
+        equalities.append(column.ravel())
+    result = linprog(distances.ravel(), A_eq=np.array(equalities), b_eq=np.concatenate((bow_1, bow_2)),
+                     bounds=(0, None), method="highs")
+    return result.fun
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# Basic libraries
+import unittest
+# App Libraries
+from NLP.summarization import TextRankSummarizer
+
+TEXT = """Python is a programming language used for parsing web pages.
+Web pages are parsed by Python libraries like BeautifulSoup. Natural language processing analyses text of web pages.
+The weather was nice yesterday!
+Text of web pages is analysed by natural language processing in Python."""
+
+
+class TextRankSummarizerTests(unittest.TestCase):
+    """Tests for TextRankSummarizer class"""
+
+    def test__split_sentences__with_lines_and_punctuation__should_return_all_sentences(self):
+        sentences = TextRankSummarizer.split_sentences(TEXT)
+
+        self.assertEqual(len(sentences), 5)
+        self.assertEqual(sentences[3], "The weather was nice yesterday!")
+
+    def test__rank_sentences__with_unrelated_sentence__should_rank_it_last(self):
+        sentences = TextRankSummarizer.split_sentences(TEXT)
+
+        scores = TextRankSummarizer().rank_sentences(sentences)
+
+        self.assertAlmostEqual(scores.sum(), 1.0)
+        self.assertEqual(scores.argmin(), 3)
+
+    def test__summarize__with_ratio__should_keep_original_order(self):
+        summary = TextRankSummarizer().summarize(TEXT, ratio=0.4)
+
+        sentences = summary.split("\n")
+        self.assertEqual(len(sentences), 2)
+        self.assertLess(TEXT.index(sentences[0]), TEXT.index(sentences[1]))
+
+    def test__summarize__with_word_count__should_not_exceed_it(self):
+        summary = TextRankSummarizer().summarize(TEXT, word_count=25)
+
+        self.assertLessEqual(len(summary.split()), 25)
+        self.assertNotIn("weather", summary)
+
+    def test__summarize__with_empty_text__should_return_empty_text(self):
+        self.assertEqual(TextRankSummarizer().summarize(""), "")
@@ -0,0 +1,72 @@
+# Basic libraries
+import unittest
+# App Libraries
+from NLP.text_chunking import TextChunker, TextChunk, merge_sets, merge_counts, merge_ranked_terms
+
+TEXT = """First paragraph has two sentences. This is the second one.
+
+Second paragraph is short.
+
+Third paragraph is the longest one. It has three sentences! Is it the last one?"""
+
+
+class TextChunkingTests(unittest.TestCase):
+    """Tests for splitting text into chunks and merging of partial results"""
+
+    def test__split__with_short_text__should_return_one_chunk(self):
+        chunker = TextChunker(1000)
+
+        chunks = list(chunker.split(TEXT))
+
+        self.assertEqual(chunks, [TextChunk(0, TEXT)])
+
+    def test__split__with_long_text__should_split_at_paragraphs(self):
+        chunker = TextChunker(90)
+
+        chunks = list(chunker.split(TEXT))
+
+        self.assertEqual([chunk.text for chunk in chunks],
+                         ['First paragraph has two sentences. This is the second one.\n\nSecond paragraph is short.',
+                          'Third paragraph is the longest one. It has three sentences! Is it the last one?'])
+
+    def test__split__with_long_paragraph__should_split_at_sentences(self):
+        chunker = TextChunker(40)
+
+        chunks = list(chunker.split(TEXT))
+
+        self.assertEqual([chunk.text for chunk in chunks],
+                         ['First paragraph has two sentences.', 'This is the second one.',
+                          'Second paragraph is short.', 'Third paragraph is the longest one.',
+                          'It has three sentences!', 'Is it the last one?'])
+
+    def test__split__with_long_word__should_cut_word(self):
+        chunker = TextChunker(4)
+
+        chunks = list(chunker.split("abcdefghij kl"))
+
+        self.assertEqual([chunk.text for chunk in chunks], ['abcd', 'efgh', 'ij', 'kl'])
+
+    def test__split__with_any_length__should_keep_offsets_and_length(self):
+        for max_length in (5, 17, 40, 90, 1000):
+            chunker = TextChunker(max_length)
+
+            for chunk in chunker.split(TEXT):
+                self.assertLessEqual(len(chunk.text), max_length)
+                self.assertEqual(TEXT[chunk.start:chunk.start + len(chunk.text)], chunk.text)
+
+    def test__merge_sets__with_duplicates__should_return_unique_items(self):
+        merged = merge_sets([[("ORG", "BUT")], [("ORG", "BUT"), ("PERSON", "Karel")]])
+
+        self.assertEqual(merged, {("ORG", "BUT"), ("PERSON", "Karel")})
+
+    def test__merge_counts__with_same_terms__should_sum_counts(self):
+        merged = merge_counts([{"web": 2, "page": 1}, {"web": 3}])
+
+        self.assertEqual(merged, {"web": 5, "page": 1})
+
+    def test__merge_ranked_terms__with_weighted_chunks__should_rerank_globally(self):
+        merged = merge_ranked_terms([(3, [("web", 0.5), ("page", 0.2)]), (1, [("page", 1.0)])], 2)
+
+        self.assertEqual([term for term, _ in merged], ["page", "web"])
+        self.assertAlmostEqual(merged[0][1], 0.4)
+        self.assertAlmostEqual(merged[1][1], 0.375)
@@ -0,0 +1,93 @@
+# Basic libraries
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+# App Libraries
+from NLP.nlp_service import NLPService
+from NLP.topic_model_store import TopicModelStore
+# Third-party libraries
+from gensim.corpora import Dictionary
+
+DOCUMENTS = [["python", "code", "web", "parser"], ["java", "code", "class", "parser"],
+             ["rust", "web", "memory", "page"], ["python", "page", "web", "text"]]
+
+
+class TopicModelStoreTests(unittest.TestCase):
+    """Tests for TopicModelStore class"""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test__train__should_be_loaded_by_another_store(self):
+        store = self._get_store()
+
+        self._train(store, "model")
+
+        other_store = self._get_store()
+        self.assertTrue(other_store.has_model("model"))
+        self.assertFalse(other_store.has_model("other"))
+        lda_model, dictionary = other_store.load("model")
+        self.assertEqual(lda_model.num_topics, 2)
+        self.assertEqual(len(dictionary), len(Dictionary(DOCUMENTS)))
+        self.assertEqual(len(other_store.get_document_topics("model", ["python", "web"], 0.0)), 2)
+
+    def test__update__should_be_reloaded_by_another_store(self):
+        store = self._get_store()
+        self._train(store, "model")
+        mapped_model, _ = self._get_store().load("model")
+        num_updates = mapped_model.num_updates
+
+        store.update("model", DOCUMENTS[:2])
+
+        reloaded_model, _ = self._get_store().load("model")
+        self.assertEqual(reloaded_model.num_updates, num_updates + 2)
+        # Model loaded before the update keeps its own files, they are not overwritten
+        self.assertEqual(mapped_model.num_updates, num_updates)
+        self.assertEqual(mapped_model.expElogbeta.shape, reloaded_model.expElogbeta.shape)
+        self.assertEqual(len(os.listdir(os.path.join(self._directory.name, "model"))), 2)
+
+    def test__update__with_concurrent_updates__should_apply_all_of_them(self):
+        store = self._get_store()
+        num_updates = self._train(store, "model").num_updates
+
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda _: store.update("model", DOCUMENTS[:1]), range(4)))
+
+        self.assertEqual(self._get_store().load("model")[0].num_updates, num_updates + 4)
+
+    def test__train__above_max_models__should_remove_least_recently_used_model(self):
+        store = self._get_store(max_models=2)
+        self._train(store, "a")
+        self._train(store, "b")
+        os.utime(os.path.join(self._directory.name, "a", TopicModelStore.CURRENT_FILE), (0, 0))
+
+        self._train(store, "c")
+
+        self.assertEqual(sorted(os.listdir(self._directory.name)), ["b", "c"])
+        self.assertFalse(self._get_store().has_model("a"))
+
+    def test__nlp_service__without_store__should_not_use_stored_models(self):
+        nlp_service = NLPService("Python parser reads pages of the web.")
+
+        self.assertIsNone(nlp_service.topic_model_store)
+        with self.assertRaises(ValueError):
+            nlp_service.get_page_topics("model")
+        with self.assertRaises(ValueError):
+            nlp_service.update_topic_model("model")
+
+    def _get_store(self, max_models=TopicModelStore.DEFAULT_MAX_MODELS):
+        return TopicModelStore(self._directory.name, workers=1, max_models=max_models)
+
+    @staticmethod
+    def _train(store, name):
+        dictionary = Dictionary(DOCUMENTS)
+        return store.train(name, [dictionary.doc2bow(document) for document in DOCUMENTS], dictionary,
+                           number_topic=2, passes=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
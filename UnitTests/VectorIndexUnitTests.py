@@ -0,0 +1,89 @@
+# Basic libraries
+import os
+import json
+import unittest
+import tempfile
+# App Libraries
+from NLP.vector_index import VectorIndex
+# Third-party libraries
+import numpy as np
+
+
+class VectorIndexTests(unittest.TestCase):
+    """Tests for VectorIndex class"""
+
+    def test__query__with_untrained_index__should_return_exact_neighbours(self):
+        index = VectorIndex(3, n_lists=16)
+        index.add(["x", "y", "z"], np.eye(3))
+
+        result = index.query([1.0, 0.2, 0.0], k=2)
+
+        self.assertFalse(index.is_trained)
+        self.assertEqual([key for key, _ in result], ["x", "y"])
+
+    def test__query__with_all_clusters_probed__should_return_exact_neighbours(self):
+        vectors = self._get_vectors(1000)
+        index = VectorIndex(16, n_lists=8)
+        index.add([str(i) for i in range(len(vectors))], vectors)
+
+        result = index.query(vectors[42], k=5, n_probe=8)
+
+        self.assertTrue(index.is_trained)
+        self.assertEqual(result[0][0], "42")
+        self.assertAlmostEqual(result[0][1], 1.0, places=5)
+        self.assertEqual(len(result), 5)
+
+    def test__query__with_own_vector__should_find_it_in_probed_cluster(self):
+        vectors = self._get_vectors(2000)
+        index = VectorIndex(16, n_lists=32, n_probe=1)
+        index.add([str(i) for i in range(len(vectors))], vectors)
+
+        for i in (0, 500, 1999):
+            self.assertEqual(index.query(vectors[i], k=1)[0][0], str(i))
+
+    def test__load__with_saved_index__should_return_same_results_and_accept_inserts(self):
+        vectors = self._get_vectors(300)
+        index = VectorIndex(16, n_lists=8, n_probe=2)
+        index.add([str(i) for i in range(len(vectors))], vectors)
+
+        with tempfile.TemporaryDirectory() as directory:
+            index.save(directory)
+            loaded = VectorIndex.load(directory)
+
+            self.assertEqual(loaded.query(vectors[7], k=3), index.query(vectors[7], k=3))
+
+            with open(os.path.join(directory, VectorIndex.META_FILE), encoding="utf-8") as f:
+                self.assertNotIn("keys", json.load(f))
+
+            loaded.add(["new"], -vectors[7:8])
+            self.assertEqual(loaded.query(-vectors[7], k=1)[0][0], "new")
+            self.assertTrue(loaded.contains("new"))
+
+    def test__add__with_grown_index__should_retrain_clusters(self):
+        vectors = self._get_vectors(800)
+        index = VectorIndex(16, n_lists=8)
+        index.add([str(i) for i in range(32)], vectors[:32])
+        centroids = index._centroids
+
+        index.add([str(i) for i in range(32, 127)], vectors[32:127])
+        self.assertIs(index._centroids, centroids)
+        self.assertFalse(index.needs_training())
+
+        index.add(["127"], vectors[127:128])
+        self.assertIsNot(index._centroids, centroids)
+        self.assertEqual(index.query(vectors[100], k=1, n_probe=8)[0][0], "100")
+
+    def test__n_probe__lower_than_one__should_raise_error(self):
+        index = VectorIndex(3, n_lists=1)
+        index.add(["x", "y", "z", "w"], np.eye(4, 3))
+
+        with self.assertRaises(ValueError):
+            VectorIndex(3, n_probe=0)
+        with self.assertRaises(ValueError):
+            index.n_probe = 0
+        with self.assertRaises(ValueError):
+            index.query([1.0, 0.0, 0.0], n_probe=0)
+
+    @staticmethod
+    def _get_vectors(count):
+        return np.random.RandomState(0).normal(size=(count, 16)).astype(np.float32)
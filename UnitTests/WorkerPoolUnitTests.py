@@ -0,0 +1,37 @@
+# Basic libraries
+import unittest
+# App Libraries
+from GUI.WorkerPool import WorkerPool
+# Third-party libraries
+from PyQt5 import QtCore
+
+
+class WorkerPoolTests(unittest.TestCase):
+    """Tests for WorkerPool class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._application = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    def test__start__with_partial_results__should_deliver_them_before_result(self):
+        pool = WorkerPool(max_threads=1)
+        events = []
+
+        def crawl(job):
+            for page in range(3):
+                job.report_partial_result([f"link {page}.1", f"link {page}.2"])
+            job.report_partial_result([])
+            return 6
+
+        pool.start("crawl", crawl, lambda result: events.append(("result", result)), events.append,
+                   lambda lines: events.append(("lines", lines)))
+        self.assertTrue(pool.wait_for_done(5000))
+        self._application.processEvents()
+
+        self.assertEqual(events, [("lines", ["link 0.1", "link 0.2"]), ("lines", ["link 1.1", "link 1.2"]),
+                                  ("lines", ["link 2.1", "link 2.2"]), ("result", 6)])
+        self.assertEqual(pool.running_jobs, ())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+# Basic libraries
+import time
+import threading
+from collections import OrderedDict, namedtuple
+# App libraries
+from .web_parser import WebParser
+
+
+CachedPage = namedtuple("CachedPage", ("url", "web_parser", "loaded_at"))
+
+
+class PageCache:
+    """
+    Session cache of loaded pages. Parsed pages of recently used URLs are kept, so all buttons working
+    with the same page download it only once. The cache is bounded by total size of HTML of pages,
+    the least recently used pages are dropped first. Pages older than max_age are reported as stale,
+    but they are downloaded again only on explicit refresh.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_age=10 * 60, loader=None):
+        """
+        :param max_bytes: Maximal total length of HTML of cached pages
+        :param max_age: Age of page in seconds after which it is stale
+        :param loader: Function that gets URL and returns WebParser with loaded page
+        """
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._loader = loader if loader is not None else self._load_page
+
+        self._pages = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # URL -> lock held while the page is downloaded, so concurrent jobs download it only once
+        self._loading_locks = dict()
+
+    def __len__(self):
+        return len(self._pages)
+
+    # -----------------
+    # Properties
+    # -----------------
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def max_age(self):
+        return self._max_age
+
+    # -----------------
+    # Public methods
+    # -----------------
+
+    def contains(self, url):
+        with self._lock:
+            return url in self._pages
+
+    def get(self, url, refresh=False):
+        """
+        Gets loaded page, it is downloaded when it is not cached or when refresh is requested
+        :param url: URL of page
+        :param refresh: Download page again even if it is cached
+        :return: CachedPage
+        """
+        requested_at = time.time()
+        with self._lock:
+            if not refresh and url in self._pages:
+                self._pages.move_to_end(url)
+                return self._pages[url]
+            loading_lock = self._loading_locks.setdefault(url, threading.Lock())
+
+        with loading_lock:
+            with self._lock:
+                page = self._pages.get(url)
+            # Page could be downloaded by other job while this one waited
+            if page is not None and (not refresh or page.loaded_at >= requested_at):
+                return page
+
+            page = CachedPage(url, self._loader(url), time.time())
+            with self._lock:
+                self._remove(url)
+                self._pages[url] = page
+                self._size += page.web_parser.page_size
+                self._evict()
+                self._loading_locks.pop(url, None)
+
+        return page
+
+    def get_age(self, url):
+        """
+        Gets age of cached page
+        :param url: URL of page
+        :return: Age in seconds or None when page is not cached
+        """
+        with self._lock:
+            page = self._pages.get(url)
+
+        return None if page is None else time.time() - page.loaded_at
+
+    def is_stale(self, url):
+        age = self.get_age(url)
+
+        return age is not None and age > self._max_age
+
+    def invalidate(self, url):
+        with self._lock:
+            self._remove(url)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self._size = 0
+
+    # -----------------
+    # Private methods
+    # -----------------
+
+    @staticmethod
+    def _load_page(url):
+        web_parser = WebParser()
+        web_parser.load_page(url)
+
+        return web_parser
+
+    def _remove(self, url):
+        page = self._pages.pop(url, None)
+        if page is not None:
+            self._size -= page.web_parser.page_size
+
+    def _evict(self):
+        # The newest page is kept even if it is bigger than the limit
+        while self._size > self._max_bytes and len(self._pages) > 1:
+            _, page = self._pages.popitem(last=False)
+            self._size -= page.web_parser.page_size
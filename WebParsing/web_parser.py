@@ -1,7 +1,10 @@
 # Basic libraries
 import re
+import time
 # App libraries
 from AdvancedLogging.logger import Logger
+from Instrumentation.metrics import METRICS
+from Instrumentation.profiling import profile_public_methods
 # Third-party libraries
 import requests
 from bs4 import BeautifulSoup
@@ -22,20 +25,45 @@ URL_REGEX = (r'^(?:http|ftp)s?://'  # http:// or https://
              r'(?::\d+)?'  # optional port
              r'(?:/?|[/?]\S+)$')
 
+# Seconds to connect and seconds between received bytes, slow servers do not block workers forever
+REQUEST_TIMEOUT = (10, 30)
 
+_STAGE_SECONDS = "web_parser_stage_seconds"
+_STAGE_DESCRIPTION = "Duration of stages of downloading and parsing of pages"
+# Time to response headers, it contains DNS lookup, connect and TLS handshake (requests does not split them)
+_REQUEST_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="request")
+_DOWNLOAD_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="download")
+_DECODE_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="decode")
+_HEAD_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="head")
+_PARSE_TIME = METRICS.histogram(_STAGE_SECONDS, _STAGE_DESCRIPTION, stage="parse")
+_PAGES = METRICS.counter("web_parser_pages_total", "Downloaded pages")
+_BYTES = METRICS.counter("web_parser_bytes_total", "Downloaded bytes of pages")
+_PARSED_CHARACTERS = METRICS.counter("web_parser_parsed_characters_total", "Characters of parsed HTML")
+_ERRORS = METRICS.counter("web_parser_errors_total", "Failed requests")
+
+
+@profile_public_methods
 class WebParser:
     """Class used for parsing web and its statistics"""
 
     DEFAULT_PARSER = "lxml"
 
-    def __init__(self, soup=None):
+    def __init__(self, soup=None, page_size=0):
         self._soup = soup
+        self._page_size = page_size
         self._logger = Logger(self.__class__.__name__)
 
     # -----------------
     # Properties
     # -----------------
 
+    @property
+    def page_size(self):
+        """
+        Length of HTML of loaded page
+        """
+        return self._page_size
+
     # -----------------
     # Public methods
     # -----------------
@@ -47,7 +75,9 @@ class WebParser:
         """
         if self.is_url_valid(url):
             if self._is_url_html(url, self._logger):
-                self._soup = self._get_soup_from_url(url)
+                html = self.fetch_html(url)
+                self._soup = self._parse_html(html)
+                self._page_size = len(html)
             else:
                 raise Exception("Page from URL is not HTML")
         else:
@@ -101,17 +131,24 @@ class WebParser:
         links = [l[7:] for l in self._get_all_links(self._soup) if l.startswith("mailto:")]
         return tuple(links)
 
-    def get_all_following_links(self, level):
+    def get_all_following_links(self, level, on_progress=None, is_cancelled=None, on_links=None):
         """
         Gets all links defined by level. It gets all links in page. Then second level is all links from links at
         first level. Next level (third) is all links from all links at second level. Etc...
         WARNING: It goes exponentially up!
         :param level: how deep should getting links go
+        :param on_progress: optional function called after every downloaded page with
+        (number of done pages of level, number of pages of level, message)
+        :param is_cancelled: optional function, when it returns True, links found so far are returned
+        :param on_links: optional function called with links of base page and then with links of every downloaded
+        page, in the order of returned list
         :return: list of lists of all links. Each list is level deeper. First is base page, second is all links from
         links at first level.
         """
         following_links = [self._get_all_links(self._soup)]
-        self._logger.info(f"Lvl:1/{level}|Links:1/1")
+        self._logger.progress("Lvl:1/%d|Links:1/1", level)
+        if on_links is not None:
+            on_links(following_links[0])
 
         for l in range(0, level - 1):
             links = following_links[l]
@@ -120,15 +157,64 @@ class WebParser:
             current_link = 1
             found_links = []
             for link in links:
+                if is_cancelled is not None and is_cancelled():
+                    following_links.append(found_links)
+                    return [link for links in following_links for link in links]
+
                 if self.is_url_valid(link) and self._is_url_html(link, self._logger):
-                    found_links.extend(self._get_all_links_from_url(link))
-                self._logger.info(f"Lvl:{current_level}/{level}|Links:{current_link}/{len(links)}")
+                    page_links = self._get_all_links_from_url(link)
+                    found_links.extend(page_links)
+                    if on_links is not None:
+                        on_links(page_links)
+                self._logger.progress("Lvl:%d/%d|Links:%d/%d", current_level, level, current_link, len(links),
+                                      final=current_link == len(links))
+                if on_progress is not None:
+                    on_progress(current_link, len(links), f"Úroveň {current_level}/{level}")
                 current_link += 1
 
             following_links.append(found_links)
 
         return [link for links in following_links for link in links]
 
+    @staticmethod
+    def fetch_html(url, html_only=False):
+        """
+        Downloads page from defined URL without parsing it
+        :param url: url to get page from
+        :param html_only: Returns None without downloading body when response is not HTML
+        :return: HTML of the page as string
+        """
+        start = time.perf_counter()
+        try:
+            # Body is downloaded only when content is read
+            page = requests.get(url, headers=DEFAULT_REQUEST_HEADERS, timeout=REQUEST_TIMEOUT, stream=True)
+            if html_only and "text/html" not in page.headers.get("content-type", ""):
+                page.close()
+                return None
+            content = page.content
+        except requests.exceptions.RequestException:
+            _ERRORS.inc()
+            raise
+        duration = time.perf_counter() - start
+
+        request_time = min(page.elapsed.total_seconds(), duration)
+        _REQUEST_TIME.observe(request_time)
+        _DOWNLOAD_TIME.observe(duration - request_time)
+        _PAGES.inc()
+        _BYTES.inc(len(content))
+
+        with _DECODE_TIME.time():
+            return page.text
+
+    @classmethod
+    def from_html(cls, html):
+        """
+        Creates parser of already downloaded page
+        :param html: HTML of the page
+        :return: WebParser with loaded page
+        """
+        return cls(cls._parse_html(html), len(html))
+
     @staticmethod
     def is_url_valid(url):
         if url == "":
@@ -141,11 +227,24 @@ class WebParser:
     # Private methods
     # -----------------
 
+    @staticmethod
+    def _parse_html(html):
+        """
+        Parses HTML of page
+        :param html: HTML of page
+        :return: BeautifulSoup class with the page
+        """
+        _PARSED_CHARACTERS.inc(len(html))
+        with _PARSE_TIME.time():
+            return BeautifulSoup(html, WebParser.DEFAULT_PARSER)
+
     @staticmethod
     def _is_url_html(url, logger):
         try:
-            r = requests.head(url)
-        except requests.exceptions.ConnectionError as ex:
+            with _HEAD_TIME.time():
+                r = requests.head(url, timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as ex:
+            _ERRORS.inc()
             logger.exception(ex)
             return False
 
@@ -177,5 +276,4 @@ class WebParser:
         :param url: to get soup from
         :return: BeautifulSoup class with page from URL
         """
-        page = requests.get(url, headers=DEFAULT_REQUEST_HEADERS)
-        return BeautifulSoup(page.text, WebParser.DEFAULT_PARSER)
+        return WebParser._parse_html(WebParser.fetch_html(url))
@@ -1,11 +1,33 @@
+# Basic libraries
+import argparse
 # App libraries
-from GUI.App import App
+from GUI.StartupProfile import StartupProfile
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Parsování a analýza webových stránek")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="vypsat dobu jednotlivých fází spuštění a importů knihoven")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="neimportovat NLP knihovny na pozadí po zobrazení okna")
+
+    return parser.parse_args()
 
 
 # MAIN CODE
 def main():
+    arguments = parse_arguments()
+    startup_profile = StartupProfile() if arguments.startup_profile else None
+
+    # GUI is imported here, so its import is measured by startup profile
+    from GUI.App import App
+    if startup_profile is not None:
+        startup_profile.mark("Import GUI")
+
     app = App()
-    app.build()
+    if startup_profile is not None:
+        startup_profile.mark("Vytvoření aplikace")
+    app.build(prewarm_libraries=not arguments.no_prewarm, startup_profile=startup_profile)
 
 
 # MAIN STARTUP SCRIPT
@@ -0,0 +1,78 @@
+# Basic libraries
+import sys
+import argparse
+# App libraries
+from AdvancedLogging.logger import Logger
+from CLI.batch_runner import BatchRunner, ANALYSES, QUERIES
+from CLI.result_writers import create_writer
+from Instrumentation.metrics import METRICS
+from NLP.nlp_service import NLPService
+
+
+def read_lines(path):
+    """
+    Reads non-empty lines of file which are not comments ('#')
+    :param path: Path of file, standard input when '-'
+    :return: Generator of lines
+    """
+    with (sys.stdin if path == "-" else open(path, encoding="utf-8")) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Headless batch mode: runs web parser queries and NLP analyses on URLs or text files "
+                    "and streams results to JSONL or Parquet")
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--urls", metavar="FILE", help="File with one URL per line, '-' for standard input")
+    inputs.add_argument("--texts", metavar="FILE", nargs="+", help="Text files, each file is one document")
+    parser.add_argument("--query", nargs="+", default=[],
+                        help=f"Web parser queries: {', '.join(QUERIES)} (tag, class and following-links "
+                             f"need argument, e.g. tag:h1 or following-links:2)")
+    parser.add_argument("--analysis", nargs="+", default=[], choices=list(ANALYSES), help="NLP analyses")
+    parser.add_argument("--output", default="-", help="Output file, standard output by default")
+    parser.add_argument("--format", choices=("jsonl", "parquet"),
+                        help="Output format, chosen by extension of output file by default")
+    parser.add_argument("--fetch-workers", type=int, default=8, help="Number of threads downloading pages")
+    parser.add_argument("--workers", type=int, default=2, help="Number of NLP worker processes")
+    parser.add_argument("--shared-vectors", metavar="DIRECTORY",
+                        help="Directory of word vectors shared by NLP worker processes, they are exported there "
+                             "on first use")
+    parser.add_argument("--topic-models", metavar="DIRECTORY",
+                        help="Directory where trained topic models are stored and reused, topic models are trained "
+                             "in memory for every document by default")
+    parser.add_argument("--metrics-file", help="File where durations of stages are written in Prometheus format "
+                                               "(metrics of NLP worker processes are included)")
+
+    return parser.parse_args()
+
+
+# MAIN CODE
+def main():
+    arguments = parse_arguments()
+    # Standard output is kept for results
+    Logger.configure(stream=sys.stderr)
+    if arguments.shared_vectors:
+        NLPService.use_shared_vectors(arguments.shared_vectors)
+
+    with create_writer(arguments.output, arguments.format) as writer:
+        runner = BatchRunner(writer, arguments.query, arguments.analysis, arguments.fetch_workers, arguments.workers,
+                             topic_model_directory=arguments.topic_models)
+        if arguments.urls:
+            runner.run_urls(read_lines(arguments.urls))
+        else:
+            runner.run_text_files(arguments.texts)
+
+    print(f"Records: {runner.written_records}, failed: {runner.failed_records}", file=sys.stderr)
+    if arguments.metrics_file:
+        METRICS.dump_prometheus(arguments.metrics_file)
+
+    return 1 if runner.failed_records else 0
+
+
+# MAIN STARTUP SCRIPT
+if __name__ == "__main__":
+    sys.exit(main())
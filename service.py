@@ -0,0 +1,45 @@
+# Basic libraries
+import argparse
+# App libraries
+from NLP.topic_model_store import TopicModelStore
+from Service.analysis_server import AnalysisServer, create_default_analyses
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Local analysis service with warm models and request batching")
+    parser.add_argument("--host", default="127.0.0.1", help="Address of the server")
+    parser.add_argument("--port", type=int, default=8765, help="Port of the server")
+    parser.add_argument("--max-batch-size", type=int, default=32, help="Maximal number of texts analysed at once")
+    parser.add_argument("--max-wait", type=float, default=0.01,
+                        help="Maximal time in seconds a request waits for other requests of its batch")
+    parser.add_argument("--max-queue-size", type=int, default=256,
+                        help="Maximal number of waiting requests of one analysis, more requests get 503")
+    parser.add_argument("--topic-models", metavar="DIRECTORY",
+                        help="Directory where trained topic models are stored and reused, topic models are trained "
+                             "in memory for every request by default")
+    parser.add_argument("--no-warm-up", action="store_true", help="Do not load models before serving")
+
+    return parser.parse_args()
+
+
+# MAIN CODE
+def main():
+    arguments = parse_arguments()
+    topic_model_store = TopicModelStore(arguments.topic_models) if arguments.topic_models else None
+    server = AnalysisServer(arguments.host, arguments.port, create_default_analyses(topic_model_store),
+                            max_batch_size=arguments.max_batch_size, max_wait=arguments.max_wait,
+                            max_queue_size=arguments.max_queue_size)
+    if not arguments.no_warm_up:
+        server.warm_up()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+# MAIN STARTUP SCRIPT
+if __name__ == "__main__":
+    main()